@@ -1,79 +1,90 @@
 import asyncio
 import os
-import subprocess
-from typing import Dict, Any
-from ai_film_studio.core.state import EpisodeState
+from typing import Dict, Any, List, Optional
+from ai_film_studio.core.interfaces import VideoGenerationProvider
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.cost_ledger import get_cost_ledger, price_of_call
+from ai_film_studio.core.events import emit
+from ai_film_studio.core.metrics import FFMPEG_DURATION
+from ai_film_studio.core.tracing import span
+from ai_film_studio.core.workspace import JobWorkspace, job_workspace
 from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.scheduler import RateLimitError
+from ai_film_studio.media.ken_burns import render_ken_burns
 
 async def generate_ken_burns_video(image_path: str, output_path: str, duration: float = 4.0):
-    """Creates a video from a static image with a zoom-in effect using ffmpeg."""
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # ffmpeg command for a simple zoom-in effect
-    # scale=8000:-1: zooming onto a high-res virtual canvas
-    # zoompan: the actual effect. d=duration*fps
-    cmd = [
-        "ffmpeg", "-y",
-        "-loop", "1",
-        "-i", image_path,
-        "-vf", f"zoompan=z='min(zoom+0.0015,1.5)':d={int(duration * 25)}:s=1280x720:fps=25",
-        "-t", str(duration),
-        "-c:v", "libx264",
-        "-pix_fmt", "yuv420p",
-        output_path
-    ]
+    """Creates a video from a static image with a zoom/pan effect using ffmpeg.
+    Renderer, resolution, fps, easing and pan come from the KEN_BURNS_* settings."""
+    with FFMPEG_DURATION.time(operation="ken_burns"), span("ffmpeg:ken_burns", output=output_path):
+        return await render_ken_burns(image_path, output_path, duration=duration)
+
+def extract_storyboard_path(visual_description: str) -> Optional[str]:
+    # Extract storyboard path from visual_description [Ref: path]
+    if "[Ref: " in visual_description:
+        try:
+            return visual_description.split("[Ref: ")[1].split("]")[0]
+        except:
+            pass
+    return None
+
+async def animate_scene(video_gen: VideoGenerationProvider, scene: Scene, errors: List[str], workspace: JobWorkspace,
+                        within_budget: bool = True) -> Dict[str, Any]:
+    """Generates the clip for one scene (with Ken Burns fallback into the job's workspace) and returns
+    the scene update. Rate-limit failures are appended to `errors` rather than raised.
+    Scenes outside the budget go straight to the (free) Ken Burns fallback."""
+    img = extract_storyboard_path(scene.visual_description)
+    prompt = f"Animate this scene: {scene.visual_description}"
+    # Attempt real video generation if possible (placeholder for now)
+    try:
+        if not within_budget:
+            errors.append(f"Scene {scene.id} clip generation skipped: over budget")
+            video_path = "assets/placeholders/over_budget.mp4"
+        else:
+            video_path = await video_gen.generate_clip(prompt=prompt, image_url=img)
+    except RateLimitError as e:
+        # Surface the throttling, then take the same Ken Burns fallback as a failed generation
+        print(f"Animator Error: Scene {scene.id} clip rate limited: {e}", flush=True)
+        errors.append(f"Scene {scene.id} clip generation rate limited: {e}")
+        video_path = "assets/placeholders/rate_limited.mp4"
     
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
+    source = "generated"
+    # Check if we got a mock placeholder or if it doesn't exist
+    if "placeholders" in video_path or not os.path.exists(video_path):
+        source = "placeholder"
+        if img and os.path.exists(img):
+            print(f"Animator: Falling back to ffmpeg for Scene {scene.id}", flush=True)
+            gen_path = workspace.clip_path(scene.id)
+            success_path = await generate_ken_burns_video(img, gen_path, duration=scene.estimated_duration)
+            if success_path:
+                video_path = success_path
+                source = "ken_burns"
+        else:
+            print(f"Animator Warning: No storyboard image for Scene {scene.id}, using mock path", flush=True)
+    await emit("clip_ready", scene_id=scene.id, path=video_path, source=source)
     
-    if process.returncode != 0:
-        print(f"FFmpeg Error: {stderr.decode()}")
-        return None
-    return output_path
+    # Only the fields this agent owns; the scenes reducer merges them by id
+    return {"id": scene.id, "video_clip_path": video_path, "status": "done"}
 
 async def animator_node(state: EpisodeState) -> Dict[str, Any]:
     print("--- ANIMATION AGENT STARTED ---", flush=True)
     
     video_gen = ProviderFactory.get_video_gen()
     
-    tasks = []
-    for scene in state.scenes:
-        # Extract storyboard path from visual_description [Ref: path]
-        storyboard_path = None
-        if "[Ref: " in scene.visual_description:
-            try:
-                storyboard_path = scene.visual_description.split("[Ref: ")[1].split("]")[0]
-            except:
-                pass
+    workspace = job_workspace(state.project_id)
+    errors = []
+    # Generated clips for as many scenes, from the start of the episode, as the budgets cover
+    order = sorted(state.scenes, key=lambda s: s.sequence_order)
+    async with get_cost_ledger().reserve(state.project_id, price_of_call(video_gen, video=1), len(order)) as budget:
+        admitted = {s.id for s in order[:budget.admitted]}
+        if budget.throttled:
+            print(f"Animator: Budget covers {budget.admitted}/{budget.requested} clips; the rest use Ken Burns", flush=True)
+            await emit("budget_throttled", stage="animate", admitted=budget.admitted, requested=budget.requested)
+        tasks = [animate_scene(video_gen, scene, errors, workspace, scene.id in admitted) for scene in state.scenes]
         
-        async def animate_scene(s=scene, img=storyboard_path):
-            prompt = f"Animate this scene: {s.visual_description}"
-            # Attempt real video generation if possible (placeholder for now)
-            video_path = await video_gen.generate_clip(prompt=prompt, image_url=img)
-            
-            # Check if we got a mock placeholder or if it doesn't exist
-            if "placeholders" in video_path or not os.path.exists(video_path):
-                if img and os.path.exists(img):
-                    print(f"Animator: Falling back to ffmpeg for Scene {s.id}", flush=True)
-                    gen_path = f"assets/generated_videos/scene_{s.id}.mp4"
-                    success_path = await generate_ken_burns_video(img, gen_path, duration=s.estimated_duration)
-                    if success_path:
-                        video_path = success_path
-                else:
-                    print(f"Animator Warning: No storyboard image for Scene {s.id}, using mock path", flush=True)
-            
-            s.video_clip_path = video_path
-            s.status = "done"
-            return s
-        
-        tasks.append(animate_scene())
-    
-    updated_scenes = await asyncio.gather(*tasks)
+        scene_updates = await asyncio.gather(*tasks)
     
+    if errors:
+        return {"scenes": scene_updates, "errors": errors}
     return {
-        "scenes": updated_scenes
+        "scenes": scene_updates
     }
@@ -1,43 +1,53 @@
 import asyncio
-from typing import Dict, Any
-from ai_film_studio.core.state import EpisodeState
+from typing import Dict, Any, Optional
+from ai_film_studio.core.interfaces import AudioProvider
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.events import emit
 from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.scheduler import RateLimitError
+
+async def synthesize_scene_audio(tts_provider: AudioProvider, scene: Scene) -> Optional[Dict[str, Any]]:
+    """Generates the dialogue track for one scene and returns the scene update, or None without dialogue.
+    Raises RateLimitError if the TTS provider kept throttling us."""
+    if not scene.dialogue:
+        return None
+    
+    # For MVP, we just concatenate all dialogue into one audio file for the scene
+    # In a real app, we'd handle timing per line and separate files
+    full_text = " ".join([d.get('text', '') for d in scene.dialogue])
+    
+    # Simple voice logic: pick a voice based on speaker gender if known, or default
+    # Here we just use default
+    voice_id = "en-US-Journey-F" # Example Google Voice
+    
+    path = await tts_provider.generate_speech(full_text, voice_id)
+    await emit("audio_done", scene_id=scene.id, path=path)
+    # Only audio fields are returned so this branch can run alongside storyboarding/animation
+    return {"id": scene.id, "audio_track_path": path}
 
 async def audio_engineer_node(state: EpisodeState) -> Dict[str, Any]:
     print("--- AUDIO ENGINEER AGENT STARTED ---")
     
     tts_provider = ProviderFactory.get_audio()
-    updated_scenes = []
     
     tasks = []
+    errors = []
 
     for scene in state.scenes:
-        # If there's dialogue, generate audio
-        if scene.dialogue:
-            # For MVP, we just concatenate all dialogue into one audio file for the scene
-            # In a real app, we'd handle timing per line and separate files
-            
-            full_text = " ".join([d.get('text', '') for d in scene.dialogue])
-            
-            # Simple voice logic: pick a voice based on speaker gender if known, or default
-            # Here we just use default
-            voice_id = "en-US-Journey-F" # Example Google Voice
-            
-            async def gen_audio_task(s=scene, t=full_text, v=voice_id):
-                path = await tts_provider.generate_speech(t, v)
-                s.audio_track_path = path
-                return s
-            
-            tasks.append(gen_audio_task())
-        else:
-            # No dialogue, keep scene as is
-            tasks.append(asyncio.sleep(0, result=scene))
+        async def gen_audio_task(s=scene):
+            try:
+                return await synthesize_scene_audio(tts_provider, s)
+            except RateLimitError as e:
+                print(f"Audio Engineer Error: Scene {s.id} TTS rate limited: {e}", flush=True)
+                errors.append(f"Scene {s.id} TTS rate limited: {e}")
+                return None
+        
+        tasks.append(gen_audio_task())
 
-    # Wait for all TTS generation
-    updated_scenes_raw = await asyncio.gather(*tasks)
-    
-    # asyncio.gather returns the results in order, but dealing withmixed types (Scene vs sleep result)
-    # The sleep helper above returns the scene object so it's consistent.
-    updated_scenes = list(updated_scenes_raw)
+    # Wait for all TTS generation; scenes without dialogue need no update
+    results = await asyncio.gather(*tasks)
+    scene_updates = [update for update in results if update]
 
-    return {"scenes": updated_scenes}
+    if errors:
+        return {"scenes": scene_updates, "errors": errors}
+    return {"scenes": scene_updates}
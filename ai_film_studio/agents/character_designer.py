@@ -3,6 +3,9 @@ from typing import Dict, Any, List
 from ai_film_studio.core.state import EpisodeState, CharacterProfile
 from ai_film_studio.providers.factory import ProviderFactory
 from ai_film_studio.core.memory import memory_store
+from ai_film_studio.providers.scheduler import RateLimitError
+
+PLACEHOLDER_SHEET = "assets/placeholders/no_image_generated.png"
 
 async def character_designer_node(state: EpisodeState) -> Dict[str, Any]:
     print("--- CHARACTER DESIGNER AGENT STARTED ---")
@@ -17,14 +20,17 @@ async def character_designer_node(state: EpisodeState) -> Dict[str, Any]:
     updated_characters = state.characters.copy()
     
     generation_tasks = []
+    errors = []
+    
+    # Enforce consistency check (Risk Protocol)
+    # 1. Search Memory for every character at once (one batched embedding request)
+    names = [char_data.get('name', 'Unknown') for char_data in raw_characters]
+    all_existing = await memory_store.search_assets_bulk(names, asset_type="character", limit=1)
     
-    for char_data in raw_characters:
+    for char_data, existing_assets in zip(raw_characters, all_existing):
         name = char_data.get('name', 'Unknown')
         desc = char_data.get('visual_description', '')
         
-        # Enforce consistency check (Risk Protocol)
-        # 1. Search Memory
-        existing_assets = await memory_store.search_assets(name, asset_type="character", limit=1)
         ref_image = None
         if existing_assets and existing_assets[0]['distance'] < 0.2: # Threshold
              print(f"Found existing character: {existing_assets[0]['name']}")
@@ -36,17 +42,14 @@ async def character_designer_node(state: EpisodeState) -> Dict[str, Any]:
              
         # Async generation
         async def gen_task(n=name, c_desc=desc, p=prompt, ref=ref_image):
-            path = await image_gen.generate_image(p, reference_images=[ref] if ref else None)
-            
-            # Save new asset to memory for next time
-            await memory_store.add_asset(
-                name=n,
-                asset_type="character",
-                metadata={"image_path": path, "description": c_desc},
-                context_text=f"{n} {c_desc}"
-            )
-            
-            return n, CharacterProfile(
+            generated = True
+            try:
+                path = await image_gen.generate_image(p, reference_images=[ref] if ref else None)
+            except RateLimitError as e:
+                print(f"Character Designer Error: {n} design sheet rate limited: {e}", flush=True)
+                errors.append(f"Character {n} design sheet failed: {e}")
+                path, generated = PLACEHOLDER_SHEET, False
+            return n, generated, CharacterProfile(
                 name=n,
                 description=c_desc,
                 visual_spec={'raw': c_desc},
@@ -58,7 +61,20 @@ async def character_designer_node(state: EpisodeState) -> Dict[str, Any]:
     # Run all character generations in parallel
     results = await asyncio.gather(*generation_tasks)
     
-    for name, profile in results:
+    # Save new assets to memory for next time, in one batch (placeholders would poison later lookups)
+    await memory_store.add_assets([
+        {
+            "name": name,
+            "asset_type": "character",
+            "metadata": {"image_path": profile.image_paths[0], "description": profile.description},
+            "context_text": f"{name} {profile.description}",
+        }
+        for name, generated, profile in results if generated
+    ])
+    
+    for name, _, profile in results:
         updated_characters[name] = profile
         
+    if errors:
+        return {"characters": updated_characters, "errors": errors}
     return {"characters": updated_characters}
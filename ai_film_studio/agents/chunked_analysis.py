@@ -0,0 +1,177 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider
+
+_NUMBER_WORDS = "one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|first|second|third|fourth|fifth|last"
+# Short lines such as "Chapter 12", "CHAPTER XII: The Storm", "Part Two", "Book 3", "Prologue", "# Heading"
+_CHAPTER_HEADING = re.compile(
+    r"^(?=[^\n]{1,80}$)[ \t]*(?:(?:chapter|part|book)\s+(?:\d+|[ivxlcdm]+|" + _NUMBER_WORDS + r")\b[^\n]*"
+    r"|prologue\b[^\n]*|epilogue\b[^\n]*|#{1,3}[ \t]+\S[^\n]*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+CHUNK_SYSTEM_PROMPT = """
+You are an expert Story Analyst for an AI Film Studio.
+You are given one section of a longer novel. Extract, for this section only:
+1. A concise summary of what happens.
+2. The characters who appear, with visual descriptions.
+3. A breakdown of the section into linear scenes.
+
+Output structured JSON data.
+"""
+CHUNK_SCHEMA = ("JSON with keys: summary (string), characters (list of {name, visual_description}), "
+                "scenes (list of {description, characters_present})")
+
+MERGE_SYSTEM_PROMPT = "You are an expert Story Analyst. Merge consecutive section summaries of a novel into one coherent plot summary, keeping every major plot point in order."
+
+@dataclass
+class StoryChunk:
+    chapter: str # Chapter heading, or "" when the text has none
+    part: int # Position of this chunk inside its chapter
+    text: str
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; close enough to budget prompts without a tokenizer
+    return len(text) // 4 + 1
+
+def split_chapters(text: str) -> List[Tuple[str, str]]:
+    """(heading, text) per chapter. Text before the first heading becomes its own untitled chapter."""
+    headings = list(_CHAPTER_HEADING.finditer(text))
+    if not headings:
+        return [("", text)]
+    chapters = []
+    if text[:headings[0].start()].strip():
+        chapters.append(("", text[:headings[0].start()]))
+    for i, match in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        chapters.append((match.group(0).strip(), text[match.start():end]))
+    return chapters
+
+def _split_to_budget(text: str, max_tokens: int) -> List[str]:
+    """Splits on paragraph breaks, falling back to hard character cuts for giant paragraphs."""
+    max_chars = max_tokens * 4
+    pieces: List[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        while len(paragraph) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+def segment_story(text: str, max_tokens: Optional[int] = None) -> List[StoryChunk]:
+    """Splits a story into chunks of at most `max_tokens`.
+
+    Chunks never span chapters, so editing one chapter leaves the chunks (and cached analyses)
+    of every other chapter unchanged.
+    """
+    max_tokens = max_tokens or settings.STORY_CHUNK_TOKENS
+    chunks = []
+    for heading, chapter_text in split_chapters(text):
+        if not chapter_text.strip():
+            continue
+        for part, piece in enumerate(_split_to_budget(chapter_text.strip(), max_tokens)):
+            chunks.append(StoryChunk(chapter=heading, part=part, text=piece))
+    return chunks
+
+def _character_key(name: str) -> str:
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+def merge_characters(groups: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Unions character lists by name (case-insensitive), in order of first appearance.
+    The most detailed visual description seen for a character wins."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for characters in groups:
+        for character in characters:
+            if not isinstance(character, dict) or not character.get("name"):
+                continue
+            key = _character_key(character["name"])
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dict(character)
+            elif len(character.get("visual_description", "")) > len(existing.get("visual_description", "")):
+                existing["visual_description"] = character["visual_description"]
+    return list(merged.values())
+
+async def _analyze_chunk(llm: LLMProvider, chunk: StoryChunk, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    # The prompt depends only on the chunk text, so unchanged chapters hit the LLM cache on re-analysis
+    async with semaphore:
+        return await llm.generate_json(CHUNK_SYSTEM_PROMPT, f"Analyze this section:\n{chunk.text}", schema=CHUNK_SCHEMA)
+
+async def _merge_summaries(llm: LLMProvider, summaries: List[str], semaphore: asyncio.Semaphore, context: str = "") -> str:
+    async with semaphore:
+        prompt = "\n\n".join(f"Section {i + 1}:\n{s}" for i, s in enumerate(summaries))
+        if context:
+            prompt += f"\n\nContext from previous episodes (for continuity only, do not summarize it):\n{context}"
+        return await llm.generate_text(MERGE_SYSTEM_PROMPT, prompt, temperature=0.2)
+
+async def _reduce_summaries(llm: LLMProvider, summaries: List[str], semaphore: asyncio.Semaphore, context: str = "") -> Tuple[str, List[str]]:
+    """Merges summaries in groups of STORY_MERGE_FANOUT, level by level, until one is left.
+    A changed chapter only invalidates the merges on its path to the root. Past-episode context
+    only enters the root merge so it never invalidates per-chapter work.
+
+    A failed merge (an exception, or an in-band "Error: ..." reply) keeps its group's summaries
+    joined as they are, so the other chunks' work survives. Returns (summary, errors)."""
+    fanout = max(2, settings.STORY_MERGE_FANOUT)
+    level = [s for s in summaries if s]
+    errors: List[str] = []
+    while len(level) > 1:
+        groups = [level[i:i + fanout] for i in range(0, len(level), fanout)]
+        root_context = context if len(groups) == 1 else ""
+        merged = await asyncio.gather(*[
+            _merge_summaries(llm, group, semaphore, root_context) if len(group) > 1 else asyncio.sleep(0, group[0])
+            for group in groups
+        ], return_exceptions=True)
+        level = []
+        for group, result in zip(groups, merged):
+            if isinstance(result, Exception) or not isinstance(result, str) or not result.strip() or result.startswith("Error:"):
+                errors.append(f"Summary merge of {len(group)} sections failed: {result or 'empty reply'}")
+                result = "\n\n".join(group)
+            level.append(result)
+    return (level[0] if level else ""), errors
+
+async def analyze_story_chunked(llm: LLMProvider, text: str, context: str = "") -> Tuple[Dict[str, Any], List[str]]:
+    """Map-reduce analysis of a long story into the usual story_analysis shape
+    ({plot_summary, characters, scenes}). Returns (analysis, errors)."""
+    chunks = segment_story(text)
+    chapters = len({c.chapter for c in chunks})
+    print(f"Story Analyst: Chunked analysis of {chapters} chapter(s) in {len(chunks)} chunk(s)", flush=True)
+
+    semaphore = asyncio.Semaphore(settings.STORY_ANALYSIS_CONCURRENCY)
+    results = await asyncio.gather(*[_analyze_chunk(llm, chunk, semaphore) for chunk in chunks], return_exceptions=True)
+
+    errors: List[str] = []
+    summaries: List[str] = []
+    character_groups: List[List[Dict[str, Any]]] = []
+    scenes: List[Dict[str, Any]] = []
+    for chunk, result in zip(chunks, results):
+        label = chunk.chapter or "untitled section"
+        if isinstance(result, Exception) or not isinstance(result, dict) or result.get("errors"):
+            detail = result if isinstance(result, Exception) else (result.get("errors") if isinstance(result, dict) else result)
+            errors.append(f"Story analysis failed for {label} (part {chunk.part + 1}): {detail}")
+            continue
+        summaries.append(str(result.get("summary", "")))
+        character_groups.append(result.get("characters") or [])
+        for scene in result.get("scenes") or []:
+            if isinstance(scene, dict):
+                scenes.append({**scene, "id": len(scenes) + 1, "chapter": chunk.chapter})
+
+    plot_summary, merge_errors = await _reduce_summaries(llm, summaries, semaphore, context)
+    errors.extend(merge_errors)
+    analysis = {
+        "plot_summary": plot_summary,
+        "characters": merge_characters(character_groups),
+        "scenes": scenes,
+    }
+    return analysis, errors
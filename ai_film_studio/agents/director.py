@@ -1,38 +1,65 @@
 import asyncio
 from typing import Dict, Any
-from ai_film_studio.core.state import EpisodeState
+from ai_film_studio.core.interfaces import ImageGenerationProvider
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.cost_ledger import get_cost_ledger, price_of_call
+from ai_film_studio.core.events import emit
 from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.scheduler import RateLimitError
+
+def build_storyboard_prompt(scene: Scene) -> str:
+    # Create a rich visual prompt
+    # In a real system, we'd inject character embeddings/references here
+    return f"""
+        Cinematic Storyboard.
+        Scene ID: {scene.id}
+        Action: {scene.visual_description}
+        Setting: {scene.script_content[:100]}...
+        Style: Anime, High quality, Broadcast ready.
+        """
+
+async def storyboard_scene(image_gen: ImageGenerationProvider, scene: Scene) -> Dict[str, Any]:
+    """Generates the 'keyframe' or storyboard for one scene and returns the scene update.
+    Raises RateLimitError if the image provider kept throttling us."""
+    path = await image_gen.generate_image(build_storyboard_prompt(scene))
+    await emit("storyboard_done", scene_id=scene.id, path=path)
+    # In a real app, we might store the path in a dedicated field or the 'video_clip_path' temporarily
+    # For now, let's assume valid generation implies we are ready for animation.
+    # Only the changed fields are returned; the scenes reducer merges them by id.
+    return {"id": scene.id, "visual_description": f"{scene.visual_description} [Ref: {path}]"}
 
 async def director_node(state: EpisodeState) -> Dict[str, Any]:
     print("--- DIRECTOR (STORYBOARD) AGENT STARTED ---")
     
     image_gen = ProviderFactory.get_image_gen()
-    updated_scenes = []
     
     # Parallel generation of visual concepts for scenes
     tasks = []
+    errors = []
     
-    for scene in state.scenes:
-        # Create a rich visual prompt
-        # In a real system, we'd inject character embeddings/references here
-        prompt = f"""
-        Cinematic Storyboard.
-        Scene ID: {scene.id}
-        Action: {scene.visual_description}
-        Setting: {scene.script_content[:100]}...
-        Style: Anime, High quality, Broadcast ready.
-        """
-        
-        async def gen_scene_visual(s=scene, p=prompt):
-            # Generate the 'keyframe' or storyboard for the scene
-            path = await image_gen.generate_image(p)
-            s.visual_description = f"{s.visual_description} [Ref: {path}]"
-            # In a real app, we might store the path in a dedicated field or the 'video_clip_path' temporarily
-            # For now, let's assume valid generation implies we are ready for animation.
-            return s
+    # Storyboard as many scenes, from the start of the episode, as the job's and the day's budgets cover
+    scenes = sorted(state.scenes, key=lambda s: s.sequence_order)
+    async with get_cost_ledger().reserve(state.project_id, price_of_call(image_gen, image=1), len(scenes)) as budget:
+        over_budget = scenes[budget.admitted:]
+        if over_budget:
+            print(f"Director: Budget covers {budget.admitted}/{budget.requested} storyboards", flush=True)
+            await emit("budget_throttled", stage="storyboard", admitted=budget.admitted, requested=budget.requested)
+            errors.extend(f"Scene {s.id} storyboard skipped: over budget" for s in over_budget)
+
+        for scene in scenes[:budget.admitted]:
+            async def gen_scene_visual(s=scene):
+                try:
+                    return await storyboard_scene(image_gen, s)
+                except RateLimitError as e:
+                    print(f"Director Error: Scene {s.id} storyboard rate limited: {e}", flush=True)
+                    errors.append(f"Scene {s.id} storyboard failed: {e}")
+                    return {"id": s.id, "status": "failed"}
+                
+            tasks.append(gen_scene_visual())
             
-        tasks.append(gen_scene_visual())
-        
-    updated_scenes = await asyncio.gather(*tasks)
+        scene_updates = await asyncio.gather(*tasks)
+    scene_updates += [{"id": s.id, "status": "failed"} for s in over_budget]
     
-    return {"scenes": updated_scenes}
+    if errors:
+        return {"scenes": scene_updates, "errors": errors}
+    return {"scenes": scene_updates}
@@ -1,66 +1,57 @@
 import asyncio
 import os
-from typing import Dict, Any
-from ai_film_studio.core.state import EpisodeState
+import time
+from typing import Dict, Any, List, Optional
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.events import emit
+from ai_film_studio.core.metrics import FFMPEG_DURATION
+from ai_film_studio.core.tracing import span
+from ai_film_studio.core.workspace import job_workspace
 
-async def editor_node(state: EpisodeState) -> Dict[str, Any]:
-    print("--- EDITOR AGENT STARTED ---", flush=True)
-    
-    os.makedirs("assets/output", exist_ok=True)
-    os.makedirs("assets/temp", exist_ok=True)
-    
-    scene_clips = []
-    
-    # 1. Process each scene: Overlay audio on video
-    for i, scene in enumerate(state.scenes):
-        if not scene.video_clip_path or not os.path.exists(scene.video_clip_path):
-            print(f"Editor Warning: Missing video for Scene {scene.id}", flush=True)
-            continue
-            
-        scene_output = f"assets/temp/scene_{scene.id}_combined.mp4"
+def mux_concurrency() -> int:
+    """How many ffmpeg mux processes may run at once (EDITOR_MUX_CONCURRENCY, 0 = one per CPU)."""
+    return settings.EDITOR_MUX_CONCURRENCY or os.cpu_count() or 1
+
+async def mux_scene(scene: Scene, scene_output: str) -> bool:
+    """Overlays the scene's audio (or a silent track) onto its clip. Returns True on success."""
+    # Command to overlay audio onto video.
+    # Normalize to 44100Hz Stereo to ensure consistency for concatenation.
+    if scene.audio_track_path and os.path.exists(scene.audio_track_path):
+        print(f"Editor: Combining Audio + Video (Normalized) for Scene {scene.id}", flush=True)
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", scene.video_clip_path,
+            "-i", scene.audio_track_path,
+            "-map", "0:v", "-map", "1:a",
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-ar", "44100",
+            "-ac", "2",
+            "-shortest",
+            scene_output
+        ]
+    else:
+        print(f"Editor: Adding silent normalized audio track to Scene {scene.id}", flush=True)
+        cmd = [
+            "ffmpeg", "-y", 
+            "-i", scene.video_clip_path,
+            "-f", "lavfi", "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-shortest",
+            scene_output
+        ]
         
-        # Command to overlay audio onto video.
-        # Normalize to 44100Hz Stereo to ensure consistency for concatenation.
-        if scene.audio_track_path and os.path.exists(scene.audio_track_path):
-            print(f"Editor: Combining Audio + Video (Normalized) for Scene {scene.id}", flush=True)
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", scene.video_clip_path,
-                "-i", scene.audio_track_path,
-                "-map", "0:v", "-map", "1:a",
-                "-c:v", "copy",
-                "-c:a", "aac",
-                "-ar", "44100",
-                "-ac", "2",
-                "-shortest",
-                scene_output
-            ]
-        else:
-            print(f"Editor: Adding silent normalized audio track to Scene {scene.id}", flush=True)
-            cmd = [
-                "ffmpeg", "-y", 
-                "-i", scene.video_clip_path,
-                "-f", "lavfi", "-i", "anullsrc=channel_layout=stereo:sample_rate=44100",
-                "-c:v", "copy",
-                "-c:a", "aac",
-                "-shortest",
-                scene_output
-            ]
-            
+    with FFMPEG_DURATION.time(operation="mux"), span("ffmpeg:mux", scene_id=scene.id):
         process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
         await process.communicate()
-        
-        if process.returncode == 0:
-            scene_clips.append(scene_output)
-
-    # 2. Concatenate all scene clips
-    output_path = f"assets/output/episode_{state.episode_number}_final.mp4"
-    if not scene_clips:
-        print("Editor Error: No scene clips to concatenate.", flush=True)
-        return {"errors": ["No scene clips generated"]}
+    await emit("mux_done", scene_id=scene.id, ok=process.returncode == 0)
+    return process.returncode == 0
 
+async def concat_clips(scene_clips: List[str], list_path: str, output_path: str) -> Optional[str]:
+    """Concatenates muxed scene clips into the final video. Returns ffmpeg's stderr on failure."""
     # Create a concat list file for ffmpeg
-    list_path = "assets/temp/concat_list.txt"
     with open(list_path, "w") as f:
         for clip in scene_clips:
             # ffmpeg concat demuxer requires absolute paths or paths relative to the list file
@@ -76,12 +67,57 @@ async def editor_node(state: EpisodeState) -> Dict[str, Any]:
         output_path
     ]
     
-    process = await asyncio.create_subprocess_exec(*concat_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-    stdout, stderr = await process.communicate()
+    with FFMPEG_DURATION.time(operation="concat"), span("ffmpeg:concat", clips=len(scene_clips)):
+        process = await asyncio.create_subprocess_exec(*concat_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        stdout, stderr = await process.communicate()
     
     if process.returncode != 0:
-        print(f"Editor FFmpeg Concat Error: {stderr.decode()}", flush=True)
-        return {"errors": [stderr.decode()]}
+        return stderr.decode()
+    return None
+
+async def editor_node(state: EpisodeState) -> Dict[str, Any]:
+    print("--- EDITOR AGENT STARTED ---", flush=True)
+    
+    workspace = job_workspace(state.project_id)
+    
+    # 1. Process each scene: Overlay audio on video
+    # Muxes are independent ffmpeg processes, so run them in parallel up to the CPU budget
+    slots = asyncio.Semaphore(mux_concurrency())
+    mux_times: Dict[int, float] = {}
+    
+    async def mux_task(scene: Scene) -> Optional[str]:
+        if not scene.video_clip_path or not os.path.exists(scene.video_clip_path):
+            print(f"Editor Warning: Missing video for Scene {scene.id}", flush=True)
+            return None
+            
+        scene_output = workspace.muxed_path(scene.id)
+        async with slots:
+            started_at = time.monotonic()
+            success = await mux_scene(scene, scene_output)
+            mux_times[scene.id] = time.monotonic() - started_at
+        print(f"Editor: Scene {scene.id} muxed in {mux_times[scene.id]:.2f}s", flush=True)
+        return scene_output if success else None
+    
+    mux_started_at = time.monotonic()
+    ordered_scenes = sorted(state.scenes, key=lambda s: s.sequence_order)
+    results = await asyncio.gather(*[mux_task(scene) for scene in ordered_scenes])
+    # gather preserves input order, so clips stay in sequence_order whatever finished first
+    scene_clips = [clip for clip in results if clip]
+    
+    quality_metrics = {**state.quality_metrics, "editor_mux_total_seconds": time.monotonic() - mux_started_at}
+    for scene_id, seconds in mux_times.items():
+        quality_metrics[f"mux_seconds_scene_{scene_id}"] = seconds
+
+    # 2. Concatenate all scene clips
+    output_path = workspace.final_video_path(state.episode_number)
+    if not scene_clips:
+        print("Editor Error: No scene clips to concatenate.", flush=True)
+        return {"errors": ["No scene clips generated"], "quality_metrics": quality_metrics}
+
+    concat_error = await concat_clips(scene_clips, workspace.concat_list_path(state.episode_number), output_path)
+    if concat_error:
+        print(f"Editor FFmpeg Concat Error: {concat_error}", flush=True)
+        return {"errors": [concat_error], "quality_metrics": quality_metrics}
         
     print(f"Editor: Final video created at {output_path}", flush=True)
-    return {"final_video_path": output_path}
+    return {"final_video_path": output_path, "quality_metrics": quality_metrics}
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.cost_ledger import get_cost_ledger, price_of_call
+from ai_film_studio.core.events import emit
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.workspace import job_workspace
+from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.scheduler import RateLimitError
+from ai_film_studio.agents.director import storyboard_scene
+from ai_film_studio.agents.animator import animate_scene
+from ai_film_studio.agents.audio_engineer import synthesize_scene_audio
+from ai_film_studio.agents.editor import mux_scene, mux_concurrency, concat_clips
+from ai_film_studio.agents.scriptwriter import ScreenplayStream
+
+# Streaming alternative to director -> animator -> audio_engineer -> editor.
+# Instead of each agent waiting for every scene, scenes flow independently:
+#
+#   source --> [storyboard] --q--> [animate] --q--> [mux] --> concat (once all scenes are muxed)
+#          \--> TTS task per scene ---------------------^
+#
+# Queues are bounded so a fast stage cannot run arbitrarily far ahead of a slow one.
+
+_DONE = None
+
+async def _iterate(scenes: Iterable[Scene]):
+    for scene in scenes:
+        yield scene
+
+async def _stage(name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue], workers: int,
+                 downstream_workers: int, handle: Callable[[int], Awaitable[None]], errors: List[str]):
+    async def worker():
+        while True:
+            scene_id = await inbox.get()
+            if scene_id is _DONE:
+                return
+            try:
+                await handle(scene_id)
+            except Exception as e:
+                # One broken scene must not stall the others; it moves on with whatever it has
+                print(f"Scene Pipeline Error: {name} failed for Scene {scene_id}: {e}", flush=True)
+                errors.append(f"Scene {scene_id} {name} failed: {e}")
+            if outbox is not None:
+                await outbox.put(scene_id)
+
+    await asyncio.gather(*[worker() for _ in range(workers)])
+    if outbox is not None:
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+async def run_scene_pipeline(scenes: AsyncIterable[Scene], project_id: str, episode_number: int) -> Dict[str, Any]:
+    """Runs every scene through storyboard -> animate -> TTS -> mux as soon as its inputs are ready,
+    then concatenates the muxed scenes in sequence order into the job's workspace. Returns EpisodeState updates."""
+    image_gen = ProviderFactory.get_image_gen()
+    video_gen = ProviderFactory.get_video_gen()
+    tts_provider = ProviderFactory.get_audio()
+
+    workspace = job_workspace(project_id)
+    # Scenes arrive one at a time here, so each is admitted against the budgets on its own
+    ledger = get_cost_ledger()
+    storyboard_cost = price_of_call(image_gen, image=1)
+    clip_cost = price_of_call(video_gen, video=1)
+
+    workers = settings.SCENE_PIPELINE_STAGE_WORKERS
+    mux_workers = mux_concurrency()
+    storyboard_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SCENE_PIPELINE_QUEUE_SIZE)
+    animate_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SCENE_PIPELINE_QUEUE_SIZE)
+    mux_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SCENE_PIPELINE_QUEUE_SIZE)
+
+    current: Dict[int, Scene] = {} # Latest version of every scene seen so far
+    audio_tasks: Dict[int, asyncio.Task] = {}
+    muxed: Dict[int, str] = {}
+    errors: List[str] = []
+    started_at = time.monotonic()
+    first_muxed_at: Optional[float] = None
+
+    def apply(update: Optional[Dict[str, Any]]):
+        # Synchronous read-modify-write, so concurrent TTS and video updates cannot clobber each other
+        if update:
+            fields = {k: v for k, v in update.items() if k != "id"}
+            current[update["id"]] = current[update["id"]].model_copy(update=fields)
+
+    async def synthesize(scene: Scene):
+        try:
+            apply(await synthesize_scene_audio(tts_provider, scene))
+        except RateLimitError as e:
+            print(f"Scene Pipeline Error: Scene {scene.id} TTS rate limited: {e}", flush=True)
+            errors.append(f"Scene {scene.id} TTS rate limited: {e}")
+        except Exception as e:
+            # mux awaits this task; the clip still gets muxed, with a silent track
+            print(f"Scene Pipeline Error: Scene {scene.id} TTS failed: {e}", flush=True)
+            errors.append(f"Scene {scene.id} TTS failed: {e}")
+
+    async def produce():
+        try:
+            async for scene in scenes:
+                current[scene.id] = scene
+                # TTS only needs the dialogue, so it starts the moment the scene exists
+                audio_tasks[scene.id] = asyncio.create_task(synthesize(scene))
+                await storyboard_queue.put(scene.id)
+        except Exception as e:
+            # E.g. a screenplay stream interrupted mid-way: the scenes already written still get finished
+            print(f"Scene Pipeline Error: Scene source failed after {len(current)} scenes: {e}", flush=True)
+            errors.append(f"Scene source failed after {len(current)} scenes: {e}")
+        finally:
+            # Always release the downstream stages, even if the scene source failed
+            for _ in range(workers):
+                await storyboard_queue.put(_DONE)
+
+    async def storyboard(scene_id: int):
+        async with ledger.reserve(project_id, storyboard_cost, 1) as budget:
+            if not budget.admitted:
+                print(f"Scene Pipeline: Scene {scene_id} storyboard over budget", flush=True)
+                await emit("budget_throttled", stage="storyboard", scene_id=scene_id)
+                errors.append(f"Scene {scene_id} storyboard skipped: over budget")
+                return
+            try:
+                apply(await storyboard_scene(image_gen, current[scene_id]))
+            except RateLimitError as e:
+                print(f"Scene Pipeline Error: Scene {scene_id} storyboard rate limited: {e}", flush=True)
+                errors.append(f"Scene {scene_id} storyboard failed: {e}")
+
+    async def animate(scene_id: int):
+        async with ledger.reserve(project_id, clip_cost, 1) as budget:
+            if not budget.admitted:
+                await emit("budget_throttled", stage="animate", scene_id=scene_id)
+            apply(await animate_scene(video_gen, current[scene_id], errors, workspace, bool(budget.admitted)))
+
+    async def mux(scene_id: int):
+        nonlocal first_muxed_at
+        await audio_tasks[scene_id]
+        scene = current[scene_id]
+        if not scene.video_clip_path or not os.path.exists(scene.video_clip_path):
+            print(f"Scene Pipeline Warning: Missing video for Scene {scene_id}", flush=True)
+            return
+        scene_output = workspace.muxed_path(scene_id)
+        if await mux_scene(scene, scene_output):
+            muxed[scene_id] = scene_output
+            if first_muxed_at is None:
+                first_muxed_at = time.monotonic()
+                print(f"Scene Pipeline: First scene muxed after {first_muxed_at - started_at:.1f}s", flush=True)
+
+    stages = [asyncio.create_task(stage) for stage in (
+        produce(),
+        _stage("storyboard", storyboard_queue, animate_queue, workers, workers, storyboard, errors),
+        _stage("animate", animate_queue, mux_queue, workers, mux_workers, animate, errors),
+        _stage("mux", mux_queue, None, mux_workers, 0, mux, errors),
+    )]
+    try:
+        await asyncio.gather(*stages)
+    finally:
+        # If anything escaped (or the node was cancelled), no stage may keep calling paid providers
+        # for scenes nobody will collect
+        leftovers = [task for task in (*stages, *audio_tasks.values()) if not task.done()]
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
+
+    ordered = sorted(current.values(), key=lambda s: s.sequence_order)
+    scene_clips = [muxed[s.id] for s in ordered if s.id in muxed]
+    result: Dict[str, Any] = {"scenes": ordered}
+
+    if not scene_clips:
+        print("Scene Pipeline Error: No scene clips to concatenate.", flush=True)
+        errors.append("No scene clips generated")
+    else:
+        output_path = workspace.final_video_path(episode_number)
+        concat_error = await concat_clips(scene_clips, workspace.concat_list_path(episode_number), output_path)
+        if concat_error:
+            print(f"Scene Pipeline FFmpeg Concat Error: {concat_error}", flush=True)
+            errors.append(concat_error)
+        else:
+            print(f"Scene Pipeline: Final video created at {output_path}", flush=True)
+            result["final_video_path"] = output_path
+
+    total = time.monotonic() - started_at
+    metrics = {"scene_pipeline_total_seconds": total}
+    if first_muxed_at is not None:
+        metrics["time_to_first_muxed_scene_seconds"] = first_muxed_at - started_at
+    print(f"Scene Pipeline: {len(scene_clips)}/{len(current)} scenes muxed in {total:.1f}s", flush=True)
+
+    result["quality_metrics"] = metrics
+    if errors:
+        result["errors"] = errors
+    return result
+
+async def scene_pipeline_node(state: EpisodeState) -> Dict[str, Any]:
+    print("--- SCENE PIPELINE (STREAMING) STARTED ---", flush=True)
+    updates = await run_scene_pipeline(_iterate(state.scenes), state.project_id, state.episode_number)
+    updates["quality_metrics"] = {**state.quality_metrics, **updates["quality_metrics"]}
+    return updates
+
+async def screenplay_pipeline_node(state: EpisodeState) -> Dict[str, Any]:
+    """Scriptwriter and scene pipeline in one node: each scene enters storyboarding as soon as
+    its text has been written, while the rest of the screenplay is still streaming."""
+    print("--- SCRIPTWRITER + SCENE PIPELINE (STREAMING) STARTED ---", flush=True)
+    stream = ScreenplayStream(ProviderFactory.get_llm(), state.story_analysis)
+    updates = await run_scene_pipeline(stream.scenes(), state.project_id, state.episode_number)
+    updates["screenplay"] = stream.screenplay
+    updates["quality_metrics"] = {**state.quality_metrics, **stream.metrics, **updates["quality_metrics"]}
+    return updates
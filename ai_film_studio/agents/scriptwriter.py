@@ -1,25 +1,156 @@
-from typing import Dict, Any, List
+import asyncio
+import re
+import time
+from typing import Dict, Any, List, AsyncIterator, Optional
+from pydantic import BaseModel, Field
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider
 from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.structured_output import validate_items
 from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.scheduler import RateLimitError
+from ai_film_studio.providers.usage import token_usage
 
-async def scriptwriter_node(state: EpisodeState) -> Dict[str, Any]:
-    print("--- SCRIPTWRITER AGENT STARTED ---", flush=True)
-    
-    llm = ProviderFactory.get_llm()
-    
-    # 1. Generate Screenplay
-    screenplay_prompt = f"""
+# Sluglines as models write them: "INT. LIGHTHOUSE - NIGHT", "12. EXT. HARBOR - DAY", "**INT/EXT. CAR - DAY**"
+SCENE_HEADING = re.compile(r"^[\s*_#]*(?:\d+[.)]?\s+)?(?:INT\.?/EXT\.?|EXT\.?/INT\.?|I/E\.?|INT\.|EXT\.|EST\.)\s*\S")
+_CHARACTER_CUE = re.compile(r"^([A-Z][A-Z0-9 .'\-]{0,38}?)\s*(?:\((?:V\.O\.|O\.S\.|O\.C\.|CONT'D)\))?$")
+
+SCENE_SCHEMA = ("JSON object with keys: visual_description (string, for image gen), characters_present (list of names), "
+                "dialogue (list of objects with 'speaker' and 'text'), estimated_duration (float, in seconds)")
+
+# --- Structured output models (single-call mode) ---
+
+class ScriptBeat(BaseModel):
+    speaker: str = Field(description="Character speaking this line; empty string for an action line")
+    text: str
+
+class SceneDraft(BaseModel):
+    # Every line is written once as a beat; script text and dialogue are both derived from the beats
+    heading: str = Field(min_length=1, description="Slugline, e.g. 'INT. LIGHTHOUSE - NIGHT'")
+    beats: List[ScriptBeat] = Field(min_length=1, description="Action lines and dialogue in screenplay order")
+    visual_description: str = Field(description="What the shot looks like, for image generation")
+    characters_present: List[str]
+    estimated_duration: float = Field(description="Screen time in seconds")
+
+class ScreenplayDraft(BaseModel):
+    title: str
+    scenes: List[SceneDraft]
+
+def scriptwriter_mode(pipeline_mode: Optional[str] = None) -> str:
+    """Resolves SCRIPTWRITER_MODE. "auto" streams when scenes can flow downstream one by one
+    (streaming pipeline) and otherwise writes screenplay and scenes in a single structured call."""
+    mode = settings.SCRIPTWRITER_MODE
+    if mode != "auto":
+        return mode
+    return "streaming" if (pipeline_mode or settings.PIPELINE_MODE) == "streaming" else "structured"
+
+def _screenplay_prompt(story_analysis: Any) -> str:
+    return f"""
     You are an expert Screenwriter.
     Based on the following story analysis, write a detailed screenplay for an animated episode (approx 5 minutes).
     Include dialogue, action lines, and scene headers.
-    
-    Story Analysis: {state.story_analysis}
+
+    Story Analysis: {story_analysis}
     """
-    
-    screenplay_text = await llm.generate_text("You are a professional Screenwriter.", screenplay_prompt)
-    
-    # 2. Parse Scenes structured data
-    # In a real app we'd chain this or use function calling
+
+class SceneHeadingParser:
+    """Splits a streamed screenplay into scenes at each slugline.
+
+    feed() takes arbitrary text pieces and returns the scenes completed by them: a scene is complete
+    once the next slugline starts. close() returns the last scene. Text before the first slugline
+    (title, "FADE IN:") is not part of any scene.
+    """
+    def __init__(self):
+        self._partial_line = ""
+        self._current: List[str] = []
+        self.headings_seen = 0
+
+    def _line(self, line: str) -> Optional[str]:
+        completed = None
+        if SCENE_HEADING.match(line):
+            if self._current:
+                completed = "\n".join(self._current).strip()
+            self._current = [line]
+            self.headings_seen += 1
+        elif self._current:
+            self._current.append(line)
+        return completed
+
+    def feed(self, text: str) -> List[str]:
+        lines = (self._partial_line + text).split("\n")
+        self._partial_line = lines.pop() # Possibly cut mid-line; wait for the rest
+        return [scene for scene in map(self._line, lines) if scene]
+
+    def close(self) -> List[str]:
+        completed = [self._line(self._partial_line)] if self._partial_line else []
+        self._partial_line = ""
+        if self._current:
+            completed.append("\n".join(self._current).strip())
+            self._current = []
+        return [scene for scene in completed if scene]
+
+def parse_scene_heuristically(text: str) -> Dict[str, Any]:
+    """Reads dialogue and action straight from screenplay formatting, without a model call."""
+    lines = [line.strip().strip("*_").strip() for line in text.splitlines()]
+    action: List[str] = []
+    dialogue: List[Dict[str, str]] = []
+    speaker = None
+    for line in lines[1:]:
+        if not line:
+            speaker = None
+            continue
+        cue = _CHARACTER_CUE.match(line)
+        if speaker is None and cue and not line.endswith("TO:") and not SCENE_HEADING.match(line):
+            speaker = cue.group(1).strip().title()
+        elif speaker is not None:
+            if not (line.startswith("(") and line.endswith(")")): # Skip parentheticals
+                dialogue.append({"speaker": speaker, "text": line})
+        else:
+            action.append(line)
+    heading = lines[0] if lines else ""
+    words = sum(len(d["text"].split()) for d in dialogue)
+    return {
+        "visual_description": " ".join([heading] + action[:4]).strip(),
+        "characters_present": list(dict.fromkeys(d["speaker"] for d in dialogue)),
+        "dialogue": dialogue,
+        # ~2.5 spoken words per second plus a beat per action paragraph
+        "estimated_duration": max(4.0, words / 2.5 + 2.0 * min(len(action), 4)),
+    }
+
+def _build_scene(index: int, text: str, fields: Dict[str, Any]) -> Scene:
+    fallback = parse_scene_heuristically(text)
+    return Scene(
+        id=index,
+        sequence_order=index,
+        script_content=text,
+        visual_description=str(fields.get("visual_description") or fallback["visual_description"]),
+        characters_present=list(fields.get("characters_present") or fallback["characters_present"]),
+        dialogue=list(fields.get("dialogue") or fallback["dialogue"]),
+        estimated_duration=float(fields.get("estimated_duration") or fallback["estimated_duration"]),
+    )
+
+async def _extract_scene(llm: LLMProvider, index: int, text: str) -> Scene:
+    if settings.SCRIPT_SCENE_PARSER == "heuristic":
+        return _build_scene(index, text, {})
+    try:
+        fields = await llm.generate_json(
+            "You are a Data Extraction Specialist.",
+            f"Given the screenplay scene below, extract its structured data.\n\nScene:\n{text}",
+            schema=SCENE_SCHEMA,
+        )
+    except Exception as e:
+        print(f"Scriptwriter Warning: Scene {index} extraction failed ({e}); parsing it from the script format", flush=True)
+        fields = {}
+    if not isinstance(fields, dict) or fields.get("errors"):
+        fields = {}
+    try:
+        return _build_scene(index, text, fields)
+    except Exception:
+        # The model returned fields of the wrong shape
+        return _build_scene(index, text, {})
+
+async def _parse_scenes(llm: LLMProvider, screenplay_text: str) -> List[Scene]:
+    """Extracts every scene from a finished screenplay in one structured call."""
     scene_parsing_prompt = f"""
     Given the screenplay below, extract a list of scenes with the following fields:
     - sequence_order
@@ -27,15 +158,15 @@ async def scriptwriter_node(state: EpisodeState) -> Dict[str, Any]:
     - characters_present (list of names)
     - dialogue (list of dicts with 'speaker' and 'text')
     - estimated_duration (float, in seconds)
-    
+
     Screenplay:
     {screenplay_text}
     """
-    
+
     schema = "JSON with key 'scenes': list of objects matching the Scene model structure."
-    
+
     scenes_data = await llm.generate_json("You are a Data Extraction Specialist.", scene_parsing_prompt, schema=schema)
-    
+
     # Convert to Pydantic models
     # Note: Validation might fail if LLM output is imperfect. MVP handles this loosely.
     scenes_list = []
@@ -43,13 +174,205 @@ async def scriptwriter_node(state: EpisodeState) -> Dict[str, Any]:
         # Ensure ID and sequence are set
         s['id'] = s.get('id', idx + 1)
         s['sequence_order'] = s.get('sequence_order', idx + 1)
-        s['script_content'] = s.get('script_content', "...") 
+        s['script_content'] = s.get('script_content', "...")
         s['estimated_duration'] = float(s.get('estimated_duration', 10.0)) # Default to 10s if missing
-        
+
         # Basic validation/cleaning could happen here
         scenes_list.append(Scene(**s))
-        
-    return {
+    return scenes_list
+
+def _fix_scene_draft(item: Any) -> Dict[str, Any]:
+    """Local repairs for common model slips, filling gaps from the scene's own beats."""
+    fixed = dict(item)
+    beats = fixed.get("beats")
+    if not isinstance(beats, list):
+        beats = []
+    # Bare strings are action lines; {"character": ..., "line": ...} and similar spellings are dialogue
+    fixed["beats"] = beats = [
+        {"speaker": "", "text": beat} if isinstance(beat, str) else
+        {"speaker": beat.get("speaker") or beat.get("character") or beat.get("name") or "",
+         "text": beat.get("text") or beat.get("line") or beat.get("action") or ""}
+        for beat in beats if isinstance(beat, (str, dict))
+    ]
+    speakers = list(dict.fromkeys(beat["speaker"] for beat in beats if beat["speaker"]))
+    actions = [beat["text"] for beat in beats if not beat["speaker"]]
+    fixed["heading"] = str(fixed.get("heading") or "")
+    if not fixed.get("visual_description"):
+        fixed["visual_description"] = " ".join([fixed["heading"]] + actions[:4]).strip()
+    if not isinstance(fixed.get("characters_present"), list):
+        fixed["characters_present"] = speakers
+    duration = fixed.get("estimated_duration")
+    if isinstance(duration, str):
+        match = re.search(r"\d+(?:\.\d+)?", duration)
+        duration = float(match.group(0)) if match else None
+    if not duration:
+        # Same pacing assumption as parse_scene_heuristically
+        words = sum(len(beat["text"].split()) for beat in beats if beat["speaker"])
+        duration = max(4.0, words / 2.5 + 2.0 * min(len(actions), 4))
+    fixed["estimated_duration"] = duration
+    return fixed
+
+def _scene_from_draft(index: int, draft: SceneDraft) -> Scene:
+    lines = [draft.heading]
+    for beat in draft.beats:
+        lines.append(f"{beat.speaker.upper()}\n{beat.text}" if beat.speaker else beat.text)
+    return Scene(
+        id=index,
+        sequence_order=index,
+        script_content="\n\n".join(lines),
+        visual_description=draft.visual_description,
+        characters_present=draft.characters_present or list(dict.fromkeys(b.speaker for b in draft.beats if b.speaker)),
+        dialogue=[{"speaker": beat.speaker, "text": beat.text} for beat in draft.beats if beat.speaker],
+        estimated_duration=draft.estimated_duration,
+    )
+
+async def write_structured_screenplay(llm: LLMProvider, story_analysis: Any):
+    """Screenplay and scenes in one schema-constrained call. Broken scenes are repaired one by one
+    instead of regenerating everything. Returns (screenplay, scenes, metrics, errors)."""
+    started_at = time.monotonic()
+    with token_usage.track() as usage:
+        raw = await llm.generate_structured(
+            "You are a professional Screenwriter.",
+            _screenplay_prompt(story_analysis) + "\n    Return the screenplay split into its scenes.\n",
+            ScreenplayDraft,
+        )
+        if not isinstance(raw, dict) or raw.get("errors"):
+            raise RuntimeError(f"Structured screenplay generation failed: {raw.get('errors') if isinstance(raw, dict) else raw}")
+        raw_scenes = raw.get("scenes") if isinstance(raw.get("scenes"), list) else []
+        drafts, counters, errors = await validate_items(llm, raw_scenes, SceneDraft, fix=_fix_scene_draft)
+
+    scenes = [_scene_from_draft(i, draft) for i, draft in enumerate([d for d in drafts if d is not None], start=1)]
+    screenplay = "\n\n".join(scene.script_content for scene in scenes)
+    if raw.get("title"):
+        screenplay = f"{raw['title']}\n\n{screenplay}"
+    metrics = {
+        "screenplay_seconds": time.monotonic() - started_at,
+        "scriptwriter_prompt_tokens": float(usage["prompt_tokens"]),
+        "scriptwriter_output_tokens": float(usage["output_tokens"]),
+        "scenes_repaired": float(counters["fixed_locally"] + counters["repaired"]),
+        "scenes_dropped": float(counters["dropped"]),
+    }
+    print(f"Scriptwriter: {len(scenes)} scenes in one structured call ({counters['fixed_locally']} fixed locally, "
+          f"{counters['repaired']} repaired, {counters['dropped']} dropped)", flush=True)
+    return screenplay, scenes, metrics, errors
+
+class ScreenplayStream:
+    """Streams the screenplay and yields each Scene as soon as its text is complete.
+
+    Scene extraction runs concurrently with the rest of the screenplay being written, so downstream
+    stages can storyboard scene 1 while later scenes are still being generated. After iteration,
+    `screenplay` holds the full text and `metrics` the timings.
+    """
+    def __init__(self, llm: LLMProvider, story_analysis: Any):
+        self.llm = llm
+        self.story_analysis = story_analysis
+        self.screenplay = ""
+        self.metrics: Dict[str, float] = {}
+
+    async def scenes(self) -> AsyncIterator[Scene]:
+        started_at = time.monotonic()
+        ready: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def extract(index: int, text: str):
+            await ready.put(await _extract_scene(self.llm, index, text))
+
+        async def write():
+            parser = SceneHeadingParser()
+            extractions: List[asyncio.Task] = []
+            try:
+                async for piece in self.llm.stream_text("You are a professional Screenwriter.", _screenplay_prompt(self.story_analysis)):
+                    self.screenplay += piece
+                    for text in parser.feed(piece):
+                        extractions.append(asyncio.create_task(extract(len(extractions) + 1, text)))
+                for text in parser.close():
+                    extractions.append(asyncio.create_task(extract(len(extractions) + 1, text)))
+                self.metrics["screenplay_seconds"] = time.monotonic() - started_at
+                if not parser.headings_seen and self.screenplay.strip():
+                    # No sluglines to split on; fall back to parsing the whole screenplay at once
+                    print("Scriptwriter: No scene headings found, extracting scenes from the full screenplay", flush=True)
+                    for scene in await _parse_scenes(self.llm, self.screenplay):
+                        await ready.put(scene)
+                await asyncio.gather(*extractions)
+            finally:
+                for task in extractions:
+                    task.cancel()
+                await ready.put(done)
+
+        writer = asyncio.create_task(write())
+        count = 0
+        try:
+            while (scene := await ready.get()) is not done:
+                if count == 0:
+                    self.metrics["time_to_first_scene_seconds"] = time.monotonic() - started_at
+                    print(f"Scriptwriter: First scene ready after {self.metrics['time_to_first_scene_seconds']:.1f}s", flush=True)
+                count += 1
+                yield scene
+            await writer # Surfaces a failed stream
+        finally:
+            if not writer.done():
+                writer.cancel()
+        print(f"Scriptwriter: {count} scenes streamed in {time.monotonic() - started_at:.1f}s", flush=True)
+
+async def scriptwriter_node(state: EpisodeState) -> Dict[str, Any]:
+    print("--- SCRIPTWRITER AGENT STARTED ---", flush=True)
+
+    llm = ProviderFactory.get_llm()
+    mode = scriptwriter_mode()
+    try:
+        return await _write_screenplay(llm, state, mode)
+    except RateLimitError as e:
+        print(f"Scriptwriter Error: LLM rate limited ({mode} mode): {e}", flush=True)
+        return {"errors": [f"Scriptwriter rate limited: {e}"]}
+
+async def _write_screenplay(llm: LLMProvider, state: EpisodeState, mode: str) -> Dict[str, Any]:
+    fallback_errors: List[str] = []
+    if mode == "structured":
+        try:
+            screenplay_text, scenes_list, metrics, errors = await write_structured_screenplay(llm, state.story_analysis)
+        except RateLimitError:
+            raise # The two-call path would only be throttled again
+        except Exception as e:
+            # A provider error or truncated JSON on a long screenplay; the plain-text path still works
+            print(f"Scriptwriter Warning: Structured screenplay failed ({e}); falling back to two calls", flush=True)
+            fallback_errors.append(f"Structured screenplay failed, used two-call fallback: {e}")
+            mode = "two_call"
+        else:
+            if scenes_list:
+                updates = {
+                    "screenplay": screenplay_text,
+                    "scenes": scenes_list,
+                    "quality_metrics": {**state.quality_metrics, **metrics},
+                }
+                if errors:
+                    updates["errors"] = errors
+                return updates
+            print("Scriptwriter Warning: Structured screenplay had no usable scenes; falling back to two calls", flush=True)
+            fallback_errors.extend(errors + ["Structured screenplay had no usable scenes, used two-call fallback"])
+            mode = "two_call"
+
+    started_at = time.monotonic()
+    with token_usage.track() as usage:
+        if mode == "streaming":
+            stream = ScreenplayStream(llm, state.story_analysis)
+            scenes_list = sorted([scene async for scene in stream.scenes()], key=lambda s: s.sequence_order)
+            screenplay_text, metrics = stream.screenplay, dict(stream.metrics)
+        else:
+            # "two_call": 1. Generate Screenplay
+            screenplay_text = await llm.generate_text("You are a professional Screenwriter.", _screenplay_prompt(state.story_analysis))
+
+            # 2. Parse Scenes structured data
+            # In a real app we'd chain this or use function calling
+            scenes_list = await _parse_scenes(llm, screenplay_text)
+            metrics = {"screenplay_seconds": time.monotonic() - started_at}
+
+    metrics["scriptwriter_prompt_tokens"] = float(usage["prompt_tokens"])
+    metrics["scriptwriter_output_tokens"] = float(usage["output_tokens"])
+    updates = {
         "screenplay": screenplay_text,
-        "scenes": scenes_list
+        "scenes": scenes_list,
+        "quality_metrics": {**state.quality_metrics, **metrics},
     }
+    if fallback_errors:
+        updates["errors"] = fallback_errors
+    return updates
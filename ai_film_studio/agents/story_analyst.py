@@ -3,6 +3,12 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from ai_film_studio.core.state import EpisodeState
 from ai_film_studio.providers.factory import ProviderFactory
 from ai_film_studio.core.memory import memory_store
+from ai_film_studio.config.settings import settings
+from ai_film_studio.agents.chunked_analysis import analyze_story_chunked, estimate_tokens
+
+def _use_chunked_analysis(text: str) -> bool:
+    mode = settings.STORY_ANALYSIS_MODE
+    return mode == "chunked" or (mode == "auto" and estimate_tokens(text) > settings.STORY_CHUNK_TOKENS)
 
 async def story_analyst_node(state: EpisodeState) -> Dict[str, Any]:
     print("--- STORY ANALYST AGENT STARTED ---", flush=True)
@@ -27,6 +33,7 @@ async def story_analyst_node(state: EpisodeState) -> Dict[str, Any]:
     """
     
     # 2b. (NEW) Retrieve Context (RAG)
+    context = ""
     try:
         # Search for similar past themes or summaries
         past_hits = await memory_store.search_assets(state.raw_story_input[:200], asset_type="episode_summary")
@@ -42,8 +49,13 @@ async def story_analyst_node(state: EpisodeState) -> Dict[str, Any]:
     schema_desc = "JSON with keys: plot_summary, characters (list), scenes (list)"
     
     # 4. Call Model
+    chunk_errors = []
     try:
-        analysis_result = await llm.generate_json(system_prompt, user_prompt, schema=schema_desc)
+        if _use_chunked_analysis(state.raw_story_input):
+            # Novel-length input: analyze chapters concurrently and merge into the same shape
+            analysis_result, chunk_errors = await analyze_story_chunked(llm, state.raw_story_input, context)
+        else:
+            analysis_result = await llm.generate_json(system_prompt, user_prompt, schema=schema_desc)
         
         # 5. Return updates to state
         # 6. (NEW) Store this analysis in memory
@@ -59,6 +71,8 @@ async def story_analyst_node(state: EpisodeState) -> Dict[str, Any]:
         except Exception as e:
             print(f"Memory Write Warning: {e}", flush=True)
 
+        if chunk_errors:
+            return {"story_analysis": analysis_result, "errors": chunk_errors}
         return {"story_analysis": analysis_result}
         
     except Exception as e:
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -16,20 +16,199 @@ class Settings(BaseSettings):
     FALLBACK_IMAGE_PROVIDER: str = "replicate-flux-schnell"
     VIDEO_PROVIDER: str = "replicate-hailuo"
     FALLBACK_VIDEO_PROVIDER: str = "replicate-wan"
+    AUDIO_PROVIDER: str = "elevenlabs"
+    EMBEDDING_PROVIDER: str = "vertex-embedding"
+    # Provider names resolve through providers/registry.py (built-ins plus "ai_film_studio.providers" entry points)
     
     # --- Infrastructure ---
-    # Memory uses embedded ChromaDB
+    REDIS_URL: Optional[str] = None # Jobs run in the API process when unset
+    POSTGRES_HOST: str = "localhost"
+    POSTGRES_PORT: int = 5432
+    POSTGRES_DB: str = "filmstudio"
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: Optional[str] = None
+    POSTGRES_DSN: Optional[str] = None # Overrides the POSTGRES_* parts above when set
+
+    # --- Memory ---
+    # "chroma": embedded ChromaDB under assets/db (single process only)
+    # "pgvector": the Postgres assets table, shared safely by the API and every worker
+    MEMORY_BACKEND: str = "chroma"
+    PGVECTOR_POOL_MIN_SIZE: int = 1
+    PGVECTOR_POOL_MAX_SIZE: int = 10
+    PGVECTOR_INDEX: str = "hnsw" # "hnsw" or "ivfflat"
+    PGVECTOR_HNSW_EF_SEARCH: int = 40 # Higher = better recall, slower queries
+    PGVECTOR_IVFFLAT_PROBES: int = 10
+
+    # --- Job Queue & Workers ---
+    JOB_QUEUE_NAME: str = "filmstudio"
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 300 # Workers renew the lease every third of this
+    JOB_MAX_ATTEMPTS: int = 3
+    WORKER_PROCESSES: int = 2
+    WORKER_CONCURRENCY: int = 1 # Jobs in flight per worker process
+
+    # --- Workflow ---
+    # Run independent stages (TTS, character design) alongside storyboarding/animation
+    CONCURRENT_WORKFLOW_BRANCHES: bool = True
+    # "staged": director/animator/audio_engineer/editor each wait for every scene
+    # "streaming": each scene flows through storyboard -> animate -> TTS -> mux on its own
+    PIPELINE_MODE: str = "staged"
+    SCENE_PIPELINE_QUEUE_SIZE: int = 4 # Bound between stages
+    SCENE_PIPELINE_STAGE_WORKERS: int = 4
+    EDITOR_MUX_CONCURRENCY: int = 0 # Parallel ffmpeg muxes; 0 = one per CPU
+    # "structured": screenplay + scenes in one schema-constrained call
+    # "streaming": stream the screenplay and extract each scene once the next slugline starts; in
+    #   "streaming" pipeline mode storyboarding begins while later scenes are still being written
+    # "two_call": free-text screenplay, then one scene-extraction call
+    # "auto": streaming in the streaming pipeline, structured otherwise
+    SCRIPTWRITER_MODE: str = "auto"
+    SCRIPT_SCENE_PARSER: str = "llm" # "llm": one small JSON call per scene; "heuristic": read the screenplay format
+
+    # --- Story Analysis ---
+    # "single": whole story in one prompt; "chunked": map-reduce over chapters; "auto": chunked above STORY_CHUNK_TOKENS
+    STORY_ANALYSIS_MODE: str = "auto"
+    STORY_CHUNK_TOKENS: int = 12000 # Max (estimated) tokens per chunk; chunks never span chapters
+    STORY_ANALYSIS_CONCURRENCY: int = 8 # Chunk analyses / summary merges in flight
+    STORY_MERGE_FANOUT: int = 8 # Summaries combined per merge call
+
+    # --- Ken Burns Fallback ---
+    # Used when video generation fails and a storyboard still has to become a clip
+    KEN_BURNS_RENDERER: str = "ffmpeg" # "ffmpeg" (scale/crop chain), "numpy" (frames piped to ffmpeg), "zoompan" (legacy)
+    KEN_BURNS_RESOLUTION: str = "1280x720"
+    KEN_BURNS_FPS: int = 25
+    KEN_BURNS_ZOOM_START: float = 1.0
+    KEN_BURNS_ZOOM_END: float = 1.3
+    KEN_BURNS_EASING: str = "ease_in_out" # linear, ease_in, ease_out, ease_in_out
+    KEN_BURNS_PAN: str = "center" # center, left, right, up, down
+    KEN_BURNS_PRESET: str = "veryfast" # x264 preset
+
+    # --- Checkpointing ---
+    # Every node's output is persisted so failed jobs resume from the last completed node
+    ENABLE_CHECKPOINTING: bool = True
+    CHECKPOINT_DB_PATH: str = "assets/db/checkpoints.sqlite"
+
+    # --- Progress Events ---
+    # Node and per-scene events behind /ws/status; Redis Streams when REDIS_URL is set, in-memory otherwise
+    ENABLE_PROGRESS_EVENTS: bool = True
+    EVENT_HISTORY_LIMIT: int = 1000 # Events kept per job for replay on reconnect
+    EVENT_TTL_SECONDS: float = 24 * 3600
+    EVENT_SUBSCRIBER_BUFFER: int = 256 # A WebSocket client further behind is dropped and must reconnect
+
+    # --- Observability ---
+    # Prometheus metrics on the API's /metrics; workers push theirs through Redis every interval
+    METRICS_PUSH_INTERVAL_SECONDS: float = 15.0
+    ENABLE_TRACING: bool = True # Nested spans per job in <workspace>/trace.jsonl
+
+    # --- Job Workspaces ---
+    # Every job renders into WORKSPACE_ROOT/<project_id>; the caches below are shared across jobs
+    WORKSPACE_ROOT: str = "assets/jobs"
+    WORKSPACE_KEEP_TEMP: bool = False # Keep muxed scenes / concat lists after a successful job
+    WORKSPACE_RETENTION_HOURS: float = 72.0 # Whole workspaces untouched this long are pruned; 0 = never
+
+    # --- Caching ---
+    # Generated images/clips/audio are stored content-addressed so identical requests are never paid twice
+    ENABLE_ARTIFACT_CACHE: bool = True
+    ARTIFACT_CACHE_DIR: str = "assets/cache"
+
+    # --- Embeddings ---
+    # Concurrent embedding requests are merged into batches; vectors are cached by text hash
+    EMBEDDING_BATCH_SIZE: int = 100 # Max texts per provider request
+    EMBEDDING_BATCH_WINDOW_MS: float = 10.0 # How long a request waits for others to join its batch
+    ENABLE_EMBEDDING_CACHE: bool = True
+    EMBEDDING_CACHE_PATH: str = "assets/cache/embeddings.sqlite"
+
+    # --- LLM Cache ---
+    # Repeated prompts (retries, re-renders of the same story) are answered from an LRU + SQLite cache
+    ENABLE_LLM_CACHE: bool = True
+    LLM_CACHE_PATH: str = "assets/cache/llm.sqlite"
+    LLM_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    LLM_CACHE_MEMORY_ENTRIES: int = 256
+    LLM_CACHE_MAX_DISK_ENTRIES: int = 5000
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.2 # Text calls sampled hotter than this are never cached (JSON calls always are)
+
+    # --- Downloads ---
+    MAX_CONCURRENT_DOWNLOADS: int = 8
+    DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    DOWNLOAD_TIMEOUT_SECONDS: float = 300.0
+    DOWNLOAD_MAX_ATTEMPTS: int = 3
+
+    # --- Provider Executors ---
+    # Thread pool size per provider for blocking SDK calls (keyed by provider name)
+    PROVIDER_EXECUTOR_WORKERS: Dict[str, int] = {
+        "replicate": 16,
+        "imagen": 4,
+        "elevenlabs": 8,
+        "google-tts": 8,
+    }
+    DEFAULT_EXECUTOR_WORKERS: int = 8
     
     # --- Operational & Risk Protocols ---
-    MAX_PARALLEL_JOBS: int = 5
+    MAX_PARALLEL_JOBS: int = 5 # Default concurrency cap per provider/model lane
     SPEED_MODE: bool = False
     
     # Strictly Enforced Defaults
     ENABLE_CRITIC_LOOPS: bool = True
     ENFORCE_CONSISTENCY_CHECKS: bool = True
-    STRICT_BUDGET_LIMIT: float = 150.00
+    STRICT_BUDGET_LIMIT: float = 150.00 # USD per UTC day across all jobs; 0 = unlimited
     AUTO_RETRY_ON_RATE_LIMIT: bool = True
 
+    # --- Budgets ---
+    # Every billable provider call is priced and charged to its job and the day (see core/cost_ledger.py);
+    # the director and animator only fan out over as many scenes as both budgets still cover
+    JOB_BUDGET_LIMIT: float = 25.00 # USD per job, across retries and resumes; 0 = unlimited
+    COST_LEDGER_RETENTION_DAYS: int = 7
+    # USD per unit, keyed "provider" or "provider:model" like the scheduling tables below.
+    # Units: image (per image), video (per clip), kchars (per 1000 characters),
+    # input_mtokens / output_mtokens (per million tokens). Unpriced calls cost nothing.
+    PROVIDER_PRICES: Dict[str, Dict[str, float]] = {
+        "replicate": {"image": 0.05, "video": 0.50}, # Unlisted Replicate models
+        "replicate:flux-pro": {"image": 0.055},
+        "replicate:flux-schnell": {"image": 0.003},
+        "replicate:black-forest-labs/flux-2-pro": {"image": 0.055},
+        "replicate:hailuo": {"video": 0.27},
+        "replicate:minimax/hailuo-02": {"video": 0.27},
+        "replicate:wan": {"video": 0.10},
+        "imagen": {"image": 0.04},
+        "veo": {"video": 3.00},
+        "elevenlabs": {"kchars": 0.30},
+        "google-tts": {"kchars": 0.016},
+        "gemini:gemini-2.5-pro": {"input_mtokens": 1.25, "output_mtokens": 10.00},
+        "gemini:gemini-2.5-flash": {"input_mtokens": 0.30, "output_mtokens": 2.50},
+        "vertex-embedding": {"kchars": 0.000025},
+    }
+
+    # --- Provider Pool ---
+    # Provider clients are built once per (provider, model) and reused by every node and job
+    ENABLE_PROVIDER_POOL: bool = True
+    PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS: float = 300.0 # 0 disables the background check
+    PROVIDER_HEALTH_CHECK_TIMEOUT_SECONDS: float = 10.0
+    PROVIDER_RETIRE_GRACE_SECONDS: float = 900.0 # Evicted clients stay open this long for calls still using them
+
+    # --- Provider Scheduling ---
+    # Keys are either "provider" or "provider:model"; the more specific key wins.
+    PROVIDER_RATE_LIMITS: Dict[str, float] = { # Requests per second
+        "replicate": 5.0,
+        "gemini": 2.0,
+        "elevenlabs": 3.0,
+        "vertex-embedding": 10.0,
+    }
+    PROVIDER_BURST: Dict[str, int] = {}
+    PROVIDER_CONCURRENCY: Dict[str, int] = {} # Falls back to MAX_PARALLEL_JOBS
+    RATE_LIMIT_MAX_RETRIES: int = 5
+    RATE_LIMIT_BACKOFF_BASE_SECONDS: float = 1.0
+    RATE_LIMIT_BACKOFF_MAX_SECONDS: float = 60.0
+
+    # --- Provider Chains ---
+    # Image/video calls go to IMAGE_PROVIDER / VIDEO_PROVIDER first and move on to the FALLBACK_*
+    # provider when the primary fails, returns a placeholder or misses its deadline. A primary still
+    # running at its HEDGE_QUANTILE latency gets a parallel request on the fallback; the first success wins.
+    ENABLE_PROVIDER_CHAINS: bool = True
+    IMAGE_CALL_DEADLINE_SECONDS: float = 120.0 # Per call, including scheduler queueing
+    VIDEO_CALL_DEADLINE_SECONDS: float = 600.0
+    PROVIDER_DEADLINES: Dict[str, float] = {} # Overrides the above, keyed "provider" or "provider:model"
+    HEDGE_QUANTILE: float = 0.95 # 0 disables hedging
+    HEDGE_MIN_SAMPLES: int = 20 # Successful calls observed before a provider is hedged
+    HEDGE_LATENCY_WINDOW: int = 200 # Most recent latencies the quantile is taken over
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
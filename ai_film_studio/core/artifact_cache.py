@@ -0,0 +1,135 @@
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from ai_film_studio.config.settings import settings
+
+_scopes: contextvars.ContextVar[Tuple[Dict[str, int], ...]] = contextvars.ContextVar("artifact_cache_scopes", default=())
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a local file's content."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def _normalize(value: Any) -> Any:
+    """Makes a request parameter hashable in a stable way.
+    Local files are replaced by a digest of their content so a re-rendered reference image invalidates the key."""
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, str) and not value.startswith("http") and os.path.isfile(value):
+        return {"file_sha256": file_digest(value)}
+    return value
+
+class ArtifactCache:
+    """Content-addressed store for generated media.
+
+    Keys are SHA-256 digests of (provider, model, request parameters), so they are stable across
+    processes unlike the builtin hash(). A small SQLite index maps keys to files on disk.
+    """
+    def __init__(self, root: Optional[str] = None, enabled: Optional[bool] = None):
+        self.root = root or settings.ARTIFACT_CACHE_DIR
+        self.enabled = settings.ENABLE_ARTIFACT_CACHE if enabled is None else enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened lazily so importing a provider does not touch the filesystem
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS artifacts (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    path TEXT,
+                    created_at REAL,
+                    last_hit_at REAL,
+                    hits INTEGER DEFAULT 0
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def make_key(self, provider: str, model: str, **params: Any) -> str:
+        payload = json.dumps(
+            {"provider": provider, "model": model, "params": _normalize(params)},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, kind: str, key: str, ext: str) -> str:
+        """Deterministic output location for an artifact, e.g. assets/cache/images/ab/abcd....webp"""
+        directory = os.path.join(self.root, kind, key[:2])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{key}.{ext}")
+
+    def _count(self, provider: str, field: str):
+        counters = self._stats.setdefault(provider, {"hits": 0, "misses": 0})
+        counters[field] += 1
+        for scope in _scopes.get():
+            scope[field] += 1
+
+    @contextmanager
+    def track(self) -> Iterator[Dict[str, int]]:
+        """Counts the hits and misses of lookups made inside the block, e.g. to tell whether a
+        provider call was served from the cache (and so cost nothing)."""
+        counters = {"hits": 0, "misses": 0}
+        token = _scopes.set(_scopes.get() + (counters,))
+        try:
+            yield counters
+        finally:
+            _scopes.reset(token)
+
+    def lookup(self, provider: str, key: str) -> Optional[str]:
+        """Returns the cached file path for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT path FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row and os.path.exists(row[0]) and os.path.getsize(row[0]) > 0:
+                db.execute(
+                    "UPDATE artifacts SET hits = hits + 1, last_hit_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                db.commit()
+                self._count(provider, "hits")
+                return row[0]
+            if row:
+                # Index entry points at a file that was deleted; drop it
+                db.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                db.commit()
+            self._count(provider, "misses")
+            return None
+
+    def store(self, provider: str, key: str, path: str):
+        """Records a freshly generated artifact. Placeholders must never be stored."""
+        if not self.enabled or not os.path.exists(path):
+            return
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO artifacts (key, provider, path, created_at, last_hit_at, hits) VALUES (?, ?, ?, ?, NULL, 0)",
+                (key, provider, path, time.time()),
+            )
+            db.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per provider for this process."""
+        return {provider: dict(counters) for provider, counters in self._stats.items()}
+
+artifact_cache = ArtifactCache()
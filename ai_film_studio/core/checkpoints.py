@@ -0,0 +1,37 @@
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from ai_film_studio.config.settings import settings
+
+# Pydantic models stored inside EpisodeState checkpoints
+_STATE_TYPES = [
+    ("ai_film_studio.core.state", "Scene"),
+    ("ai_film_studio.core.state", "CharacterProfile"),
+    ("ai_film_studio.core.state", "EpisodeState"),
+]
+
+def thread_config(job_id: str) -> Dict[str, Any]:
+    """LangGraph config addressing a job's checkpoint thread."""
+    return {"configurable": {"thread_id": job_id}}
+
+@asynccontextmanager
+async def checkpointer() -> AsyncIterator[AsyncSqliteSaver]:
+    """SQLite checkpointer persisting every node's output for EpisodeState runs."""
+    os.makedirs(os.path.dirname(settings.CHECKPOINT_DB_PATH) or ".", exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(settings.CHECKPOINT_DB_PATH) as saver:
+        if hasattr(saver, "with_allowlist"):
+            saver = saver.with_allowlist(_STATE_TYPES)
+        yield saver
+
+async def get_checkpoint_status(graph, job_id: str) -> Optional[Dict[str, Any]]:
+    """Where a job stands according to its last checkpoint, or None if it never ran."""
+    snapshot = await graph.aget_state(thread_config(job_id))
+    if not snapshot or not snapshot.values:
+        return None
+    return {
+        "next_nodes": list(snapshot.next),
+        "completed": not snapshot.next,
+        "checkpoint_id": snapshot.config["configurable"].get("checkpoint_id"),
+        "updated_at": snapshot.created_at,
+    }
@@ -0,0 +1,350 @@
+from abc import ABC, abstractmethod
+import contextvars
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.events import current_job
+from ai_film_studio.core.metrics import PROVIDER_COST
+
+UNLIMITED = 1e18 # Stands in for a limit of 0 (no limit), also inside the Lua script
+
+def price_of(provider: str, model: str, **units: float) -> float:
+    """USD for the given quantities, e.g. price_of("replicate", "hailuo", video=1), priced from
+    PROVIDER_PRICES ("provider:model" wins over "provider"). Unpriced units cost nothing."""
+    prices = settings.PROVIDER_PRICES.get(f"{provider}:{model}", settings.PROVIDER_PRICES.get(provider, {}))
+    return sum(prices.get(unit, 0.0) * quantity for unit, quantity in units.items())
+
+def price_of_call(provider: Any, **units: float) -> float:
+    """price_of() for a provider instance built by ProviderFactory (which carries its name and model)."""
+    return price_of(getattr(provider, "provider_name", ""), getattr(provider, "model_name", "default"), **units)
+
+def _today() -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+def _limit(value: float) -> float:
+    return value if value > 0 else UNLIMITED
+
+class Reservation:
+    """Budget set aside for `admitted` of `requested` units of work. Charges made inside the
+    reserving block draw it down; whatever is left is released when the block exits."""
+    def __init__(self, job_id: str, day: str, unit_cost: float, requested: int, admitted: int):
+        self.job_id = job_id
+        self.day = day
+        self.unit_cost = unit_cost
+        self.requested = requested
+        self.admitted = admitted
+        self.remaining = unit_cost * admitted
+
+    @property
+    def throttled(self) -> int:
+        return self.requested - self.admitted
+
+_current_reservation: contextvars.ContextVar[Optional[Reservation]] = contextvars.ContextVar("cost_reservation", default=None)
+
+class CostLedger(ABC):
+    """Spend per job and per UTC day, charged as provider calls complete.
+
+    Before an expensive fan-out a node reserves the estimated cost of each unit of work (one
+    storyboard, one clip); the ledger admits as many units as both the job's budget
+    (JOB_BUDGET_LIMIT or the job's own limit) and the day's budget (STRICT_BUDGET_LIMIT) still
+    cover, counting what other in-flight jobs have reserved but not yet spent.
+    """
+    @asynccontextmanager
+    async def reserve(self, job_id: str, unit_cost: float, count: int) -> AsyncIterator[Reservation]:
+        """Reserves up to `count` units of `unit_cost` for the block; see Reservation.admitted."""
+        day = _today()
+        admitted = await self._reserve(job_id, day, unit_cost, count) if count else 0
+        reservation = Reservation(job_id, day, unit_cost, count, admitted)
+        token = _current_reservation.set(reservation)
+        try:
+            yield reservation
+        finally:
+            _current_reservation.reset(token)
+            if reservation.remaining > 0:
+                try:
+                    await self._apply(job_id, day, 0.0, reservation.remaining, None)
+                except Exception as e:
+                    print(f"Cost Ledger Error: Could not release ${reservation.remaining:.4f} for job {job_id}: {e}", flush=True)
+                reservation.remaining = 0.0
+
+    async def charge(self, provider: str, model: str, amount: float, job_id: Optional[str] = None):
+        """Records `amount` USD against the job (the current one by default) and the day.
+        Never raises: a ledger outage must not fail the call that was already paid for."""
+        if amount <= 0:
+            return
+        reservation = _current_reservation.get()
+        job_id = job_id or current_job() or (reservation.job_id if reservation else None)
+        PROVIDER_COST.inc(amount, provider=provider, model=model)
+        covered, day = 0.0, _today()
+        if reservation is not None and reservation.job_id == job_id:
+            covered = min(amount, reservation.remaining)
+            reservation.remaining -= covered
+            day = reservation.day # Released from the day it was reserved on
+        try:
+            await self._apply(job_id, day, amount, covered, f"{provider}:{model}")
+        except Exception as e:
+            print(f"Cost Ledger Error: Could not charge ${amount:.4f} for {provider}:{model}: {e}", flush=True)
+
+    @abstractmethod
+    async def open_job(self, job_id: str, limit: Optional[float] = None):
+        """Marks the job in flight. The limit is only set the first time, so retries and resumes
+        share one budget; reservations left behind by a crashed attempt are released."""
+        pass
+
+    @abstractmethod
+    async def close_job(self, job_id: str):
+        pass
+
+    @abstractmethod
+    async def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """{"job_id", "spent", "reserved", "limit", "remaining", "active", "by_model"}, or None."""
+        pass
+
+    @abstractmethod
+    async def active_jobs(self) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def day(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """{"day", "spent", "reserved", "limit", "remaining"} for a UTC day (today by default)."""
+        pass
+
+    @abstractmethod
+    async def _reserve(self, job_id: str, day: str, unit_cost: float, count: int) -> int:
+        pass
+
+    @abstractmethod
+    async def _apply(self, job_id: Optional[str], day: str, spent: float, released: float, key: Optional[str]):
+        """Adds `spent` to the job and day totals and takes `released` off their reservations."""
+        pass
+
+    async def close(self):
+        pass
+
+    @staticmethod
+    def _summary(record: Dict[str, Any], limit: float) -> Dict[str, Any]:
+        spent, reserved = record.get("spent", 0.0), max(0.0, record.get("reserved", 0.0))
+        return {"spent": round(spent, 6), "reserved": round(reserved, 6), "limit": limit if limit < UNLIMITED else None,
+                "remaining": round(max(0.0, limit - spent - reserved), 6) if limit < UNLIMITED else None}
+
+class InMemoryCostLedger(CostLedger):
+    """Single-process ledger, used when jobs run inside the API process (no REDIS_URL)."""
+    def __init__(self):
+        self._days: Dict[str, Dict[str, float]] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active: Set[str] = set()
+
+    def _day(self, day: str) -> Dict[str, float]:
+        return self._days.setdefault(day, {"spent": 0.0, "reserved": 0.0})
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        return self._jobs.setdefault(job_id, {"spent": 0.0, "reserved": 0.0, "limit": settings.JOB_BUDGET_LIMIT,
+                                              "by_model": {}, "updated_at": time.time()})
+
+    async def _reserve(self, job_id: str, day: str, unit_cost: float, count: int) -> int:
+        totals, record = self._day(day), self._job(job_id)
+        if unit_cost <= 0:
+            return count
+        room = min(_limit(settings.STRICT_BUDGET_LIMIT) - totals["spent"] - totals["reserved"],
+                   _limit(record["limit"]) - record["spent"] - record["reserved"])
+        admitted = max(0, min(count, int(room / unit_cost + 1e-9)))
+        totals["reserved"] += admitted * unit_cost
+        record["reserved"] += admitted * unit_cost
+        record["day"] = day
+        return admitted
+
+    async def _apply(self, job_id: Optional[str], day: str, spent: float, released: float, key: Optional[str]):
+        totals = self._day(day)
+        totals["spent"] += spent
+        totals["reserved"] -= released
+        if job_id is not None:
+            record = self._job(job_id)
+            record["spent"] += spent
+            record["reserved"] -= released
+            record["updated_at"] = time.time()
+            if key:
+                record["by_model"][key] = record["by_model"].get(key, 0.0) + spent
+
+    async def open_job(self, job_id: str, limit: Optional[float] = None):
+        self._expire()
+        record = self._job(job_id)
+        if limit is not None and "opened_at" not in record:
+            record["limit"] = limit
+        record.setdefault("opened_at", time.time())
+        if record["reserved"] > 0:
+            self._day(record.get("day", _today()))["reserved"] -= record["reserved"]
+            record["reserved"] = 0.0
+        self._active.add(job_id)
+
+    async def close_job(self, job_id: str):
+        self._active.discard(job_id)
+        if job_id in self._jobs:
+            self._jobs[job_id]["updated_at"] = time.time()
+
+    async def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = self._jobs.get(job_id)
+        if record is None:
+            return None
+        return {"job_id": job_id, **self._summary(record, _limit(record["limit"])), "active": job_id in self._active,
+                "by_model": {key: round(value, 6) for key, value in record["by_model"].items()}}
+
+    async def active_jobs(self) -> List[Dict[str, Any]]:
+        return [await self.job(job_id) for job_id in sorted(self._active)]
+
+    async def day(self, day: Optional[str] = None) -> Dict[str, Any]:
+        day = day or _today()
+        return {"day": day, **self._summary(self._days.get(day, {}), _limit(settings.STRICT_BUDGET_LIMIT))}
+
+    def _expire(self):
+        retention = settings.COST_LEDGER_RETENTION_DAYS * 86400
+        cutoff_day = time.strftime("%Y-%m-%d", time.gmtime(time.time() - retention))
+        for day in [day for day in self._days if day < cutoff_day]:
+            del self._days[day]
+        for job_id in [job_id for job_id, record in self._jobs.items()
+                       if job_id not in self._active and record["updated_at"] < time.time() - retention]:
+            del self._jobs[job_id]
+
+# Admit as many units as the day and the job still have room for, and reserve them, in one step,
+# so concurrent jobs on different workers can never both take the last of the day's budget.
+_RESERVE_SCRIPT = """
+local function num(key, field) return tonumber(redis.call('HGET', key, field) or '0') end
+local unit_cost = tonumber(ARGV[1])
+local admitted = tonumber(ARGV[2])
+if unit_cost > 0 then
+    local day_room = tonumber(ARGV[3]) - num(KEYS[1], 'spent') - num(KEYS[1], 'reserved')
+    local job_limit = tonumber(redis.call('HGET', KEYS[2], 'limit') or ARGV[4])
+    local job_room = job_limit - num(KEYS[2], 'spent') - num(KEYS[2], 'reserved')
+    admitted = math.max(0, math.min(admitted, math.floor(math.min(day_room, job_room) / unit_cost + 1e-9)))
+    if admitted > 0 then
+        redis.call('HINCRBYFLOAT', KEYS[1], 'reserved', admitted * unit_cost)
+        redis.call('HINCRBYFLOAT', KEYS[2], 'reserved', admitted * unit_cost)
+        redis.call('HSET', KEYS[2], 'day', ARGV[6])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return admitted
+"""
+
+class RedisCostLedger(CostLedger):
+    """Ledger shared by the API and every worker.
+
+    Layout, under the `JOB_QUEUE_NAME` prefix:
+      <prefix>:costs:day:<YYYY-MM-DD>   HASH spent, reserved
+      <prefix>:costs:job:<id>           HASH spent, reserved, limit, day, opened_at, updated_at, cost:<provider:model>
+      <prefix>:costs:active             SET of in-flight job ids
+    Everything expires COST_LEDGER_RETENTION_DAYS after it was last written.
+    """
+    def __init__(self, redis_client, prefix: Optional[str] = None):
+        self.redis = redis_client
+        self.prefix = f"{prefix or settings.JOB_QUEUE_NAME}:costs"
+        self.active_key = f"{self.prefix}:active"
+
+    def _day_key(self, day: str) -> str:
+        return f"{self.prefix}:day:{day}"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    @property
+    def _ttl(self) -> int:
+        return settings.COST_LEDGER_RETENTION_DAYS * 86400
+
+    @staticmethod
+    def _decode(raw: Dict[Any, Any]) -> Dict[str, str]:
+        return {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v) for k, v in raw.items()}
+
+    async def _reserve(self, job_id: str, day: str, unit_cost: float, count: int) -> int:
+        return int(await self.redis.eval(
+            _RESERVE_SCRIPT, 2, self._day_key(day), self._job_key(job_id),
+            unit_cost, count, _limit(settings.STRICT_BUDGET_LIMIT), _limit(settings.JOB_BUDGET_LIMIT), self._ttl, day,
+        ))
+
+    async def _apply(self, job_id: Optional[str], day: str, spent: float, released: float, key: Optional[str]):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hincrbyfloat(self._day_key(day), "spent", spent)
+            pipe.hincrbyfloat(self._day_key(day), "reserved", -released)
+            pipe.expire(self._day_key(day), self._ttl)
+            if job_id is not None:
+                pipe.hincrbyfloat(self._job_key(job_id), "spent", spent)
+                pipe.hincrbyfloat(self._job_key(job_id), "reserved", -released)
+                if key:
+                    pipe.hincrbyfloat(self._job_key(job_id), f"cost:{key}", spent)
+                pipe.hset(self._job_key(job_id), "updated_at", time.time())
+                pipe.expire(self._job_key(job_id), self._ttl)
+            await pipe.execute()
+
+    async def open_job(self, job_id: str, limit: Optional[float] = None):
+        key = self._job_key(job_id)
+        record = self._decode(await self.redis.hgetall(key))
+        stale = float(record.get("reserved", 0))
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(key, "limit", _limit(settings.JOB_BUDGET_LIMIT if limit is None else limit))
+            pipe.hsetnx(key, "opened_at", time.time())
+            pipe.hset(key, "updated_at", time.time())
+            if stale > 0:
+                # The previous attempt died while holding a reservation
+                pipe.hincrbyfloat(self._day_key(record.get("day", _today())), "reserved", -stale)
+                pipe.hset(key, "reserved", 0)
+            pipe.expire(key, self._ttl)
+            pipe.sadd(self.active_key, job_id)
+            await pipe.execute()
+
+    async def close_job(self, job_id: str):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.srem(self.active_key, job_id)
+            pipe.hset(self._job_key(job_id), "updated_at", time.time())
+            pipe.expire(self._job_key(job_id), self._ttl)
+            await pipe.execute()
+
+    async def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._job_key(job_id))
+            pipe.sismember(self.active_key, job_id)
+            raw, active = await pipe.execute()
+        if not raw:
+            return None
+        fields = self._decode(raw)
+        record = {"spent": float(fields.get("spent", 0)), "reserved": float(fields.get("reserved", 0))}
+        by_model = {k[len("cost:"):]: round(float(v), 6) for k, v in fields.items() if k.startswith("cost:")}
+        limit = _limit(float(fields.get("limit", settings.JOB_BUDGET_LIMIT)))
+        return {"job_id": job_id, **self._summary(record, limit), "active": bool(active), "by_model": by_model}
+
+    async def active_jobs(self) -> List[Dict[str, Any]]:
+        jobs = []
+        for job_id in sorted(m.decode() if isinstance(m, bytes) else m for m in await self.redis.smembers(self.active_key)):
+            job = await self.job(job_id)
+            if job is None:
+                await self.redis.srem(self.active_key, job_id) # Expired under a crashed worker
+                continue
+            jobs.append(job)
+        return jobs
+
+    async def day(self, day: Optional[str] = None) -> Dict[str, Any]:
+        day = day or _today()
+        fields = self._decode(await self.redis.hgetall(self._day_key(day)))
+        record = {"spent": float(fields.get("spent", 0)), "reserved": float(fields.get("reserved", 0))}
+        return {"day": day, **self._summary(record, _limit(settings.STRICT_BUDGET_LIMIT))}
+
+    async def close(self):
+        await self.redis.aclose()
+
+_cost_ledger: Optional[CostLedger] = None
+
+def get_cost_ledger() -> CostLedger:
+    """Process-wide ledger: on Redis when REDIS_URL is configured, otherwise in-memory."""
+    global _cost_ledger
+    if _cost_ledger is None:
+        if settings.REDIS_URL:
+            import redis.asyncio as redis
+            _cost_ledger = RedisCostLedger(redis.from_url(settings.REDIS_URL))
+        else:
+            _cost_ledger = InMemoryCostLedger()
+    return _cost_ledger
+
+async def charge(provider: str, model: str, **units: float):
+    """Prices a completed provider call (see price_of) and charges it to the current job."""
+    amount = price_of(provider, model, **units)
+    if amount > 0:
+        await get_cost_ledger().charge(provider, model, amount)
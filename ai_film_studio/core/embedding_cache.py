@@ -0,0 +1,87 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional
+from ai_film_studio.config.settings import settings
+
+def text_digest(model: str, text: str) -> str:
+    """Stable key for an embedding: the same text embedded by another model is a different vector."""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """Persistent text-hash -> vector cache, so character names and summaries are embedded once.
+
+    Vectors are stored as packed float32 blobs in a single SQLite file.
+    """
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None):
+        self.path = path or settings.EMBEDDING_CACHE_PATH
+        self.enabled = settings.ENABLE_EMBEDDING_CACHE if enabled is None else enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module does not touch the filesystem
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    dim INTEGER,
+                    vector BLOB,
+                    created_at REAL
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """Returns the cached vectors for whichever of `texts` are known."""
+        texts = list(dict.fromkeys(texts))
+        if not self.enabled or not texts:
+            return {}
+        keys = {text_digest(model, t): t for t in texts}
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            db = self._db()
+            key_list = list(keys)
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                rows = db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[keys[key]] = array("f", blob).tolist()
+        self._stats["hits"] += len(found)
+        self._stats["misses"] += len(texts) - len(found)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        if not self.enabled or not vectors:
+            return
+        now = time.time()
+        rows = [
+            (text_digest(model, text), model, len(vector), array("f", vector).tobytes(), now)
+            for text, vector in vectors.items()
+        ]
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters (per text) for this process."""
+        return dict(self._stats)
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,265 @@
+from abc import ABC, abstractmethod
+import asyncio
+import contextvars
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from ai_film_studio.config.settings import settings
+
+# Job whose progress events the current task (and every task it spawns) reports
+_current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("event_job_id", default=None)
+
+TERMINAL_EVENTS = ("job_finished",)
+
+@contextmanager
+def job_events(job_id: str) -> Iterator[None]:
+    """Progress events emitted inside this block (nodes, scene sub-steps) are published for `job_id`."""
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+def current_job() -> Optional[str]:
+    """Job of the current context (see job_events()), or None outside a job."""
+    return _current_job.get()
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    """A job's stream ends when it finishes, or fails with no retry left."""
+    return event["type"] in TERMINAL_EVENTS or (event["type"] == "job_failed" and event.get("final", True))
+
+def _id_key(event_id: Optional[str]) -> Tuple[int, int]:
+    # In-memory ids are "7", Redis stream ids "1718000000000-0"; both order correctly as tuples
+    if not event_id:
+        return (-1, -1)
+    first, _, second = str(event_id).partition("-")
+    try:
+        return (int(first), int(second or 0)) if second else (0, int(first))
+    except ValueError:
+        return (-1, -1)
+
+class _Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+class EventBus(ABC):
+    """Structured, timestamped progress events per job, fanned out to any number of subscribers.
+
+    Each event is a flat dict: {"id", "job_id", "type", "ts", ...fields}. Ids increase per job, so
+    a reconnecting client passes the last id it saw and gets everything after it replayed before
+    live events resume. Subscribers share one local fan-out per job; a subscriber that falls more
+    than EVENT_SUBSCRIBER_BUFFER events behind is dropped and simply reconnects to catch up.
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Set[_Subscription]] = {}
+        self._ready: Dict[str, asyncio.Event] = {}
+
+    async def publish(self, job_id: str, type: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        event = {"job_id": job_id, "type": type, "ts": time.time(), **fields}
+        try:
+            event["id"] = await self._append(job_id, event)
+        except Exception as e:
+            # Progress reporting must never fail the job it reports on
+            print(f"Event Bus Error: Could not publish {type} for job {job_id}: {e}", flush=True)
+            return None
+        return event
+
+    @abstractmethod
+    async def history(self, job_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retained events of the job after `after` (all when None), oldest first."""
+        pass
+
+    @abstractmethod
+    async def _append(self, job_id: str, event: Dict[str, Any]) -> str:
+        """Stores the event and returns its id. The backend must also get it to _fan_out in every
+        process with subscribers (directly in memory, through a stream reader on Redis)."""
+        pass
+
+    def _fan_out(self, job_id: str, event: Dict[str, Any]):
+        for sub in list(self._subscribers.get(job_id, ())):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                sub.lagged = True
+
+    async def _watch(self, job_id: str):
+        """Called when a job gets its first local subscriber."""
+
+    def _unwatch(self, job_id: str):
+        """Called when a job's last local subscriber leaves."""
+
+    async def subscribe(self, job_id: str, after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every event after `after` (all retained events when None), then live events,
+        until the job's terminal event."""
+        sub = _Subscription(settings.EVENT_SUBSCRIBER_BUFFER)
+        # Register (and wait until the job is being watched) before reading history, so nothing
+        # published in between is missed; duplicates are skipped by id below
+        subs = self._subscribers.setdefault(job_id, set())
+        subs.add(sub)
+        try:
+            while True:
+                ready = self._ready.get(job_id)
+                if ready is None:
+                    ready = self._ready[job_id] = asyncio.Event()
+                    try:
+                        await self._watch(job_id)
+                    except BaseException:
+                        # Not watched after all: a waiting subscriber takes over the watch
+                        self._ready.pop(job_id, None)
+                        raise
+                    finally:
+                        ready.set()
+                    break
+                await ready.wait()
+                if self._ready.get(job_id) is ready:
+                    break
+            last = _id_key(after)
+            events = await self.history(job_id, after)
+            # A resumed job starts again after its earlier terminal event; only the latest run counts
+            restarted = max((i for i, event in enumerate(events) if event["type"] == "job_started"), default=-1)
+            for i, event in enumerate(events):
+                last = _id_key(event["id"])
+                yield event
+                if is_terminal(event) and i > restarted:
+                    return
+            while not sub.lagged:
+                event = await sub.queue.get()
+                if _id_key(event["id"]) <= last:
+                    continue # Already replayed from history
+                last = _id_key(event["id"])
+                yield event
+                if is_terminal(event):
+                    return
+            print(f"Event Bus: Subscriber of job {job_id} fell behind and was dropped", flush=True)
+        finally:
+            subs = self._subscribers.get(job_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[job_id]
+                    self._ready.pop(job_id, None)
+                    self._unwatch(job_id)
+
+    async def close(self):
+        pass
+
+class InMemoryEventBus(EventBus):
+    """Single-process bus, used when jobs run inside the API process (no REDIS_URL)."""
+    def __init__(self, history_limit: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        super().__init__()
+        self.history_limit = history_limit or settings.EVENT_HISTORY_LIMIT
+        self.ttl_seconds = ttl_seconds or settings.EVENT_TTL_SECONDS
+        self._events: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._seq: Dict[str, int] = {}
+        self._touched: Dict[str, float] = {}
+
+    async def _append(self, job_id: str, event: Dict[str, Any]) -> str:
+        self._expire()
+        self._seq[job_id] = self._seq.get(job_id, 0) + 1
+        event_id = str(self._seq[job_id])
+        event["id"] = event_id
+        self._events.setdefault(job_id, deque(maxlen=self.history_limit)).append(event)
+        self._touched[job_id] = time.time()
+        self._fan_out(job_id, event)
+        return event_id
+
+    async def history(self, job_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        after_key = _id_key(after)
+        return [event for event in self._events.get(job_id, ()) if _id_key(event["id"]) > after_key]
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        for job_id in [job_id for job_id, touched in self._touched.items() if touched < cutoff]:
+            self._events.pop(job_id, None)
+            self._seq.pop(job_id, None)
+            self._touched.pop(job_id, None)
+
+class RedisEventBus(EventBus):
+    """Bus on Redis Streams, shared by the API and every worker.
+
+    Each job is a stream `<JOB_QUEUE_NAME>:events:<job_id>` capped at EVENT_HISTORY_LIMIT entries
+    and expiring EVENT_TTL_SECONDS after its last event. Workers XADD; in the API one blocking
+    XREAD per watched job feeds all of that job's WebSocket clients, so clients never poll Redis.
+    """
+    def __init__(self, redis_client, prefix: Optional[str] = None):
+        super().__init__()
+        self.redis = redis_client
+        self.prefix = f"{prefix or settings.JOB_QUEUE_NAME}:events:"
+        self._readers: Dict[str, asyncio.Task] = {}
+
+    def _key(self, job_id: str) -> str:
+        return self.prefix + job_id
+
+    async def _append(self, job_id: str, event: Dict[str, Any]) -> str:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(self._key(job_id), {"event": json.dumps(event, default=str)},
+                      maxlen=settings.EVENT_HISTORY_LIMIT, approximate=True)
+            pipe.expire(self._key(job_id), int(settings.EVENT_TTL_SECONDS))
+            event_id, _ = await pipe.execute()
+        return event_id.decode() if isinstance(event_id, bytes) else event_id
+
+    @staticmethod
+    def _decode(entry_id, fields) -> Dict[str, Any]:
+        raw = fields.get(b"event", fields.get("event"))
+        event = json.loads(raw)
+        event["id"] = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        return event
+
+    async def history(self, job_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        after_key = _id_key(after)
+        entries = await self.redis.xrange(self._key(job_id), min=after or "-", max="+")
+        events = [self._decode(entry_id, fields) for entry_id, fields in entries]
+        return [event for event in events if _id_key(event["id"]) > after_key]
+
+    async def _watch(self, job_id: str):
+        # Start at the current tail; subscribers replay anything older from history()
+        latest = await self.redis.xrevrange(self._key(job_id), count=1)
+        self._readers[job_id] = asyncio.create_task(self._read(job_id, latest[0][0] if latest else "0-0"))
+
+    def _unwatch(self, job_id: str):
+        reader = self._readers.pop(job_id, None)
+        if reader:
+            reader.cancel()
+
+    async def _read(self, job_id: str, last_id):
+        while True:
+            try:
+                response = await self.redis.xread({self._key(job_id): last_id}, block=5000)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Event Bus Error: Reading events of job {job_id} failed: {e}", flush=True)
+                await asyncio.sleep(1.0)
+                continue
+            for _, entries in response or ():
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    self._fan_out(job_id, self._decode(entry_id, fields))
+
+    async def close(self):
+        for job_id in list(self._readers):
+            self._unwatch(job_id)
+        await self.redis.aclose()
+
+_event_bus: Optional[EventBus] = None
+
+def get_event_bus() -> EventBus:
+    """Process-wide bus: Redis Streams when REDIS_URL is configured, otherwise in-memory."""
+    global _event_bus
+    if _event_bus is None:
+        if settings.REDIS_URL:
+            import redis.asyncio as redis
+            _event_bus = RedisEventBus(redis.from_url(settings.REDIS_URL))
+        else:
+            _event_bus = InMemoryEventBus()
+    return _event_bus
+
+async def emit(type: str, job_id: Optional[str] = None, **fields: Any):
+    """Publishes a progress event for `job_id`, or for the job of the current context (see
+    job_events()); a no-op outside a job."""
+    job_id = job_id or current_job()
+    if job_id is not None and settings.ENABLE_PROGRESS_EVENTS:
+        await get_event_bus().publish(job_id, type, **fields)
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel
 
 class LLMProvider(ABC):
     """Abstract interface for Large Language Models."""
@@ -11,6 +13,17 @@ class LLMProvider(ABC):
     async def generate_json(self, system_prompt: str, user_prompt: str, schema: Any) -> dict:
         pass
 
+    async def generate_structured(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Dict:
+        """JSON constrained to `response_model`'s schema. Returns the decoded object *unvalidated*, so
+        callers can keep the valid parts of a partially broken response. Providers with native
+        structured output should override this; the default describes the schema in the prompt."""
+        return await self.generate_json(system_prompt, user_prompt, schema=json.dumps(response_model.model_json_schema()))
+
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Yields the response in pieces as it is generated. Providers without a streaming endpoint
+        yield the whole text at once."""
+        yield await self.generate_text(system_prompt, user_prompt, temperature)
+
 class ImageGenerationProvider(ABC):
     """Abstract interface for Image Generation."""
     @abstractmethod
@@ -37,3 +50,30 @@ class EmbeddingProvider(ABC):
     @abstractmethod
     async def get_embedding(self, text: str) -> List[float]:
         pass
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embeds several texts. Providers with a native batch endpoint should override this."""
+        return [await self.get_embedding(text) for text in texts]
+
+class MemoryBackend(ABC):
+    """Abstract interface for the vector store behind MemoryStore."""
+    @abstractmethod
+    async def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Inserts or replaces assets. Metadata always contains "name" and "asset_type"."""
+        pass
+
+    @abstractmethod
+    async def query(self, embeddings: List[List[float]], asset_type: str, limit: int,
+                    filters: Optional[Dict[str, Any]] = None) -> List[List[Dict]]:
+        """Nearest assets per query embedding as {"metadata", "distance"} dicts (squared L2, lower is better).
+        `filters` are exact matches on metadata fields."""
+        pass
+
+    @abstractmethod
+    async def compact(self, asset_key: Callable[[str, str, str], str]) -> Dict[str, int]:
+        """Re-keys every stored asset with asset_key(name, asset_type, document) and drops duplicates.
+        Returns counts of scanned, kept and removed assets."""
+        pass
+
+    async def close(self):
+        pass
@@ -0,0 +1,189 @@
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+from ai_film_studio.config.settings import settings
+
+# Claim the oldest pending job and lease it in one step, so two workers can never take the same job.
+_CLAIM_SCRIPT = """
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then
+    return false
+end
+redis.call('ZADD', KEYS[2], ARGV[1], job_id)
+redis.call('HSET', KEYS[3] .. job_id, 'status', 'running', 'worker', ARGV[2], 'updated_at', ARGV[3])
+redis.call('HINCRBY', KEYS[3] .. job_id, 'attempts', 1)
+return job_id
+"""
+
+# Return every job whose lease expired (worker crashed or hung) to the head of the pending list,
+# unless it has used up its attempts: a job that kills its worker would otherwise be retried forever.
+# Returns the number requeued followed by the ids of the jobs marked dead.
+_REQUEUE_EXPIRED_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+local result = {0}
+for _, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], job_id)
+    local attempts = tonumber(redis.call('HGET', KEYS[3] .. job_id, 'attempts') or '0')
+    if attempts >= tonumber(ARGV[3]) then
+        redis.call('HSET', KEYS[3] .. job_id, 'status', 'dead', 'updated_at', ARGV[2],
+                   'error', 'Lease expired on attempt ' .. attempts .. ' (worker crashed or hung)')
+        table.insert(result, job_id)
+    else
+        redis.call('RPUSH', KEYS[1], job_id)
+        redis.call('HSET', KEYS[3] .. job_id, 'status', 'queued', 'updated_at', ARGV[2])
+        result[1] = result[1] + 1
+    end
+end
+return result
+"""
+
+# Settle a job only while the caller still holds its lease: a worker whose lease expired must not
+# overwrite the outcome of (or requeue) the run that reclaimed the job. KEYS: processing, job hash.
+_ACK_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'worker') ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return false
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], 'status', 'succeeded', 'result', ARGV[3], 'updated_at', ARGV[4])
+return 1
+"""
+
+# Same ownership check; then requeue while attempts remain, otherwise mark dead. Returns the new status.
+_FAIL_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'worker') ~= ARGV[2] or not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return false
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+local attempts = tonumber(redis.call('HGET', KEYS[2], 'attempts') or '0')
+local status = 'dead'
+if attempts < tonumber(ARGV[5]) then
+    status = 'queued'
+    redis.call('LPUSH', KEYS[3], ARGV[1])
+end
+redis.call('HSET', KEYS[2], 'status', status, 'error', ARGV[3], 'updated_at', ARGV[4])
+return status
+"""
+
+class JobQueue:
+    """Durable job queue on Redis with leases (visibility timeouts) and explicit acks.
+
+    Layout, under the `JOB_QUEUE_NAME` prefix:
+      <prefix>:pending      LIST of job ids (LPUSH to enqueue, claimed from the tail)
+      <prefix>:processing   ZSET job id -> lease deadline (unix seconds)
+      <prefix>:job:<id>     HASH with status, payload, attempts, result, error
+
+    Any redis.asyncio-compatible client works, including fakeredis.aioredis.FakeRedis for tests.
+    """
+    def __init__(self, redis_client, prefix: Optional[str] = None, visibility_timeout: Optional[int] = None):
+        self.redis = redis_client
+        self.prefix = prefix or settings.JOB_QUEUE_NAME
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        self.pending_key = f"{self.prefix}:pending"
+        self.processing_key = f"{self.prefix}:processing"
+        self.job_key_prefix = f"{self.prefix}:job:"
+
+    def _job_key(self, job_id: str) -> str:
+        return self.job_key_prefix + job_id
+
+    async def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "status": "queued",
+                "payload": json.dumps(payload),
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            })
+            pipe.lpush(self.pending_key, job_id)
+            await pipe.execute()
+        return job_id
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Leases the next job, or returns None if the queue is empty."""
+        now = time.time()
+        job_id = await self.redis.eval(
+            _CLAIM_SCRIPT, 3,
+            self.pending_key, self.processing_key, self.job_key_prefix,
+            now + self.visibility_timeout, worker_id, now,
+        )
+        if not job_id:
+            return None
+        job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
+        job = await self.get_job(job_id)
+        if job is None:
+            # Hash was deleted underneath us; drop the orphaned lease
+            await self.redis.zrem(self.processing_key, job_id)
+            return None
+        return job
+
+    async def extend_lease(self, job_id: str) -> bool:
+        """Heartbeat for long jobs. Returns False if the lease was lost (job was requeued)."""
+        updated = await self.redis.zadd(
+            self.processing_key, {job_id: time.time() + self.visibility_timeout}, xx=True, ch=True
+        )
+        return bool(updated)
+
+    async def ack(self, job_id: str, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Marks the job succeeded. Returns False (and changes nothing) if worker_id no longer holds its lease."""
+        acked = await self.redis.eval(
+            _ACK_SCRIPT, 2,
+            self.processing_key, self._job_key(job_id),
+            job_id, worker_id, json.dumps(result or {}), time.time(),
+        )
+        return bool(acked)
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """Releases a failed job: requeued while attempts remain, otherwise marked dead. Returns the
+        new status ("queued" or "dead"), or None (changing nothing) if worker_id no longer holds its lease."""
+        status = await self.redis.eval(
+            _FAIL_SCRIPT, 3,
+            self.processing_key, self._job_key(job_id), self.pending_key,
+            job_id, worker_id, error, time.time(), settings.JOB_MAX_ATTEMPTS,
+        )
+        if not status:
+            return None
+        return status.decode() if isinstance(status, bytes) else status
+
+    async def requeue_expired(self) -> Dict[str, Any]:
+        """Releases expired leases: {"requeued": count, "dead": [ids of jobs out of attempts]}."""
+        now = time.time()
+        requeued, *dead = await self.redis.eval(
+            _REQUEUE_EXPIRED_SCRIPT, 3,
+            self.pending_key, self.processing_key, self.job_key_prefix,
+            now, now, settings.JOB_MAX_ATTEMPTS,
+        )
+        return {"requeued": int(requeued), "dead": [d.decode() if isinstance(d, bytes) else d for d in dead]}
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.hgetall(self._job_key(job_id))
+        if not raw:
+            return None
+        job = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in raw.items()
+        }
+        job["job_id"] = job_id
+        job["attempts"] = int(job.get("attempts", 0))
+        for field in ("payload", "result"):
+            if field in job:
+                job[field] = json.loads(job[field])
+        return job
+
+    async def depth(self) -> Dict[str, int]:
+        return {
+            "pending": int(await self.redis.llen(self.pending_key)),
+            "processing": int(await self.redis.zcard(self.processing_key)),
+        }
+
+_job_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> Optional[JobQueue]:
+    """Process-wide queue built from REDIS_URL, or None when no Redis is configured."""
+    global _job_queue
+    if _job_queue is None and settings.REDIS_URL:
+        import redis.asyncio as redis
+        _job_queue = JobQueue(redis.from_url(settings.REDIS_URL))
+    return _job_queue
@@ -0,0 +1,142 @@
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from ai_film_studio.config.settings import settings
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+@contextmanager
+def bypass_llm_cache():
+    """LLM calls made inside this block (including tasks spawned from it) skip the cache
+    and always hit the model. Fresh responses are still stored."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+class LLMCache:
+    """Two-tier response cache for LLM calls: an in-process LRU in front of a SQLite file.
+
+    Keys are SHA-256 digests of (model, kind, system prompt, user prompt, temperature, schema).
+    Entries expire after LLM_CACHE_TTL_SECONDS; each tier evicts its least recently used
+    entries once it holds more than its configured number of responses.
+    """
+    def __init__(self, path: Optional[str] = None, enabled: Optional[bool] = None):
+        self.path = path or settings.LLM_CACHE_PATH
+        self.enabled = settings.ENABLE_LLM_CACHE if enabled is None else enabled
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module does not touch the filesystem
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT,
+                    created_at REAL,
+                    last_hit_at REAL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_hit ON llm_responses (last_hit_at)")
+            conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - settings.LLM_CACHE_TTL_SECONDS,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def make_key(self, model: str, kind: str, system_prompt: str, user_prompt: str,
+                 temperature: float, schema: Any = None) -> str:
+        payload = json.dumps(
+            {"model": model, "kind": kind, "system": system_prompt, "user": user_prompt,
+             "temperature": temperature, "schema": schema},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, created_at: float, value: Any):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > settings.LLM_CACHE_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached response (str or dict) for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        expires_before = now - settings.LLM_CACHE_TTL_SECONDS
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] >= expires_before:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                # Callers may mutate the dicts they get back; hand out a copy
+                return json.loads(json.dumps(entry[1]))
+            self._memory.pop(key, None)
+
+            db = self._db()
+            row = db.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row and row[1] >= expires_before:
+                db.execute("UPDATE llm_responses SET last_hit_at = ? WHERE key = ?", (now, key))
+                db.commit()
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self._stats["disk_hits"] += 1
+                return json.loads(row[0])
+            if row:
+                db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                db.commit()
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, model: str, value: Any):
+        if not self.enabled:
+            return
+        now = time.time()
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, now, json.loads(serialized))
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, last_hit_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, serialized, now, now),
+            )
+            overflow = db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - settings.LLM_CACHE_MAX_DISK_ENTRIES
+            if overflow > 0:
+                db.execute(
+                    "DELETE FROM llm_responses WHERE key IN (SELECT key FROM llm_responses ORDER BY last_hit_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._stats["evictions"] += overflow
+            db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db().execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for this process."""
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory)}
+
+llm_cache = LLMCache()
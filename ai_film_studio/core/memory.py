@@ -1,95 +1,247 @@
+import argparse
+import asyncio
+import hashlib
 import json
 import os
-from typing import List, Dict
-import chromadb
-from ai_film_studio.providers.factory import ProviderFactory
+import threading
+from typing import Any, Callable, List, Dict, Optional
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import EmbeddingProvider, MemoryBackend
+
+def asset_id(name: str, asset_type: str, context_text: str) -> str:
+    """Stable id for an asset. Unlike the builtin hash() it is the same in every process,
+    so storing the same asset again updates it instead of adding a copy."""
+    return hashlib.sha256(f"{asset_type}\x00{name}\x00{context_text}".encode("utf-8")).hexdigest()
+
+class ChromaMemoryBackend(MemoryBackend):
+    """Embedded ChromaDB on a local directory. Fine for one process; use pgvector for workers.
+
+    Chroma's client is synchronous, so every call runs in a worker thread instead of on the event loop.
+    """
+    def __init__(self, path: str = "assets/db"):
+        import chromadb
 
-class MemoryStore:
-    def __init__(self):
         # Initialize chroma DB client (embedded)
-        os.makedirs("assets/db", exist_ok=True)
-        self.client = chromadb.PersistentClient(path="assets/db")
-        self.embedding_provider = ProviderFactory.get_embedding()
-        
+        os.makedirs(path, exist_ok=True)
+        self.client = chromadb.PersistentClient(path=path)
+
         # Get or create the main collection
         self.collection = self.client.get_or_create_collection(
             name="film_studio_assets"
         )
 
+    @staticmethod
+    def _to_chroma_metadata(metadata: Dict) -> Dict:
+        # Convert any complex objects in metadata to strings since Chroma expects strings/ints/floats
+        safe_metadata = {}
+        for k, v in metadata.items():
+            if isinstance(v, (dict, list)):
+                safe_metadata[k] = json.dumps(v)
+            else:
+                safe_metadata[k] = v
+        return safe_metadata
+
+    @staticmethod
+    def _parse_metadata(doc_metadata: Dict) -> Dict:
+        # Convert stringified lists/dicts back to objects in metadata
+        parsed_metadata = {}
+        for k, v in doc_metadata.items():
+            if isinstance(v, str) and (v.startswith('{') or v.startswith('[')):
+                try:
+                    parsed_metadata[k] = json.loads(v)
+                except:
+                    parsed_metadata[k] = v
+            else:
+                parsed_metadata[k] = v
+        return parsed_metadata
+
+    async def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        await asyncio.to_thread(
+            self.collection.upsert,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=[self._to_chroma_metadata(m) for m in metadatas],
+            ids=ids
+        )
+
+    async def query(self, embeddings: List[List[float]], asset_type: str, limit: int,
+                    filters: Optional[Dict[str, Any]] = None) -> List[List[Dict]]:
+        conditions = [{"asset_type": asset_type}] # Filter by asset type
+        conditions += [{k: v} for k, v in self._to_chroma_metadata(filters or {}).items()]
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=embeddings,
+            n_results=limit,
+            where=conditions[0] if len(conditions) == 1 else {"$and": conditions}
+        )
+
+        all_hits = []
+        # results returned by Chroma are lists of lists, one inner list per query
+        for q in range(len(embeddings)):
+            hits = []
+            ids = results["ids"][q] if results["ids"] and len(results["ids"]) > q else []
+            for i in range(len(ids)):
+                # Distances are returned by query, lower is better
+                distance = results["distances"][q][i] if results["distances"] else 0.0
+                hits.append({"metadata": self._parse_metadata(results["metadatas"][q][i]), "distance": distance})
+            all_hits.append(hits)
+        return all_hits
+
+    def _compact(self, asset_key: Callable[[str, str, str], str], page_size: int = 1000) -> Dict[str, int]:
+        # Read everything first: deleting while paging with offsets would skip records
+        records = {}
+        scanned, offset = 0, 0
+        while True:
+            page = self.collection.get(include=["embeddings", "documents", "metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            for i, old_id in enumerate(page["ids"]):
+                metadata = page["metadatas"][i] or {}
+                document = page["documents"][i] or ""
+                new_id = asset_key(metadata.get("name", ""), metadata.get("asset_type", ""), document)
+                # Later records win, matching what an upsert of the same asset would leave behind
+                records.setdefault(new_id, []).append((old_id, page["embeddings"][i], document, metadata))
+            scanned += len(page["ids"])
+            offset += page_size
+
+        removed = 0
+        for new_id, versions in records.items():
+            if len(versions) == 1 and versions[0][0] == new_id:
+                continue
+            _, embedding, document, metadata = versions[-1]
+            stale = [old_id for old_id, *_ in versions if old_id != new_id]
+            self.collection.delete(ids=stale)
+            self.collection.upsert(ids=[new_id], embeddings=[embedding], documents=[document], metadatas=[metadata])
+            removed += len(versions) - 1
+        return {"scanned": scanned, "kept": len(records), "removed": removed}
+
+    async def compact(self, asset_key: Callable[[str, str, str], str]) -> Dict[str, int]:
+        return await asyncio.to_thread(self._compact, asset_key)
+
+def create_backend(name: Optional[str] = None) -> MemoryBackend:
+    name = name or settings.MEMORY_BACKEND
+    if name == "chroma":
+        return ChromaMemoryBackend()
+    if name == "pgvector":
+        # Imported here so asyncpg is only required when the backend is selected
+        from ai_film_studio.core.pgvector_memory import PgVectorMemoryBackend
+        return PgVectorMemoryBackend()
+    raise ValueError(f"Unknown Memory Backend: {name}")
+
+class MemoryStore:
+    """Semantic asset memory. Nothing is opened until the first add or search,
+    so importing an agent does not touch the database or create an embedding client."""
+    def __init__(self, backend: Optional[MemoryBackend] = None, embedding_provider: Optional[EmbeddingProvider] = None):
+        self._backend = backend
+        self._embedding_provider = embedding_provider
+        self._init_lock = threading.Lock()
+
+    def _load_backend(self) -> MemoryBackend:
+        with self._init_lock:
+            if self._backend is None:
+                self._backend = create_backend()
+            return self._backend
+
+    async def get_backend(self) -> MemoryBackend:
+        if self._backend is None:
+            # Opening Chroma reads its files from disk; keep that off the event loop too
+            await asyncio.to_thread(self._load_backend)
+        return self._backend
+
+    @property
+    def embedding_provider(self) -> EmbeddingProvider:
+        if self._embedding_provider is None:
+            from ai_film_studio.providers.factory import ProviderFactory
+            self._embedding_provider = ProviderFactory.get_embedding()
+        return self._embedding_provider
+
+    @embedding_provider.setter
+    def embedding_provider(self, provider: EmbeddingProvider):
+        self._embedding_provider = provider
+
     async def add_asset(self, name: str, asset_type: str, metadata: Dict, context_text: str):
-        """Stores an asset with its embedding."""
+        """Stores an asset with its embedding. Storing the same asset again updates it in place."""
+        await self.add_assets([{"name": name, "asset_type": asset_type, "metadata": metadata, "context_text": context_text}])
+
+    async def add_assets(self, assets: List[Dict]):
+        """Stores several assets with one batched embedding request and one backend write.
+        Each item has the add_asset keys: name, asset_type, metadata, context_text."""
+        # Duplicates inside one write are rejected, so keep the first of each id.
+        unique = {}
+        for a in assets:
+            unique.setdefault(asset_id(a["name"], a["asset_type"], a["context_text"]), a)
+        if not unique:
+            return
+        ids, assets = list(unique.keys()), list(unique.values())
         try:
-            # We get the embedding manually to keep the embedding provider pattern
-            embedding = await self.embedding_provider.get_embedding(context_text)
-            
-            # ChromaDB requires string IDs. We'll use a hash or composite of name and type.
-            # Convert any complex objects in metadata to strings since Chroma expects strings/ints/floats
-            safe_metadata = {}
-            for k, v in metadata.items():
-                if isinstance(v, (dict, list)):
-                    safe_metadata[k] = json.dumps(v)
-                else:
-                    safe_metadata[k] = v
-                    
-            safe_metadata["asset_type"] = asset_type
-            safe_metadata["name"] = name
-            
-            # Generate ID
-            asset_id = str(hash(name + asset_type + context_text))
-            
-            # Add to chromadb
-            self.collection.add(
-                embeddings=[embedding],
-                documents=[context_text],
-                metadatas=[safe_metadata],
-                ids=[asset_id]
+            # We get the embeddings manually to keep the embedding provider pattern
+            embeddings = await self.embedding_provider.get_embeddings([a["context_text"] for a in assets])
+
+            backend = await self.get_backend()
+            await backend.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                documents=[a["context_text"] for a in assets],
+                metadatas=[{**a["metadata"], "asset_type": a["asset_type"], "name": a["name"]} for a in assets]
             )
-            print(f"Memory: Added asset {name} ({asset_type})")
+            for a in assets:
+                print(f"Memory: Stored asset {a['name']} ({a['asset_type']})")
         except Exception as e:
             print(f"Memory Add Error: {e}")
 
-    async def search_assets(self, query: str, asset_type: str = "character", limit: int = 1) -> List[Dict]:
-        """Searches for assets semantically using ChromaDB."""
+    async def search_assets(self, query: str, asset_type: str = "character", limit: int = 1,
+                            filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """Searches for assets semantically."""
+        return (await self.search_assets_bulk([query], asset_type=asset_type, limit=limit, filters=filters))[0]
+
+    async def search_assets_bulk(self, queries: List[str], asset_type: str = "character", limit: int = 1,
+                                 filters: Optional[Dict[str, Any]] = None) -> List[List[Dict]]:
+        """Runs several semantic searches with one batched embedding request and one backend query.
+        `filters` are exact matches on metadata fields (e.g. {"project_id": ...}).
+        Returns one hit list per query, in order."""
+        if not queries:
+            return []
         try:
-            embedding = await self.embedding_provider.get_embedding(query)
-            
-            # Search chromadb
-            results = self.collection.query(
-                query_embeddings=[embedding],
-                n_results=limit,
-                where={"asset_type": asset_type} # Filter by asset type
-            )
-            
-            hits = []
-            if results["ids"] and len(results["ids"]) > 0:
-                # results returned by Chroma are lists of lists
-                for i in range(len(results["ids"][0])):
-                    doc_metadata = results["metadatas"][0][i]
-                    
-                    # Convert stringified lists/dicts back to objects in metadata
-                    parsed_metadata = {}
-                    for k, v in doc_metadata.items():
-                        if isinstance(v, str) and (v.startswith('{') or v.startswith('[')):
-                            try:
-                                parsed_metadata[k] = json.loads(v)
-                            except:
-                                parsed_metadata[k] = v
-                        else:
-                            parsed_metadata[k] = v
-
-                    # Distances are returned by query, lower is better
-                    distance = results["distances"][0][i] if results["distances"] else 0.0
-                    
-                    hits.append({
-                        "name": doc_metadata.get("name", "Unknown"),
-                        "type": doc_metadata.get("asset_type", asset_type),
-                        "metadata": parsed_metadata,
-                        "distance": distance
-                    })
-                    
-            return hits
+            embeddings = await self.embedding_provider.get_embeddings(queries)
+            backend = await self.get_backend()
+            results = await backend.query(embeddings, asset_type, limit, filters)
+            return [
+                [
+                    {
+                        "name": hit["metadata"].get("name", "Unknown"),
+                        "type": hit["metadata"].get("asset_type", asset_type),
+                        "metadata": hit["metadata"],
+                        "distance": hit["distance"]
+                    }
+                    for hit in hits
+                ]
+                for hits in results
+            ]
         except Exception as e:
             print(f"Memory Search Error: {e}")
-            return []
+            return [[] for _ in queries]
+
+    async def compact(self) -> Dict[str, int]:
+        """Rewrites stored assets under their stable ids, dropping the duplicates that
+        process-randomized ids used to create."""
+        backend = await self.get_backend()
+        return await backend.compact(asset_id)
+
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
 
 memory_store = MemoryStore()
+
+async def _compact_command():
+    stats = await memory_store.compact()
+    print(f"Memory: Compacted {settings.MEMORY_BACKEND} store: scanned {stats['scanned']}, "
+          f"kept {stats['kept']}, removed {stats['removed']} duplicates", flush=True)
+    await memory_store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asset memory maintenance")
+    parser.add_argument("command", choices=["compact"])
+    args = parser.parse_args()
+    if args.command == "compact":
+        asyncio.run(_compact_command())
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ai_film_studio.config.settings import settings
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def series(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labelnames, key)), **self._snapshot(value)} for key, value in self._series.items()]
+
+    def _snapshot(self, value: Any) -> Dict[str, Any]:
+        return {"value": value}
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = float(value)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observes the wall time of the block, including when it raises."""
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started_at, **labels)
+
+    def _snapshot(self, value: Any) -> Dict[str, Any]:
+        return {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text format.
+
+    Worker processes push their snapshot to Redis (see push_loop); the API's /metrics merges those
+    in with a `process` label, so one scrape covers the whole deployment.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collect: Callable[[], None]):
+        """collect() runs before every snapshot, e.g. to set gauges from live state."""
+        self._collectors.append(collect)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception as e:
+                print(f"Metrics Collector Error: {e}", flush=True)
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            snapshot[name] = {"type": metric.type, "help": metric.help, "series": metric.series()}
+            if isinstance(metric, Histogram):
+                snapshot[name]["bucket_bounds"] = list(metric.buckets)
+        return snapshot
+
+    def render(self, remote: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None) -> str:
+        """Text exposition of this process plus `remote` snapshots keyed by process id."""
+        sources = [({}, self.snapshot())] + [({"process": pid}, snap) for pid, snap in (remote or {}).items()]
+        families: Dict[str, Dict[str, Any]] = {}
+        for extra, snap in sources:
+            for name, family in snap.items():
+                merged = families.setdefault(name, {**family, "series": []})
+                merged["series"].extend({**s, "labels": {**s["labels"], **extra}} for s in family["series"])
+
+        lines = []
+        for name, family in families.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for s in family["series"]:
+                labels = s["labels"]
+                if family["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(s['value'])}")
+                    continue
+                for bound, count in zip(family["bucket_bounds"], s["buckets"]):
+                    lines.append(f"{name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}")
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {s['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(s['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+NODE_DURATION = registry.register(Histogram(
+    "filmstudio_node_duration_seconds", "Wall time of each workflow node", ("node",)))
+JOBS = registry.register(Counter(
+    "filmstudio_jobs_total", "Episode jobs by outcome (succeeded, no_video, failed)", ("status",)))
+JOB_QUEUE_DEPTH = registry.register(Gauge(
+    "filmstudio_job_queue_depth", "Jobs waiting or being processed", ("state",)))
+PROVIDER_LATENCY = registry.register(Histogram(
+    "filmstudio_provider_call_seconds", "Provider call latency, excluding queueing", ("provider", "model")))
+PROVIDER_QUEUE_WAIT = registry.register(Histogram(
+    "filmstudio_provider_queue_wait_seconds", "Time spent waiting for a rate-limit token and concurrency slot", ("provider", "model")))
+PROVIDER_RETRIES = registry.register(Counter(
+    "filmstudio_provider_retries_total", "Calls retried after a rate-limit error", ("provider", "model")))
+PROVIDER_IN_FLIGHT = registry.register(Gauge(
+    "filmstudio_provider_in_flight", "Provider calls currently running", ("provider", "model")))
+PROVIDER_WAITING = registry.register(Gauge(
+    "filmstudio_provider_waiting", "Provider calls queued for admission", ("provider", "model")))
+PROVIDER_CHAIN_REQUESTS = registry.register(Counter(
+    "filmstudio_provider_chain_requests_total", "Chained image/video calls by the member that served them and how it was reached "
+    "(primary, hedge, fallback; failed when none succeeded)", ("kind", "served_by", "path")))
+PROVIDER_COST = registry.register(Counter(
+    "filmstudio_provider_cost_usd_total", "Spend charged to the cost ledger, priced from PROVIDER_PRICES", ("provider", "model")))
+DOWNLOAD_BYTES = registry.register(Counter(
+    "filmstudio_download_bytes_total", "Bytes of generated media downloaded from providers"))
+DOWNLOAD_DURATION = registry.register(Histogram(
+    "filmstudio_download_seconds", "Wall time per completed download"))
+FFMPEG_DURATION = registry.register(Histogram(
+    "filmstudio_ffmpeg_seconds", "Wall time of ffmpeg runs", ("operation",)))
+
+def _metrics_key(process_id: str = "") -> str:
+    return f"{settings.JOB_QUEUE_NAME}:metrics:{process_id}"
+
+async def push_loop(redis_client, process_id: str, interval: Optional[float] = None):
+    """Publishes this process's snapshot to Redis every `interval` seconds until cancelled.
+    Snapshots expire after three missed pushes, so dead workers drop out of /metrics."""
+    interval = interval or settings.METRICS_PUSH_INTERVAL_SECONDS
+    while True:
+        try:
+            await redis_client.set(_metrics_key(process_id), json.dumps(registry.snapshot()), ex=max(1, int(interval * 3)))
+        except Exception as e:
+            print(f"Metrics: Push failed: {e}", flush=True)
+        await asyncio.sleep(interval)
+
+async def collect_remote(redis_client) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Latest snapshot of every process that pushed recently, keyed by process id."""
+    prefix = _metrics_key()
+    keys = [key async for key in redis_client.scan_iter(match=prefix + "*")]
+    if not keys:
+        return {}
+    remote = {}
+    for key, raw in zip(keys, await redis_client.mget(keys)):
+        if raw:
+            key = key.decode() if isinstance(key, bytes) else key
+            remote[key[len(prefix):]] = json.loads(raw)
+    return remote
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional
+import asyncpg
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import MemoryBackend
+
+EMBEDDING_DIM = 768
+
+# Idempotent, so databases created before these columns existed are migrated on first use.
+# (init.sql only runs when the Postgres volume is first created.)
+_SCHEMA = f"""
+CREATE EXTENSION IF NOT EXISTS vector;
+CREATE TABLE IF NOT EXISTS assets (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255),
+    type VARCHAR(50),
+    embedding VECTOR({EMBEDDING_DIM}),
+    metadata JSONB,
+    version INT
+);
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS asset_key TEXT;
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS document TEXT;
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+CREATE UNIQUE INDEX IF NOT EXISTS assets_asset_key_idx ON assets (asset_key);
+CREATE INDEX IF NOT EXISTS assets_type_idx ON assets (type);
+CREATE INDEX IF NOT EXISTS assets_metadata_idx ON assets USING gin (metadata jsonb_path_ops);
+"""
+
+# Squared L2 keeps distances comparable with Chroma's default space (and the agents' thresholds)
+_VECTOR_INDEXES = {
+    "hnsw": "CREATE INDEX IF NOT EXISTS assets_embedding_hnsw_idx ON assets USING hnsw (embedding vector_l2_ops)",
+    "ivfflat": "CREATE INDEX IF NOT EXISTS assets_embedding_ivfflat_idx ON assets USING ivfflat (embedding vector_l2_ops) WITH (lists = 100)",
+}
+
+# One statement for the whole batch: arrays are unnested server-side
+_UPSERT = """
+INSERT INTO assets (asset_key, name, type, document, metadata, embedding, version, updated_at)
+SELECT k, n, t, d, m, e::vector, 1, CURRENT_TIMESTAMP
+FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::jsonb[], $6::text[]) AS u(k, n, t, d, m, e)
+ON CONFLICT (asset_key) DO UPDATE SET
+    name = EXCLUDED.name,
+    type = EXCLUDED.type,
+    document = EXCLUDED.document,
+    metadata = EXCLUDED.metadata,
+    embedding = EXCLUDED.embedding,
+    version = assets.version + 1,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# Every query vector in one round-trip; the LATERAL subquery lets each one use the vector index
+_QUERY = """
+SELECT q.idx, hit.metadata, hit.distance
+FROM unnest($1::text[]) WITH ORDINALITY AS q(vec, idx)
+CROSS JOIN LATERAL (
+    SELECT a.metadata, (a.embedding <-> q.vec::vector) ^ 2 AS distance
+    FROM assets a
+    WHERE a.type = $2 AND a.metadata @> $3::jsonb
+    ORDER BY a.embedding <-> q.vec::vector
+    LIMIT $4
+) AS hit
+ORDER BY q.idx, hit.distance
+"""
+
+def _vector_literal(embedding: List[float]) -> str:
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+def postgres_dsn() -> str:
+    if settings.POSTGRES_DSN:
+        return settings.POSTGRES_DSN
+    password = f":{settings.POSTGRES_PASSWORD}" if settings.POSTGRES_PASSWORD else ""
+    return (
+        f"postgresql://{settings.POSTGRES_USER}{password}@{settings.POSTGRES_HOST}:"
+        f"{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+    )
+
+class PgVectorMemoryBackend(MemoryBackend):
+    """Assets in the Postgres `assets` table with a pgvector index, behind an asyncpg pool.
+
+    Safe to share between the API and any number of worker processes.
+    """
+    def __init__(self, dsn: Optional[str] = None, index: Optional[str] = None):
+        self.dsn = dsn or postgres_dsn()
+        self.index = index or settings.PGVECTOR_INDEX
+        if self.index not in _VECTOR_INDEXES:
+            raise ValueError(f"Unknown pgvector index '{self.index}'. Options: {list(_VECTOR_INDEXES)}")
+        self._pool: Optional[asyncpg.Pool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _init_connection(self, conn: asyncpg.Connection):
+        await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+        if self.index == "hnsw":
+            await conn.execute(f"SET hnsw.ef_search = {int(settings.PGVECTOR_HNSW_EF_SEARCH)}")
+        else:
+            await conn.execute(f"SET ivfflat.probes = {int(settings.PGVECTOR_IVFFLAT_PROBES)}")
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        # Pools belong to one event loop; scripts that call asyncio.run() repeatedly get a fresh one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._pool, self._lock = loop, None, asyncio.Lock()
+        async with self._lock:
+            if self._pool is None:
+                # Schema first, on a plain connection: the pool's init sets index options that need the extension
+                conn = await asyncpg.connect(self.dsn)
+                try:
+                    await conn.execute(_SCHEMA)
+                    await conn.execute(_VECTOR_INDEXES[self.index])
+                finally:
+                    await conn.close()
+                self._pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=settings.PGVECTOR_POOL_MIN_SIZE,
+                    max_size=settings.PGVECTOR_POOL_MAX_SIZE,
+                    init=self._init_connection,
+                )
+                print(f"Memory: Connected to pgvector ({self.index} index)", flush=True)
+        return self._pool
+
+    async def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        pool = await self._get_pool()
+        await pool.execute(
+            _UPSERT,
+            ids,
+            [m.get("name") for m in metadatas],
+            [m.get("asset_type") for m in metadatas],
+            documents,
+            metadatas,
+            [_vector_literal(e) for e in embeddings],
+        )
+
+    async def query(self, embeddings: List[List[float]], asset_type: str, limit: int,
+                    filters: Optional[Dict[str, Any]] = None) -> List[List[Dict]]:
+        pool = await self._get_pool()
+        rows = await pool.fetch(_QUERY, [_vector_literal(e) for e in embeddings], asset_type, filters or {}, limit)
+        all_hits: List[List[Dict]] = [[] for _ in embeddings]
+        for row in rows:
+            all_hits[row["idx"] - 1].append({"metadata": row["metadata"], "distance": float(row["distance"])})
+        return all_hits
+
+    async def compact(self, asset_key: Callable[[str, str, str], str]) -> Dict[str, int]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch("SELECT id, asset_key, name, type, document FROM assets ORDER BY id")
+                newest: Dict[str, int] = {}
+                for row in rows:
+                    # Rows are in insertion order, so the newest version of each asset wins
+                    newest[asset_key(row["name"] or "", row["type"] or "", row["document"] or "")] = row["id"]
+                keep = set(newest.values())
+                stale = [row["id"] for row in rows if row["id"] not in keep]
+                if stale:
+                    await conn.execute("DELETE FROM assets WHERE id = ANY($1::int[])", stale)
+                # Clear first so re-keying cannot collide with a key another kept row still holds
+                rekey = list(newest.items())
+                await conn.execute("UPDATE assets SET asset_key = NULL WHERE id = ANY($1::int[])", [r for _, r in rekey])
+                await conn.executemany("UPDATE assets SET asset_key = $1 WHERE id = $2", rekey)
+        return {"scanned": len(rows), "kept": len(keep), "removed": len(stale)}
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
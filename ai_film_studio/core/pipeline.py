@@ -0,0 +1,103 @@
+from typing import Any, Dict, Optional
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.state import EpisodeState
+from ai_film_studio.core.workflow import app_graph, compile_graph
+from ai_film_studio.core.checkpoints import checkpointer, thread_config, get_checkpoint_status
+from ai_film_studio.core.llm_cache import bypass_llm_cache
+from ai_film_studio.core.workspace import job_workspace, finish_workspace
+from ai_film_studio.core.cost_ledger import get_cost_ledger
+from ai_film_studio.core.events import emit, job_events
+from ai_film_studio.core.metrics import JOBS
+from ai_film_studio.core.tracing import span
+
+async def _stream(graph, graph_input: Optional[EpisodeState], config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"final_video_path": None, "errors": []}
+    async for output in graph.astream(graph_input, config):
+        for key, value in output.items():
+            print(f"Node '{key}' finished.", flush=True)
+            await emit("node_finished", node=key)
+            if isinstance(value, dict):
+                if value.get("final_video_path"):
+                    result["final_video_path"] = value["final_video_path"]
+                if value.get("errors"):
+                    result["errors"].extend(value["errors"])
+    return result
+
+async def _final_summary(graph, job_id: str) -> Dict[str, Any]:
+    # With a checkpointer the final state is authoritative, including outputs of nodes run before a resume
+    snapshot = await graph.aget_state(thread_config(job_id))
+    values = snapshot.values or {}
+    return {"final_video_path": values.get("final_video_path"), "errors": list(values.get("errors", []))}
+
+async def _run_graph(state: EpisodeState) -> Dict[str, Any]:
+    if not settings.ENABLE_CHECKPOINTING:
+        return await _stream(app_graph, state, None)
+    async with checkpointer() as saver:
+        graph = compile_graph(saver)
+        await _stream(graph, state, thread_config(state.project_id))
+        return await _final_summary(graph, state.project_id)
+
+async def run_pipeline(state: EpisodeState) -> Dict[str, Any]:
+    """Runs the LangGraph workflow for one episode.
+
+    Returns a summary of the final outputs. Exceptions propagate so callers (API background task,
+    queue worker) can decide how to report the failure.
+    """
+    print(f"Starting Pipeline for Job {state.project_id}", flush=True)
+    with job_events(state.project_id), span("job", trace_id=state.project_id, episode_number=state.episode_number):
+        await emit("job_started", episode_number=state.episode_number)
+        await get_cost_ledger().open_job(state.project_id, state.budget_limit)
+        try:
+            if state.bypass_llm_cache:
+                with bypass_llm_cache():
+                    result = await _run_graph(state)
+            else:
+                result = await _run_graph(state)
+        finally:
+            await get_cost_ledger().close_job(state.project_id)
+        finish_workspace(job_workspace(state.project_id), succeeded=bool(result["final_video_path"]))
+        JOBS.inc(status="succeeded" if result["final_video_path"] else "no_video")
+        await emit("job_finished", final_video_path=result["final_video_path"], errors=len(result["errors"]))
+    print(f"Pipeline Finished for Job {state.project_id}", flush=True)
+    return result
+
+async def resume_pipeline(job_id: str) -> Dict[str, Any]:
+    """Restarts a job from the node after its last completed checkpoint.
+
+    Raises LookupError if the job has no checkpoint.
+    """
+    async with checkpointer() as saver:
+        graph = compile_graph(saver)
+        status = await get_checkpoint_status(graph, job_id)
+        if status is None:
+            raise LookupError(f"No checkpoint found for job {job_id}")
+        if status["completed"]:
+            print(f"Job {job_id} already completed; nothing to resume.", flush=True)
+            return await _final_summary(graph, job_id)
+        print(f"Resuming Pipeline for Job {job_id} at {status['next_nodes']}", flush=True)
+        # The request's options live in the checkpointed state, not in the resume call
+        snapshot = await graph.aget_state(thread_config(job_id))
+        bypass = bool((snapshot.values or {}).get("bypass_llm_cache"))
+        with job_events(job_id), span("job", trace_id=job_id, resumed_at=status["next_nodes"]):
+            await emit("job_started", resumed_at=status["next_nodes"])
+            await get_cost_ledger().open_job(job_id)
+            try:
+                if bypass:
+                    with bypass_llm_cache():
+                        await _stream(graph, None, thread_config(job_id))
+                else:
+                    await _stream(graph, None, thread_config(job_id))
+                result = await _final_summary(graph, job_id)
+            finally:
+                await get_cost_ledger().close_job(job_id)
+            finish_workspace(job_workspace(job_id), succeeded=bool(result["final_video_path"]))
+            JOBS.inc(status="succeeded" if result["final_video_path"] else "no_video")
+            await emit("job_finished", final_video_path=result["final_video_path"], errors=len(result["errors"]))
+        print(f"Pipeline Finished for Job {job_id}", flush=True)
+        return result
+
+async def get_pipeline_checkpoint(job_id: str) -> Optional[Dict[str, Any]]:
+    if not settings.ENABLE_CHECKPOINTING:
+        return None
+    async with checkpointer() as saver:
+        return await get_checkpoint_status(compile_graph(saver), job_id)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Annotated
+from typing import Any, List, Dict, Optional, Annotated, Union
 from pydantic import BaseModel, Field
 import operator
 
@@ -24,12 +24,39 @@ class Scene(BaseModel):
     video_clip_path: Optional[str] = None
     audio_track_path: Optional[str] = None
 
+# --- Reducers ---
+
+def merge_scenes(left: List[Scene], right: List[Union[Scene, Dict[str, Any]]]) -> List[Scene]:
+    """Reducer for EpisodeState.scenes.
+
+    Nodes return either full Scene objects (the scriptwriter) or partial updates such as
+    {"id": 3, "audio_track_path": "..."}. Updates are applied per scene id, so branches running
+    concurrently (animator and audio engineer) each set their own fields without clobbering the other.
+    """
+    merged = {scene.id: scene for scene in left}
+    order = [scene.id for scene in left]
+    for item in right:
+        if isinstance(item, Scene):
+            if item.id not in merged:
+                order.append(item.id)
+            merged[item.id] = item
+            continue
+        update = dict(item)
+        scene_id = update.pop("id")
+        if scene_id not in merged:
+            print(f"State Warning: Update for unknown Scene {scene_id} ignored", flush=True)
+            continue
+        merged[scene_id] = merged[scene_id].model_copy(update=update)
+    return [merged[scene_id] for scene_id in order]
+
 # --- Graph State ---
 
 class EpisodeState(BaseModel):
     # Metadata
     project_id: str
     episode_number: int
+    bypass_llm_cache: bool = False # Always ask the model, e.g. when the user wants a fresh draft
+    budget_limit: Optional[float] = None # USD for this job; JOB_BUDGET_LIMIT when unset
     
     # Narrative Inputs
     raw_story_input: str
@@ -39,14 +66,14 @@ class EpisodeState(BaseModel):
     screenplay: str = "" # Full text script
     
     # Core Assets
-    scenes: List[Scene] = Field(default_factory=list)
+    scenes: Annotated[List[Scene], merge_scenes] = Field(default_factory=list)
     characters: Dict[str, CharacterProfile] = Field(default_factory=dict)
     
     # Final Outputs
     final_video_path: Optional[str] = None
     
     # Operational Logs (Append-only)
-    errors: List[str] = Field(default_factory=list)
+    errors: Annotated[List[str], operator.add] = Field(default_factory=list)
     quality_metrics: Dict[str, float] = Field(default_factory=dict)
 
     def add_error(self, error_msg: str):
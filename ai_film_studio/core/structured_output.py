@@ -0,0 +1,72 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from ai_film_studio.core.interfaces import LLMProvider
+
+REPAIR_SYSTEM_PROMPT = (
+    "You fix JSON objects so they validate against the given schema. Keep every value that is "
+    "already valid and only change what the validation errors point at."
+)
+
+def _validate(model: Type[BaseModel], item: Any, fix: Optional[Callable[[Any], Any]]) -> BaseModel:
+    try:
+        return model.model_validate(item)
+    except ValidationError:
+        if fix is None:
+            raise
+    try:
+        return model.model_validate(fix(item))
+    except (TypeError, ValueError, AttributeError) as e: # ValidationError is a ValueError
+        raise ValueError(str(e)) from e
+
+async def repair_item(llm: LLMProvider, model: Type[BaseModel], item: Any, error: str,
+                      fix: Optional[Callable[[Any], Any]] = None) -> Optional[BaseModel]:
+    """Asks the model to fix one invalid object. Returns None if the fix does not validate either."""
+    repaired = await llm.generate_structured(
+        REPAIR_SYSTEM_PROMPT,
+        f"Object:\n{json.dumps(item, default=str)}\n\nValidation errors:\n{error}",
+        model,
+    )
+    try:
+        return _validate(model, repaired, fix)
+    except ValueError:
+        return None
+
+async def validate_items(llm: LLMProvider, items: List[Any], model: Type[BaseModel],
+                         fix: Optional[Callable[[Any], Any]] = None) -> Tuple[List[Optional[BaseModel]], Dict[str, int], List[str]]:
+    """Validates each item of a structured response on its own, so one broken item never costs a full retry.
+
+    Invalid items are first patched locally by `fix` (no model call); whatever still fails is sent
+    alone to the model for repair, concurrently. Returns (items aligned with the input, None where
+    repair failed), counters and error messages.
+    """
+    results: List[Optional[BaseModel]] = [None] * len(items)
+    broken: List[Tuple[int, Any, str]] = []
+    counters = {"valid": 0, "fixed_locally": 0, "repaired": 0, "dropped": 0}
+    for i, item in enumerate(items):
+        try:
+            results[i] = model.model_validate(item)
+            counters["valid"] += 1
+            continue
+        except ValidationError as e:
+            error = str(e)
+        if fix is not None:
+            try:
+                results[i] = _validate(model, item, fix)
+                counters["fixed_locally"] += 1
+                continue
+            except ValueError as e:
+                error = str(e)
+        broken.append((i, item, error))
+
+    errors: List[str] = []
+    repaired = await asyncio.gather(*[repair_item(llm, model, item, error, fix) for _, item, error in broken], return_exceptions=True)
+    for (i, _, error), result in zip(broken, repaired):
+        if isinstance(result, BaseModel):
+            results[i] = result
+            counters["repaired"] += 1
+        else:
+            counters["dropped"] += 1
+            errors.append(f"{model.__name__} #{i + 1} could not be repaired: {result if isinstance(result, Exception) else error}")
+    return results, counters, errors
@@ -0,0 +1,156 @@
+"""
+Nested timing spans per job, appended as JSON lines to the job's workspace (trace.jsonl).
+
+Spans nest through a context var, so tasks spawned inside a span (scene fan-out, provider calls)
+become its children. Outside a job trace, span() only measures time and writes nothing.
+
+Usage: python -m ai_film_studio.core.tracing <job_id or trace.jsonl> [--chrome trace.json]
+Prints the episode's critical path; --chrome also writes the trace for chrome://tracing / Perfetto.
+"""
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.workspace import JobWorkspace
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+_write_lock = threading.Lock()
+
+def trace_path(job_id: str) -> str:
+    return os.path.join(JobWorkspace(job_id).root, "trace.jsonl")
+
+class Span:
+    def __init__(self, name: str, trace_id: Optional[str], parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.start = time.time()
+        self._started_at = time.monotonic()
+        self.duration = 0.0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {"trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id, "name": self.name,
+                  "start": self.start, "duration": self.duration, "attrs": self.attrs}
+        if self.error:
+            record["error"] = self.error
+        return record
+
+def _export(span: Span):
+    path = trace_path(span.trace_id)
+    line = json.dumps(span.to_dict(), default=str)
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attrs: Any) -> Iterator[Span]:
+    """Times the block as a child of the current span. Pass trace_id to start a job's root span.
+    Attributes may be added to span.attrs inside the block."""
+    parent = _current_span.get()
+    trace_id = trace_id or (parent.trace_id if parent else None)
+    current = Span(name, trace_id, parent.span_id if parent and parent.trace_id == trace_id else None, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration = time.monotonic() - current._started_at
+        if trace_id and settings.ENABLE_TRACING:
+            try:
+                _export(current)
+            except OSError as e:
+                print(f"Tracing Error: Could not write span {name}: {e}", flush=True)
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _end(s: Dict[str, Any]) -> float:
+    return s["start"] + s["duration"]
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """(depth, span) pairs on the critical path of the latest run. Within each span, walk back from
+    the child that ended last to the child that ended last before it started, and so on; then
+    descend into each of those children the same way."""
+    roots = [s for s in spans if s["parent_id"] is None]
+    if not roots:
+        return []
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for s in spans:
+        if s["parent_id"]:
+            children.setdefault(s["parent_id"], []).append(s)
+
+    def walk(s: Dict[str, Any], depth: int) -> List[Tuple[int, Dict[str, Any]]]:
+        chain: List[Dict[str, Any]] = []
+        candidates = children.get(s["span_id"], [])
+        while candidates:
+            # On equal ends the later start is the successor (a zero-length span after its predecessor)
+            chain.insert(0, max(candidates, key=lambda c: (_end(c), c["start"])))
+            # Small tolerance: a successor starts a hair after its predecessor's recorded end. Only
+            # spans starting strictly earlier qualify, or a span shorter than the tolerance (a no-op
+            # node, a cache hit) would be picked again forever.
+            candidates = [c for c in candidates if c["start"] < chain[0]["start"]
+                          and _end(c) <= chain[0]["start"] + 0.01 and all(c is not p for p in chain)]
+        result = [(depth, s)]
+        for child in chain:
+            result.extend(walk(child, depth + 1))
+        return result
+
+    return walk(max(roots, key=lambda s: s["start"]), 0)
+
+def to_chrome_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Complete ("X") events. Each span goes on the first row where it either follows or nests
+    inside what is already there, so concurrent work shows up on parallel rows."""
+    rows: List[List[float]] = [] # Per row, the end times of the spans currently open on it
+    events = []
+    for s in sorted(spans, key=lambda s: (s["start"], -s["duration"])):
+        end = s["start"] + s["duration"]
+        for tid, stack in enumerate(rows):
+            while stack and stack[-1] <= s["start"]:
+                stack.pop()
+            if not stack or stack[-1] >= end:
+                break
+        else:
+            tid, stack = len(rows), []
+            rows.append(stack)
+        stack.append(end)
+        events.append({"name": s["name"], "ph": "X", "ts": s["start"] * 1e6, "dur": s["duration"] * 1e6,
+                       "pid": 1, "tid": tid, "args": {**s["attrs"], **({"error": s["error"]} if "error" in s else {})}})
+    return {"traceEvents": events}
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the critical path of a job trace")
+    parser.add_argument("trace", help="Job id or path to a trace.jsonl")
+    parser.add_argument("--chrome", help="Also write a chrome://tracing JSON file here")
+    args = parser.parse_args()
+
+    path = args.trace if os.path.isfile(args.trace) else trace_path(args.trace)
+    spans = load_trace(path)
+    chain = critical_path(spans)
+    if not chain:
+        raise SystemExit(f"No root span in {path}")
+    root = chain[0][1]
+    print(f"Critical path of {root['trace_id']} ({root['duration']:.2f}s, {len(spans)} spans):")
+    for depth, s in chain:
+        attrs = " ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in s["attrs"].items())
+        print(f"{'  ' * depth + s['name']:<48} +{s['start'] - root['start']:8.2f}s  {s['duration']:8.2f}s  {attrs}")
+    if args.chrome:
+        with open(args.chrome, "w") as f:
+            json.dump(to_chrome_trace(spans), f)
+        print(f"Chrome trace written to {args.chrome}")
+
+if __name__ == "__main__":
+    main()
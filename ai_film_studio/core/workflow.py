@@ -1,7 +1,12 @@
+import functools
+from typing import Callable, Dict, Optional
 from langgraph.graph import StateGraph, END
+from ai_film_studio.config.settings import settings
 from ai_film_studio.core.state import EpisodeState
+from ai_film_studio.core.metrics import NODE_DURATION
+from ai_film_studio.core.tracing import span
 from ai_film_studio.agents.story_analyst import story_analyst_node
-from ai_film_studio.agents.scriptwriter import scriptwriter_node
+from ai_film_studio.agents.scriptwriter import scriptwriter_node, scriptwriter_mode
 from ai_film_studio.agents.character_designer import character_designer_node
 from ai_film_studio.agents.director import director_node
 from ai_film_studio.agents.animator import animator_node
@@ -9,30 +14,118 @@ from ai_film_studio.agents.animator import animator_node
 from ai_film_studio.agents.audio_engineer import audio_engineer_node
 from ai_film_studio.agents.editor import editor_node
 from ai_film_studio.agents.critic import critic_node
+from ai_film_studio.agents.scene_pipeline import scene_pipeline_node, screenplay_pipeline_node
+
+AGENT_NODES: Dict[str, Callable] = {
+    "story_analyst": story_analyst_node,
+    "scriptwriter": scriptwriter_node,
+    "character_designer": character_designer_node,
+    "director": director_node,
+    "animator": animator_node,
+    "audio_engineer": audio_engineer_node,
+    "editor": editor_node,
+    "critic": critic_node,
+    "scene_pipeline": scene_pipeline_node,
+    "screenplay_pipeline": screenplay_pipeline_node,
+}
+
+# Stages replaced by the single scene_pipeline node in streaming mode
+_STAGED_NODES = ("director", "animator", "audio_engineer", "editor")
+# With a streaming scriptwriter, screenplay_pipeline also absorbs the scriptwriter so storyboarding overlaps writing
+_SCRIPTED_NODES = ("scriptwriter", "scene_pipeline")
+
+def _instrumented(name: str, fn: Callable) -> Callable:
+    """Times the node into NODE_DURATION and a trace span."""
+    @functools.wraps(fn)
+    async def node(state: EpisodeState):
+        with NODE_DURATION.time(node=name), span(f"node:{name}"):
+            return await fn(state)
+    return node
+
+def build_workflow(concurrent_branches: Optional[bool] = None, nodes: Optional[Dict[str, Callable]] = None,
+                   pipeline_mode: Optional[str] = None) -> StateGraph:
+    """Builds the episode graph.
+
+    With concurrent branches, stages that don't depend on each other overlap:
+      story_analyst -> scriptwriter -> director -> animator ---+
+                    |              \\-> audio_engineer --------+-> editor -> critic
+                    \\-> character_designer -------------------+
+    Otherwise all agents run as a strict chain. In "streaming" pipeline mode the four per-scene
+    stages collapse into scene_pipeline, and with a streaming scriptwriter, scriptwriter + scene_pipeline
+    collapse into screenplay_pipeline. `nodes` overrides agent callables (benchmarks).
+    """
+    if concurrent_branches is None:
+        concurrent_branches = settings.CONCURRENT_WORKFLOW_BRANCHES
+    streaming = (pipeline_mode or settings.PIPELINE_MODE) == "streaming"
+    scripted = streaming and scriptwriter_mode(pipeline_mode) == "streaming"
+    node_fns = {**AGENT_NODES, **(nodes or {})}
+    if scripted:
+        excluded = _STAGED_NODES + _SCRIPTED_NODES
+    elif streaming:
+        excluded = _STAGED_NODES + ("screenplay_pipeline",)
+    else:
+        excluded = ("scene_pipeline", "screenplay_pipeline")
+
+    graph = StateGraph(EpisodeState)
+
+    # Add Nodes
+    for name, fn in node_fns.items():
+        if name not in excluded:
+            graph.add_node(name, _instrumented(name, fn))
+
+    # Define Edges
+    graph.set_entry_point("story_analyst")
+    if scripted:
+        if concurrent_branches:
+            graph.add_edge("story_analyst", "screenplay_pipeline")
+            graph.add_edge("story_analyst", "character_designer")
+            graph.add_edge(["screenplay_pipeline", "character_designer"], "critic")
+        else:
+            graph.add_edge("story_analyst", "character_designer")
+            graph.add_edge("character_designer", "screenplay_pipeline")
+            graph.add_edge("screenplay_pipeline", "critic")
+        graph.add_edge("critic", END)
+        return graph
+
+    if streaming:
+        graph.add_edge("story_analyst", "scriptwriter")
+        if concurrent_branches:
+            graph.add_edge("story_analyst", "character_designer")
+            graph.add_edge("scriptwriter", "scene_pipeline")
+            graph.add_edge(["scene_pipeline", "character_designer"], "critic")
+        else:
+            graph.add_edge("scriptwriter", "character_designer")
+            graph.add_edge("character_designer", "scene_pipeline")
+            graph.add_edge("scene_pipeline", "critic")
+        graph.add_edge("critic", END)
+        return graph
+
+    if concurrent_branches:
+        # Character design only needs story_analysis; TTS only needs the scriptwriter's dialogue
+        graph.add_edge("story_analyst", "scriptwriter")
+        graph.add_edge("story_analyst", "character_designer")
+        graph.add_edge("scriptwriter", "director")
+        graph.add_edge("scriptwriter", "audio_engineer")
+        graph.add_edge("director", "animator")
+        # The editor waits for every branch to finish
+        graph.add_edge(["animator", "audio_engineer", "character_designer"], "editor")
+    else:
+        graph.add_edge("story_analyst", "scriptwriter")
+        graph.add_edge("scriptwriter", "character_designer")
+        graph.add_edge("character_designer", "director")
+        graph.add_edge("director", "animator")
+        graph.add_edge("animator", "audio_engineer")
+        graph.add_edge("audio_engineer", "editor")
+    graph.add_edge("editor", "critic")
+    graph.add_edge("critic", END)
+    return graph
 
 # Define Graph
-workflow = StateGraph(EpisodeState)
-
-# Add Nodes
-workflow.add_node("story_analyst", story_analyst_node)
-workflow.add_node("scriptwriter", scriptwriter_node)
-workflow.add_node("character_designer", character_designer_node)
-workflow.add_node("director", director_node)
-workflow.add_node("animator", animator_node)
-workflow.add_node("audio_engineer", audio_engineer_node)
-workflow.add_node("editor", editor_node)
-workflow.add_node("critic", critic_node)
-
-# Define Edges
-workflow.set_entry_point("story_analyst")
-workflow.add_edge("story_analyst", "scriptwriter")
-workflow.add_edge("scriptwriter", "character_designer")
-workflow.add_edge("character_designer", "director")
-workflow.add_edge("director", "animator")
-workflow.add_edge("animator", "audio_engineer") # Sequential for simplicity
-workflow.add_edge("audio_engineer", "editor")
-workflow.add_edge("editor", "critic")
-workflow.add_edge("critic", END)
+workflow = build_workflow()
+
+def compile_graph(checkpointer=None):
+    """Compiles the workflow, optionally persisting each node's output through `checkpointer`."""
+    return workflow.compile(checkpointer=checkpointer)
 
 # Compile
-app_graph = workflow.compile()
+app_graph = compile_graph()
@@ -0,0 +1,104 @@
+import os
+import re
+import shutil
+import time
+from typing import List, Optional
+from ai_film_studio.config.settings import settings
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]")
+
+class JobWorkspace:
+    """Private directory tree for one job, keyed by project_id:
+
+        <WORKSPACE_ROOT>/<project_id>/clips   rendered scene clips (kept for resumes)
+        <WORKSPACE_ROOT>/<project_id>/temp    muxed scenes, ffmpeg concat lists
+        <WORKSPACE_ROOT>/<project_id>/output  final episode videos
+
+    Everything a job writes goes here, so concurrent jobs never share a path. Shared caches
+    (ARTIFACT_CACHE_DIR, LLM/embedding caches) stay outside and are only read through their paths.
+    """
+    def __init__(self, project_id: str, root: Optional[str] = None):
+        self.project_id = project_id
+        # project_id comes from API callers; never let it escape the workspace root
+        name = _UNSAFE.sub("_", project_id).strip(".") or "_"
+        self.root = os.path.join(root or settings.WORKSPACE_ROOT, name)
+
+    @property
+    def clips_dir(self) -> str:
+        return self._dir("clips")
+
+    @property
+    def temp_dir(self) -> str:
+        return self._dir("temp")
+
+    @property
+    def output_dir(self) -> str:
+        return self._dir("output")
+
+    def _dir(self, name: str) -> str:
+        path = os.path.join(self.root, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def clip_path(self, scene_id: int) -> str:
+        return os.path.join(self.clips_dir, f"scene_{scene_id}.mp4")
+
+    def muxed_path(self, scene_id: int) -> str:
+        return os.path.join(self.temp_dir, f"scene_{scene_id}_combined.mp4")
+
+    def concat_list_path(self, episode_number: int) -> str:
+        return os.path.join(self.temp_dir, f"episode_{episode_number}_concat_list.txt")
+
+    def final_video_path(self, episode_number: int) -> str:
+        return os.path.join(self.output_dir, f"episode_{episode_number}_final.mp4")
+
+    def final_videos(self) -> List[str]:
+        """Final videos of this job, newest first."""
+        directory = os.path.join(self.root, "output")
+        if not os.path.isdir(directory):
+            return []
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith("_final.mp4")]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def clear_temp(self):
+        shutil.rmtree(os.path.join(self.root, "temp"), ignore_errors=True)
+
+def job_workspace(project_id: str) -> JobWorkspace:
+    return JobWorkspace(project_id)
+
+def finish_workspace(workspace: JobWorkspace, succeeded: bool):
+    """Applies the end-of-job cleanup policy. Failed jobs keep everything so a resume can reuse it."""
+    if succeeded and not settings.WORKSPACE_KEEP_TEMP:
+        workspace.clear_temp()
+
+def prune_workspaces(root: Optional[str] = None, retention_hours: Optional[float] = None,
+                     active: Optional[set] = None) -> int:
+    """Deletes job workspaces untouched for longer than WORKSPACE_RETENTION_HOURS (0 keeps them forever).
+    Workspaces of `active` project ids are skipped. Returns the number removed."""
+    root = root or settings.WORKSPACE_ROOT
+    hours = settings.WORKSPACE_RETENTION_HOURS if retention_hours is None else retention_hours
+    if hours <= 0 or not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - hours * 3600
+    skip = {JobWorkspace(project_id, root).root for project_id in active or ()}
+    removed = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if not os.path.isdir(path) or path in skip:
+            continue
+        if _last_modified(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    if removed:
+        print(f"Workspace: Pruned {removed} job workspace(s) older than {hours:g}h", flush=True)
+    return removed
+
+def _last_modified(path: str) -> float:
+    latest = os.path.getmtime(path)
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(directory, name)))
+            except OSError:
+                pass
+    return latest
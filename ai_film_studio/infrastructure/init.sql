@@ -24,9 +24,17 @@ CREATE TABLE IF NOT EXISTS scenes (
 
 CREATE TABLE IF NOT EXISTS assets (
     id SERIAL PRIMARY KEY,
+    asset_key TEXT UNIQUE, -- MemoryStore id, the upsert target
     name VARCHAR(255),
     type VARCHAR(50),
+    document TEXT,
     embedding VECTOR(768),
     metadata JSONB,
-    version INT
+    version INT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Memory search indexes (MEMORY_BACKEND=pgvector). The backend also creates these on first use.
+CREATE INDEX IF NOT EXISTS assets_type_idx ON assets (type);
+CREATE INDEX IF NOT EXISTS assets_metadata_idx ON assets USING gin (metadata jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS assets_embedding_hnsw_idx ON assets USING hnsw (embedding vector_l2_ops);
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import subprocess
+from typing import Callable, Dict, Optional, Tuple
+from ai_film_studio.config.settings import settings
+
+# Ken Burns fallback: turn a still storyboard into a clip with a slow zoom/pan.
+#
+# Renderers:
+#   "ffmpeg"  - decode the still once, pre-scale it to the zoom canvas, then an eased zoompan.
+#               Every frame works on a small canvas instead of the full-resolution storyboard.
+#   "numpy"   - decode once, compute every frame with a vectorized crop + bilinear resample and
+#               pipe raw RGB to the encoder over stdin. Sub-pixel motion (no zoompan jitter).
+#   "zoompan" - the original command (looped full-resolution input, default x264 preset),
+#               kept for comparison.
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": lambda p: p,
+    "ease_in": lambda p: p * p,
+    "ease_out": lambda p: 1 - (1 - p) * (1 - p),
+    "ease_in_out": lambda p: p * p * (3 - 2 * p),
+}
+
+# Same curves as ffmpeg expressions of the progress variable P
+_EASING_EXPRESSIONS: Dict[str, str] = {
+    "linear": "(P)",
+    "ease_in": "(P*P)",
+    "ease_out": "(1-(1-P)*(1-P))",
+    "ease_in_out": "(P*P*(3-2*P))",
+}
+
+# Direction the camera travels over the clip (x, y in [-1, 1])
+PAN_DIRECTIONS: Dict[str, Tuple[int, int]] = {
+    "center": (0, 0),
+    "left": (-1, 0),
+    "right": (1, 0),
+    "up": (0, -1),
+    "down": (0, 1),
+}
+
+def parse_resolution(resolution: str) -> Tuple[int, int]:
+    width, height = resolution.lower().split("x")
+    return int(width), int(height)
+
+def _check_options(easing: str, pan: str):
+    if easing not in EASINGS:
+        raise ValueError(f"Unknown Ken Burns easing '{easing}'. Options: {list(EASINGS)}")
+    if pan not in PAN_DIRECTIONS:
+        raise ValueError(f"Unknown Ken Burns pan '{pan}'. Options: {list(PAN_DIRECTIONS)}")
+
+def _encoder_args(fps: int, output_path: str) -> list:
+    return [
+        "-r", str(fps),
+        "-c:v", "libx264",
+        "-preset", settings.KEN_BURNS_PRESET,
+        "-pix_fmt", "yuv420p",
+        output_path,
+    ]
+
+def zoompan_command(image_path: str, output_path: str, duration: float, width: int, height: int, fps: int) -> list:
+    # ffmpeg command for a simple zoom-in effect
+    # zoompan: the actual effect. d=duration*fps
+    return [
+        "ffmpeg", "-y",
+        "-loop", "1",
+        "-i", image_path,
+        "-vf", f"zoompan=z='min(zoom+0.0015,1.5)':d={int(duration * fps)}:s={width}x{height}:fps={fps}",
+        "-t", str(duration),
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        output_path
+    ]
+
+def filter_chain_command(image_path: str, output_path: str, duration: float, width: int, height: int, fps: int,
+                         zoom_start: float, zoom_end: float, easing: str, pan: str) -> list:
+    frames = max(2, int(round(duration * fps)))
+    max_zoom = max(zoom_start, zoom_end, 1.0)
+    base_w, base_h = 2 * int(width * max_zoom / 2), 2 * int(height * max_zoom / 2)
+    pan_x, pan_y = PAN_DIRECTIONS[pan]
+    eased = _EASING_EXPRESSIONS[easing].replace("P", f"(on/{frames - 1})")
+    # Anchor moves from one edge of the spare margin to the other along the pan direction
+    anchor_x = f"(0.5+0.5*{pan_x}*(2*{eased}-1))"
+    anchor_y = f"(0.5+0.5*{pan_y}*(2*{eased}-1))"
+    vf = ",".join([
+        # 1. Decoded once (no -loop) and cover-cropped to the canvas the deepest zoom needs,
+        #    so zoompan never touches the full-resolution storyboard
+        f"scale={base_w}:{base_h}:force_original_aspect_ratio=increase",
+        f"crop={base_w}:{base_h}",
+        "setsar=1",
+        # 2. zoompan emits every frame of the clip from that single input frame
+        f"zoompan=z='{zoom_start}+({zoom_end - zoom_start})*{eased}'"
+        f":x='(iw-iw/zoom)*{anchor_x}':y='(ih-ih/zoom)*{anchor_y}'"
+        f":d={frames}:s={width}x{height}:fps={fps}",
+    ])
+    return [
+        "ffmpeg", "-y",
+        "-i", image_path,
+        "-vf", vf,
+        "-frames:v", str(frames),
+    ] + _encoder_args(fps, output_path)
+
+def _render_numpy(image_path: str, output_path: str, duration: float, width: int, height: int, fps: int,
+                  zoom_start: float, zoom_end: float, easing: str, pan: str) -> bool:
+    import numpy as np
+
+    frames = max(2, int(round(duration * fps)))
+    max_zoom = max(zoom_start, zoom_end, 1.0)
+    # Decode once at the resolution the deepest zoom needs, so no frame is upsampled from a tiny crop
+    base_w, base_h = int(round(width * max_zoom)), int(round(height * max_zoom))
+    decode = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", image_path,
+         "-vf", f"scale={base_w}:{base_h}:force_original_aspect_ratio=increase,crop={base_w}:{base_h}",
+         "-frames:v", "1", "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+        capture_output=True,
+    )
+    if decode.returncode != 0:
+        print(f"Ken Burns Decode Error: {decode.stderr.decode()}", flush=True)
+        return False
+    source = np.frombuffer(decode.stdout, dtype=np.uint8).reshape(base_h, base_w, 3).astype(np.float32)
+
+    encoder = subprocess.Popen(
+        ["ffmpeg", "-y", "-v", "error",
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+        + _encoder_args(fps, output_path),
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    ease = EASINGS[easing]
+    pan_x, pan_y = PAN_DIRECTIONS[pan]
+    out_x = np.arange(width, dtype=np.float32) + 0.5
+    out_y = np.arange(height, dtype=np.float32) + 0.5
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    try:
+        for n in range(frames):
+            e = ease(n / (frames - 1))
+            zoom = zoom_start + (zoom_end - zoom_start) * e
+            # The crop window shrinks as the zoom grows; at max_zoom it is exactly the output size
+            crop_w, crop_h = width * max_zoom / zoom, height * max_zoom / zoom
+            x0 = (base_w - crop_w) * (0.5 + 0.5 * pan_x * (2 * e - 1))
+            y0 = (base_h - crop_h) * (0.5 + 0.5 * pan_y * (2 * e - 1))
+
+            # Separable bilinear resample of the crop window onto the output grid: rows first, then columns
+            sx = np.clip(x0 + out_x * (crop_w / width) - 0.5, 0, base_w - 1.001)
+            sy = np.clip(y0 + out_y * (crop_h / height) - 0.5, 0, base_h - 1.001)
+            ix, iy = sx.astype(np.int32), sy.astype(np.int32)
+            fx, fy = (sx - ix)[None, :, None], (sy - iy)[:, None, None]
+            rows = source[iy]
+            rows += (source[iy + 1] - rows) * fy
+            left, right = np.take(rows, ix, axis=1), np.take(rows, ix + 1, axis=1)
+            left += (right - left) * fx
+            np.copyto(frame, left, casting="unsafe")
+            encoder.stdin.write(frame.tobytes())
+        encoder.stdin.close()
+    except BrokenPipeError:
+        pass
+    stderr = encoder.stderr.read()
+    encoder.wait()
+    if encoder.returncode != 0:
+        print(f"Ken Burns Encode Error: {stderr.decode()}", flush=True)
+        return False
+    return True
+
+async def render_ken_burns(image_path: str, output_path: str, duration: float = 4.0,
+                           renderer: Optional[str] = None, resolution: Optional[str] = None,
+                           fps: Optional[int] = None, zoom_start: Optional[float] = None,
+                           zoom_end: Optional[float] = None, easing: Optional[str] = None,
+                           pan: Optional[str] = None) -> Optional[str]:
+    """Renders a Ken Burns clip from a still. Unset options fall back to the KEN_BURNS_* settings.
+    Returns output_path, or None if ffmpeg failed."""
+    renderer = renderer or settings.KEN_BURNS_RENDERER
+    width, height = parse_resolution(resolution or settings.KEN_BURNS_RESOLUTION)
+    fps = fps or settings.KEN_BURNS_FPS
+    zoom_start = settings.KEN_BURNS_ZOOM_START if zoom_start is None else zoom_start
+    zoom_end = settings.KEN_BURNS_ZOOM_END if zoom_end is None else zoom_end
+    easing = easing or settings.KEN_BURNS_EASING
+    pan = pan or settings.KEN_BURNS_PAN
+    _check_options(easing, pan)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    if renderer == "numpy":
+        # CPU-bound frame math and blocking pipe writes stay off the event loop
+        success = await asyncio.to_thread(
+            _render_numpy, image_path, output_path, duration, width, height, fps, zoom_start, zoom_end, easing, pan
+        )
+        return output_path if success else None
+
+    if renderer == "zoompan":
+        cmd = zoompan_command(image_path, output_path, duration, width, height, fps)
+    elif renderer == "ffmpeg":
+        cmd = filter_chain_command(image_path, output_path, duration, width, height, fps, zoom_start, zoom_end, easing, pan)
+    else:
+        raise ValueError(f"Unknown Ken Burns renderer '{renderer}'")
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+
+    if process.returncode != 0:
+        print(f"FFmpeg Error: {stderr.decode()}")
+        return None
+    return output_path
@@ -3,36 +3,49 @@ from elevenlabs import Voice, VoiceSettings
 from elevenlabs.client import ElevenLabs
 from ai_film_studio.core.interfaces import AudioProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.providers.executor import run_blocking
 
 class ElevenLabsProvider(AudioProvider):
-    def __init__(self):
+    def __init__(self, model_name: str = "eleven_multilingual_v2"): # Good default choice
+        self.model_name = model_name
         if not settings.ELEVENLABS_API_KEY:
             print("Warning: ELEVENLABS_API_KEY is not set. Generation will fail.")
             
         # The ElevenLabs client automatically picks up ELEVENLABS_API_KEY from environment
         self.client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
 
+    def _synthesize_to_file(self, text: str, voice_id: str, filename: str):
+        # Using the v1.0.0 synchronous generator pattern, we can consume it into a file.
+        # Both the request and the chunk iteration block, so this runs on the provider executor.
+        audio_generator = self.client.generate(
+            text=text,
+            voice=voice_id,
+            model=self.model_name
+        )
+        with open(filename, "wb") as out:
+            for chunk in audio_generator:
+                if chunk:
+                    out.write(chunk)
+
     async def generate_speech(self, text: str, voice_id: str = "Rachel") -> str:
         try:
+            cache_key = artifact_cache.make_key("elevenlabs", self.model_name, text=text, voice=voice_id)
+            cached_path = artifact_cache.lookup("elevenlabs", cache_key)
+            if cached_path:
+                print(f"Audio: Cache hit for {cache_key[:12]}", flush=True)
+                return cached_path
+
             print(f"Audio: Generating speech with ElevenLabs (Voice: {voice_id})")
             
-            # Using the v1.0.0 synchronous generator pattern, we can consume it into a file
-            audio_generator = self.client.generate(
-                text=text,
-                voice=voice_id,
-                model="eleven_multilingual_v2" # Good default choice
-            )
-            
-            # Ensure directory exists
-            os.makedirs("assets/audio", exist_ok=True)
-            filename = f"assets/audio/{hash(text)}.mp3"
+            filename = artifact_cache.path_for("audio", cache_key, "mp3")
+            await run_blocking("elevenlabs", self._synthesize_to_file, text, voice_id, filename)
             
-            with open(filename, "wb") as out:
-                for chunk in audio_generator:
-                    if chunk:
-                        out.write(chunk)
-                        
+            artifact_cache.store("elevenlabs", cache_key, filename)
             return filename
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"ElevenLabs Error: {e}")
             return "assets/placeholders/silence.mp3"
@@ -1,6 +1,8 @@
 from google.cloud import texttospeech
 from ai_film_studio.core.interfaces import AudioProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.providers.executor import run_blocking
 import os
 
 class GoogleTTSProvider(AudioProvider):
@@ -9,7 +11,12 @@ class GoogleTTSProvider(AudioProvider):
         self.client = texttospeech.TextToSpeechClient()
 
     async def generate_speech(self, text: str, voice_id: str = "en-US-Standard-A") -> str:
-        
+        cache_key = artifact_cache.make_key("google-tts", "texttospeech-v1", text=text, voice=voice_id, language_code="en-US")
+        cached_path = artifact_cache.lookup("google-tts", cache_key)
+        if cached_path:
+            print(f"Google TTS: Cache hit for {cache_key[:12]}", flush=True)
+            return cached_path
+
         input_text = texttospeech.SynthesisInput(text=text)
         
         # Simple voice selection logic for MVP
@@ -23,15 +30,16 @@ class GoogleTTSProvider(AudioProvider):
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
 
-        response = self.client.synthesize_speech(
+        response = await run_blocking(
+            "google-tts",
+            self.client.synthesize_speech,
             input=input_text, voice=voice_params, audio_config=audio_config
         )
 
-        # Ensure directory exists
-        os.makedirs("assets/audio", exist_ok=True)
-        filename = f"assets/audio/{hash(text)}.mp3"
+        filename = artifact_cache.path_for("audio", cache_key, "mp3")
         
         with open(filename, "wb") as out:
             out.write(response.audio_content)
-            
+        
+        artifact_cache.store("google-tts", cache_key, filename)
         return filename
@@ -0,0 +1,161 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.core.interfaces import ImageGenerationProvider, VideoGenerationProvider
+from ai_film_studio.core.metrics import PROVIDER_CHAIN_REQUESTS
+from ai_film_studio.core.tracing import span
+
+def is_placeholder(path: Any) -> bool:
+    """Providers report a failed generation in-band by returning a path under assets/placeholders."""
+    return "placeholders" in str(path)
+
+class LatencyTracker:
+    """Recent successful call latencies per "provider:model", for the hedging quantile."""
+    def __init__(self):
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float):
+        self._samples.setdefault(key, deque(maxlen=settings.HEDGE_LATENCY_WINDOW)).append(seconds)
+
+    def quantile(self, key: str, q: float) -> Optional[float]:
+        """The q-quantile (nearest rank) of the recent latencies, or None before HEDGE_MIN_SAMPLES."""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < max(1, settings.HEDGE_MIN_SAMPLES):
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+latency_tracker = LatencyTracker()
+
+class _Attempt:
+    def __init__(self, member: Any, path: str):
+        self.member = member
+        self.path = path # "primary", "hedge" (launched at the previous member's quantile) or "fallback"
+        self.key = f"{getattr(member, 'provider_name', type(member).__name__)}:{getattr(member, 'model_name', 'default')}"
+        self.started_at = time.monotonic()
+        self.cached = False
+
+class ProviderChain:
+    """Ordered providers of one kind, tried with per-call deadlines and tail-latency hedging.
+
+    The first member gets every request. The next member is started when the running one fails
+    (raises, returns a placeholder or misses its deadline), or, as a hedge, when it is still running
+    at its HEDGE_QUANTILE latency. The first success wins and the others are cancelled. Only the
+    winner is charged to the cost ledger, although a cancelled request may still finish (and bill)
+    on the provider's side. Which member served each request, and by which path, is counted in
+    filmstudio_provider_chain_requests_total and recorded on the call's trace span.
+
+    When no member succeeds the last placeholder is returned (the kind's own placeholder if every
+    member missed its deadline), and an exception such as RateLimitError propagates as it would
+    from a single provider.
+    """
+    kind = ""
+    placeholder = ""
+
+    def __init__(self, members: List[Any]):
+        self.members = members
+        # Priced and labelled as the primary, e.g. by cost admission
+        self.provider_name = getattr(members[0], "provider_name", type(members[0]).__name__)
+        self.model_name = getattr(members[0], "model_name", "default")
+
+    def _deadline(self, member: Any) -> float:
+        provider = getattr(member, "provider_name", "")
+        key = f"{provider}:{getattr(member, 'model_name', 'default')}"
+        default = settings.VIDEO_CALL_DEADLINE_SECONDS if self.kind == "video" else settings.IMAGE_CALL_DEADLINE_SECONDS
+        return settings.PROVIDER_DEADLINES.get(key, settings.PROVIDER_DEADLINES.get(provider, default))
+
+    async def _run(self, attempt: _Attempt, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        call = getattr(attempt.member, method)(*args, **kwargs)
+        with artifact_cache.track() as lookups:
+            result = await asyncio.wait_for(call, timeout=self._deadline(attempt.member))
+        # Cache hits answer in milliseconds and would drag the hedging quantile down
+        attempt.cached = bool(lookups["hits"])
+        return result
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        with span(f"chain:{self.kind}", primary=f"{self.provider_name}:{self.model_name}") as chain_span:
+            running: Dict[asyncio.Task, _Attempt] = {}
+
+            def launch(path: str):
+                attempt = _Attempt(self.members[len(launched)], path)
+                launched.append(attempt)
+                running[asyncio.create_task(self._run(attempt, method, args, kwargs))] = attempt
+
+            launched: List[_Attempt] = []
+            launch("primary")
+            last_result: Any = None
+            last_error: Optional[BaseException] = None # Deadline misses aside
+            try:
+                while running:
+                    latest = launched[-1]
+                    timeout = None
+                    if len(launched) < len(self.members) and settings.HEDGE_QUANTILE > 0:
+                        hedge_after = latency_tracker.quantile(latest.key, settings.HEDGE_QUANTILE)
+                        if hedge_after is not None:
+                            timeout = max(0.0, latest.started_at + hedge_after - time.monotonic())
+                    done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    if not done:
+                        print(f"Provider Chain: {latest.key} slower than its p{settings.HEDGE_QUANTILE * 100:g}, "
+                              f"hedging on {self.members[len(launched)].provider_name}", flush=True)
+                        launch("hedge")
+                        continue
+
+                    for task in done:
+                        attempt = running.pop(task)
+                        error = task.exception()
+                        if error is None and not is_placeholder(task.result()):
+                            if not attempt.cached:
+                                latency_tracker.record(attempt.key, time.monotonic() - attempt.started_at)
+                            PROVIDER_CHAIN_REQUESTS.inc(kind=self.kind, served_by=attempt.key, path=attempt.path)
+                            chain_span.attrs.update(served_by=attempt.key, path=attempt.path, attempts=len(launched))
+                            if attempt.path != "primary":
+                                print(f"Provider Chain: {self.kind} served by {attempt.key} ({attempt.path})", flush=True)
+                            return task.result()
+                        if error is None:
+                            last_result = task.result()
+                            reason = "returned a placeholder"
+                        elif isinstance(error, asyncio.TimeoutError):
+                            reason = f"missed its {self._deadline(attempt.member):g}s deadline"
+                        else:
+                            last_error = error
+                            reason = f"failed: {error}"
+                        print(f"Provider Chain: {attempt.key} {reason}", flush=True)
+
+                    if not running and len(launched) < len(self.members):
+                        launch("fallback")
+            finally:
+                # Losers, and everything if the caller was cancelled
+                for task in running:
+                    task.cancel()
+                if running:
+                    await asyncio.gather(*running, return_exceptions=True)
+
+            PROVIDER_CHAIN_REQUESTS.inc(kind=self.kind, served_by="none", path="failed")
+            chain_span.attrs.update(served_by=None, path="failed", attempts=len(launched))
+            if last_result is not None or last_error is None:
+                return last_result if last_result is not None else self.placeholder
+            raise last_error
+
+class ChainedImageProvider(ProviderChain, ImageGenerationProvider):
+    kind = "image"
+    placeholder = "assets/placeholders/no_image_generated.png"
+
+    async def generate_image(self, prompt: str, negative_prompt: str = "", width: int = 1024, height: int = 1024, reference_images: Optional[List[str]] = None) -> str:
+        kwargs = {"negative_prompt": negative_prompt, "width": width, "height": height}
+        if reference_images:
+            kwargs["reference_images"] = reference_images
+        return await self._call("generate_image", prompt, **kwargs)
+
+class ChainedVideoProvider(ProviderChain, VideoGenerationProvider):
+    kind = "video"
+    placeholder = "assets/placeholders/veo_generated_clip.mp4"
+
+    async def generate_clip(self, prompt: str, image_url: Optional[str] = None, duration_seconds: Optional[int] = None) -> str:
+        kwargs = {"image_url": image_url}
+        if duration_seconds is not None:
+            kwargs["duration_seconds"] = duration_seconds
+        return await self._call("generate_clip", prompt, **kwargs)
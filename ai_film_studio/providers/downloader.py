@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from typing import Dict, Optional
+import httpx
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.events import emit
+from ai_film_studio.core.metrics import DOWNLOAD_BYTES, DOWNLOAD_DURATION
+from ai_film_studio.core.tracing import span
+
+class DownloadError(Exception):
+    """Raised when a remote artifact could not be fetched after all attempts."""
+    pass
+
+class Downloader:
+    """Shared, connection-pooled downloader for provider outputs.
+
+    Bodies are streamed chunk by chunk into `<dest>.part` and renamed into place once complete,
+    so readers never see a half-written file and large clips never sit in memory. An interrupted
+    transfer is resumed with an HTTP Range request on the next attempt.
+    """
+    def __init__(self, max_concurrent: Optional[int] = None):
+        self.max_concurrent = max_concurrent or settings.MAX_CONCURRENT_DOWNLOADS
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._dest_locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        # httpx clients and asyncio primitives belong to one event loop; scripts that call
+        # asyncio.run() repeatedly get a fresh pool per loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._client is None or self._client.is_closed:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrent,
+                    max_keepalive_connections=self.max_concurrent,
+                ),
+                timeout=httpx.Timeout(settings.DOWNLOAD_TIMEOUT_SECONDS, connect=30.0),
+                follow_redirects=True,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._dest_locks = {}
+
+    async def download(self, url: str, dest: str) -> str:
+        """Streams `url` to `dest` atomically and returns `dest`."""
+        self._bind_loop()
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+
+        # Two scenes can resolve to the same content-addressed path; only one may write the .part file
+        lock = self._dest_locks.setdefault(dest, asyncio.Lock())
+        async with lock:
+            if os.path.exists(dest) and os.path.getsize(dest) > 0:
+                return dest
+            async with self._semaphore:
+                last_error: Optional[Exception] = None
+                started_at = time.monotonic()
+                for attempt in range(1, settings.DOWNLOAD_MAX_ATTEMPTS + 1):
+                    try:
+                        with span("download", path=dest, attempt=attempt) as download_span:
+                            await self._stream_to_file(url, dest)
+                            download_span.attrs["bytes"] = size = os.path.getsize(dest)
+                        seconds = time.monotonic() - started_at
+                        DOWNLOAD_BYTES.inc(size)
+                        DOWNLOAD_DURATION.observe(seconds)
+                        await emit("download_done", path=dest, bytes=size, seconds=round(seconds, 3))
+                        return dest
+                    except (httpx.TransportError, DownloadError) as e:
+                        last_error = e
+                        print(f"Downloader: Attempt {attempt} failed for {url}: {e}", flush=True)
+                        await asyncio.sleep(min(2 ** attempt, 10))
+                raise DownloadError(f"Failed to download {url}: {last_error}")
+
+    async def _stream_to_file(self, url: str, dest: str):
+        part_path = dest + ".part"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        async with self._client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                # Range not satisfiable: the partial file is stale, start over
+                os.remove(part_path)
+                raise DownloadError("Stale partial download discarded")
+            if response.status_code not in (200, 206):
+                raise DownloadError(f"HTTP {response.status_code}")
+
+            # A 200 means the server ignored our Range header, so rewrite from the start
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(part_path, mode) as f:
+                async for chunk in response.aiter_bytes(settings.DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+        os.replace(part_path, dest)
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+downloader = Downloader()
+
+async def download_file(url: str, dest: str) -> str:
+    return await downloader.download(url, dest)
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import EmbeddingProvider
+from ai_film_studio.core.embedding_cache import EmbeddingCache
+
+class BatchingEmbeddingProvider(EmbeddingProvider):
+    """Merges concurrent embedding requests into batched provider calls.
+
+    Texts requested within EMBEDDING_BATCH_WINDOW_MS of each other (by any caller) are sent as one
+    `get_embeddings` call of up to EMBEDDING_BATCH_SIZE texts. Known texts are answered from the
+    persistent cache and duplicates in flight share a single slot in the batch.
+    """
+    def __init__(self, inner: EmbeddingProvider, cache: Optional[EmbeddingCache] = None,
+                 batch_size: Optional[int] = None, window_ms: Optional[float] = None):
+        self.inner = inner
+        self.cache = cache
+        self.model_name = getattr(inner, "model_name", "default")
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.window = (settings.EMBEDDING_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self._pending: Dict[str, asyncio.Future] = {} # Waiting for the next flush
+        self._in_flight: Dict[str, asyncio.Future] = {} # Sent to the provider, not answered yet
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set() # Strong references to in-flight batch tasks
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {"texts": 0, "cache_hits": 0, "batches": 0, "embedded": 0}
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Futures belong to one event loop; scripts that call asyncio.run() repeatedly start clean
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = {}
+            self._in_flight = {}
+            self._flush_handle = None
+            self._batches = set()
+        return loop
+
+    async def get_embedding(self, text: str) -> List[float]:
+        return (await self.get_embeddings([text]))[0]
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        loop = self._bind_loop()
+        self._stats["texts"] += len(texts)
+        known = self.cache.get_many(self.model_name, texts) if self.cache else {}
+        self._stats["cache_hits"] += sum(1 for t in texts if t in known)
+
+        waiting: Dict[str, asyncio.Future] = {}
+        for text in texts:
+            if text in known or text in waiting:
+                continue
+            future = self._pending.get(text) or self._in_flight.get(text)
+            if future is None:
+                future = loop.create_future()
+                self._pending[text] = future
+            waiting[text] = future
+
+        if waiting:
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            # Shielded: a cancelled caller must not cancel a future other callers share
+            results = await asyncio.gather(*[asyncio.shield(f) for f in waiting.values()])
+            known.update(zip(waiting.keys(), results))
+        return [known[text] for text in texts]
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = list(self._pending.items()), {}
+        self._in_flight.update(batch)
+        for i in range(0, len(batch), self.batch_size):
+            task = asyncio.ensure_future(self._embed_batch(batch[i:i + self.batch_size]))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _embed_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in batch]
+        self._stats["batches"] += 1
+        self._stats["embedded"] += len(texts)
+        try:
+            vectors = await self.inner.get_embeddings(texts)
+            if len(vectors) != len(texts):
+                # Which text each vector belongs to is unknown, so none can be handed out or cached
+                raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(texts)} texts")
+        except Exception as e:
+            for text, future in batch:
+                self._in_flight.pop(text, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if self.cache:
+            # All-zero vectors are the provider's failure placeholder and must not be persisted
+            self.cache.put_many(self.model_name, {t: v for t, v in zip(texts, vectors) if any(v)})
+        for (text, future), vector in zip(batch, vectors):
+            self._in_flight.pop(text, None)
+            if not future.done():
+                future.set_result(vector)
+
+    async def health_check(self) -> bool:
+        check = getattr(self.inner, "health_check", None)
+        return await check() if check else True
+
+    async def aclose(self):
+        close = getattr(self.inner, "aclose", None)
+        if close:
+            await close()
+
+    def stats(self) -> Dict[str, int]:
+        """Texts requested, cache hits, provider batches and texts embedded for this process."""
+        return dict(self._stats)
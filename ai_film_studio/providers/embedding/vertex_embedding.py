@@ -3,6 +3,7 @@ from google import genai
 from google.genai import types
 from ai_film_studio.core.interfaces import EmbeddingProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
 
 class VertexEmbeddingProvider(EmbeddingProvider):
     def __init__(self, model_name: str = "text-embedding-004"):
@@ -12,6 +13,15 @@ class VertexEmbeddingProvider(EmbeddingProvider):
         
         self.client = genai.Client()
 
+    async def health_check(self) -> bool:
+        await self.client.aio.models.get(model=self.model_name)
+        return True
+
+    async def aclose(self):
+        close = getattr(self.client.aio, "aclose", None)
+        if close:
+            await close()
+
     async def get_embedding(self, text: str) -> List[float]:
         try:
             # The genai SDK supports embeddings via models.embed_content
@@ -24,6 +34,26 @@ class VertexEmbeddingProvider(EmbeddingProvider):
             # Each embedding has a values list
             return response.embeddings[0].values
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Embedding Error: {e}")
             # Return dummy embedding if generation fails to prevent total crashing in MVP
             return [0.0] * 768
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """One embed_content request per EMBEDDING_BATCH_SIZE texts instead of one per text."""
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), settings.EMBEDDING_BATCH_SIZE):
+            chunk = texts[i:i + settings.EMBEDDING_BATCH_SIZE]
+            try:
+                response = await self.client.aio.models.embed_content(
+                    model=self.model_name,
+                    contents=chunk
+                )
+                vectors.extend(e.values for e in response.embeddings)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    raise # Let the scheduler back off and retry
+                print(f"Embedding Batch Error: {e}")
+                vectors.extend([0.0] * 768 for _ in chunk)
+        return vectors
@@ -0,0 +1,37 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from ai_film_studio.config.settings import settings
+
+# The vendor SDKs we use (replicate, vertexai, elevenlabs, google-cloud-texttospeech) are synchronous.
+# Calling them directly inside `async def` blocks the event loop, so every provider hands its SDK
+# calls to a dedicated thread pool. Pools are per provider so a slow video backend cannot starve TTS.
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+def get_executor(provider: str) -> ThreadPoolExecutor:
+    with _lock:
+        executor = _executors.get(provider)
+        if executor is None:
+            workers = settings.PROVIDER_EXECUTOR_WORKERS.get(provider, settings.DEFAULT_EXECUTOR_WORKERS)
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"provider-{provider}")
+            _executors[provider] = executor
+        return executor
+
+async def run_blocking(provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs a blocking SDK call on the provider's executor and awaits the result."""
+    loop = asyncio.get_running_loop()
+    # Carry contextvars across the thread hop, like asyncio.to_thread does
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(provider), call)
+
+def shutdown_executors(wait: bool = True):
+    with _lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        _executors.clear()
@@ -1,50 +1,98 @@
+from typing import Any, Callable, Optional
 from ai_film_studio.config.settings import settings
 from ai_film_studio.core.interfaces import LLMProvider, ImageGenerationProvider, VideoGenerationProvider, AudioProvider, EmbeddingProvider
 
-# Import Concrete Implementations
-from ai_film_studio.providers.llm.gemini import GeminiProvider
-from ai_film_studio.providers.image.replicate_image import ReplicateImageProvider
-from ai_film_studio.providers.video.replicate_video import ReplicateVideoProvider
-from ai_film_studio.providers.audio.elevenlabs import ElevenLabsProvider
-from ai_film_studio.providers.embedding.vertex_embedding import VertexEmbeddingProvider
+# Concrete implementations are resolved through the registry on first use,
+# so importing the factory does not load any provider SDK.
+from ai_film_studio.providers.registry import provider_registry
+from ai_film_studio.providers.pool import provider_pool
+from ai_film_studio.providers.embedding.batching import BatchingEmbeddingProvider
+from ai_film_studio.core.embedding_cache import embedding_cache
+from ai_film_studio.providers.llm.caching import CachingLLMProvider
+from ai_film_studio.core.llm_cache import llm_cache
+from ai_film_studio.providers.chain import ChainedImageProvider, ChainedVideoProvider
+from ai_film_studio.providers.scheduler import (
+    ScheduledLLMProvider, ScheduledImageProvider, ScheduledVideoProvider, ScheduledAudioProvider, ScheduledEmbeddingProvider
+)
+
+def _model_from_setting(name: str, setting: str) -> Optional[str]:
+    """Whatever follows "<name>-" in the setting is the model, e.g. "replicate-flux-pro" -> "flux-pro"."""
+    return setting[len(name) + 1:] if setting.startswith(f"{name}-") else None
+
+def _pooled(kind: str, name: str, model: Optional[str], wrap: Callable[[Any, str], Any]):
+    """Returns the warm pooled instance for (kind, name, model), building it on first use."""
+    def build():
+        provider_class = provider_registry.resolve(kind, name)
+        return wrap(provider_class(model_name=model) if model else provider_class(), name)
+    return provider_pool.get_or_create(kind, name, model, build)
+
+def _wrap_llm(inner: LLMProvider, name: str) -> LLMProvider:
+    return CachingLLMProvider(ScheduledLLMProvider(inner, name), cache=llm_cache)
+
+def _wrap_embedding(inner: EmbeddingProvider, name: str) -> EmbeddingProvider:
+    # Cache and micro-batching sit outside the scheduler, so only real misses consume rate limit
+    return BatchingEmbeddingProvider(ScheduledEmbeddingProvider(inner, name), cache=embedding_cache)
+
+def _with_fallback(kind: str, primary: Any, fallback_setting: str, wrap: Callable[[Any, str], Any], chain: Callable[[list], Any]):
+    """Chains the primary with the provider named by a FALLBACK_* setting (see providers/chain.py)."""
+    name = provider_registry.match(kind, fallback_setting)
+    if not settings.ENABLE_PROVIDER_CHAINS or not name:
+        return primary
+    fallback = _pooled(kind, name, _model_from_setting(name, fallback_setting), wrap)
+    if (fallback.provider_name, fallback.model_name) == (primary.provider_name, primary.model_name):
+        return primary
+    return chain([primary, fallback])
 
 class ProviderFactory:
     @staticmethod
     def get_llm() -> LLMProvider:
-        if "gemini" in settings.LLM_PROVIDER:
+        name = provider_registry.match("llm", settings.LLM_PROVIDER)
+        if name == "gemini":
             # Dynamic Model Selection based on SPEED_MODE
             model = "gemini-2.5-flash" if settings.SPEED_MODE else "gemini-2.5-pro"
             print(f"Factory: Initializing LLM with {model} (Speed Mode: {settings.SPEED_MODE})")
-            return GeminiProvider(model_name=model)
+            return _pooled("llm", name, model, _wrap_llm)
+        if name:
+            return _pooled("llm", name, _model_from_setting(name, settings.LLM_PROVIDER), _wrap_llm)
         raise ValueError(f"Unknown LLM Provider: {settings.LLM_PROVIDER}")
 
     @staticmethod
     def get_image_gen() -> ImageGenerationProvider:
         if settings.SPEED_MODE or "schnell" in settings.IMAGE_PROVIDER:
              print("Factory: Using FLUX Schnell (Fast Drafts) for Speed.")
-             return ReplicateImageProvider(model_name=settings.FALLBACK_IMAGE_PROVIDER)
-        
-        if "replicate" in settings.IMAGE_PROVIDER:
-            return ReplicateImageProvider(model_name=settings.IMAGE_PROVIDER.replace("replicate-", ""))
-        
+             return _pooled("image", "replicate", _model_from_setting("replicate", settings.FALLBACK_IMAGE_PROVIDER), ScheduledImageProvider)
+
+        name = provider_registry.match("image", settings.IMAGE_PROVIDER)
+        if name:
+            primary = _pooled("image", name, _model_from_setting(name, settings.IMAGE_PROVIDER), ScheduledImageProvider)
+            return _with_fallback("image", primary, settings.FALLBACK_IMAGE_PROVIDER, ScheduledImageProvider, ChainedImageProvider)
+
         print("Factory: Unknown Image Provider. Falling back to FLUX.2 Pro.")
-        return ReplicateImageProvider()
+        return _pooled("image", "replicate", None, ScheduledImageProvider)
 
     @staticmethod
     def get_video_gen() -> VideoGenerationProvider:
         if settings.SPEED_MODE or "wan" in settings.VIDEO_PROVIDER:
              print("Factory: Using Wan 2.2 for Speed/Cost.")
-             return ReplicateVideoProvider(model_name=settings.FALLBACK_VIDEO_PROVIDER.replace("replicate-", ""))
-             
-        if "replicate" in settings.VIDEO_PROVIDER:
-            return ReplicateVideoProvider(model_name=settings.VIDEO_PROVIDER.replace("replicate-", ""))
-            
+             return _pooled("video", "replicate", _model_from_setting("replicate", settings.FALLBACK_VIDEO_PROVIDER), ScheduledVideoProvider)
+
+        name = provider_registry.match("video", settings.VIDEO_PROVIDER)
+        if name:
+            primary = _pooled("video", name, _model_from_setting(name, settings.VIDEO_PROVIDER), ScheduledVideoProvider)
+            return _with_fallback("video", primary, settings.FALLBACK_VIDEO_PROVIDER, ScheduledVideoProvider, ChainedVideoProvider)
+
         raise ValueError(f"Unknown Video Provider: {settings.VIDEO_PROVIDER}")
 
     @staticmethod
     def get_audio() -> AudioProvider:
-        return ElevenLabsProvider()
+        name = provider_registry.match("audio", settings.AUDIO_PROVIDER)
+        if not name:
+            raise ValueError(f"Unknown Audio Provider: {settings.AUDIO_PROVIDER}")
+        return _pooled("audio", name, _model_from_setting(name, settings.AUDIO_PROVIDER), ScheduledAudioProvider)
 
     @staticmethod
     def get_embedding() -> EmbeddingProvider:
-        return VertexEmbeddingProvider()
+        name = provider_registry.match("embedding", settings.EMBEDDING_PROVIDER)
+        if not name:
+            raise ValueError(f"Unknown Embedding Provider: {settings.EMBEDDING_PROVIDER}")
+        return _pooled("embedding", name, _model_from_setting(name, settings.EMBEDDING_PROVIDER), _wrap_embedding)
@@ -2,11 +2,15 @@ import json
 import vertexai
 from ai_film_studio.core.interfaces import ImageGenerationProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.providers.executor import run_blocking
 # Use the Vertex AI Image Generation SDK (e.g. ImageGenerationModel)
 from vertexai.preview.vision_models import ImageGenerationModel
 
 class ImagenProvider(ImageGenerationProvider):
     def __init__(self, model_name: str = "imagegeneration@006"): # Check correct model ID for Imagen 3
+        self.model_name = model_name
         # Initialize Vertex AI
         project_id = None
         if settings.GOOGLE_APPLICATION_CREDENTIALS:
@@ -23,7 +27,15 @@ class ImagenProvider(ImageGenerationProvider):
     async def generate_image(self, prompt: str, negative_prompt: str = "", width: int = 1024, height: int = 1024) -> str:
         # Generate image
         try:
-            response = self.model.generate_images(
+            cache_key = artifact_cache.make_key("imagen", self.model_name, prompt=prompt, aspect_ratio="1:1")
+            cached_path = artifact_cache.lookup("imagen", cache_key)
+            if cached_path:
+                print(f"Imagen: Cache hit for {cache_key[:12]}", flush=True)
+                return cached_path
+
+            response = await run_blocking(
+                "imagen",
+                self.model.generate_images,
                 prompt=prompt,
                 number_of_images=1,
                 aspect_ratio="1:1"
@@ -34,12 +46,13 @@ class ImagenProvider(ImageGenerationProvider):
                 return "assets/placeholders/no_image_generated.png"
             
             # Save locally
-            import os
-            os.makedirs("assets/generated_images", exist_ok=True)
-            output_path = f"assets/generated_images/{hash(prompt)}.png"
-            response.images[0].save(location=output_path, include_generation_parameters=False)
+            output_path = artifact_cache.path_for("images", cache_key, "png")
+            await run_blocking("imagen", response.images[0].save, location=output_path, include_generation_parameters=False)
+            artifact_cache.store("imagen", cache_key, output_path)
             return output_path
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Imagen Error: {e}", flush=True)
             return "assets/placeholders/no_image_generated.png"
 
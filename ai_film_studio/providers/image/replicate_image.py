@@ -1,9 +1,12 @@
 import os
 import replicate
-import requests
 from typing import Optional, List
 from ai_film_studio.core.interfaces import ImageGenerationProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.providers.downloader import download_file, DownloadError
+from ai_film_studio.providers.executor import run_blocking
 
 class ReplicateImageProvider(ImageGenerationProvider):
     def __init__(self, model_name: str = "black-forest-labs/flux-2-pro"):
@@ -13,6 +16,15 @@ class ReplicateImageProvider(ImageGenerationProvider):
 
     async def generate_image(self, prompt: str, negative_prompt: str = "", width: int = 1024, height: int = 1024, reference_images: Optional[List[str]] = None) -> str:
         try:
+            cache_key = artifact_cache.make_key(
+                "replicate-image", self.model_name,
+                prompt=prompt, width=width, height=height, reference_images=(reference_images or [])[:8]
+            )
+            cached_path = artifact_cache.lookup("replicate-image", cache_key)
+            if cached_path:
+                print(f"Replicate Image: Cache hit for {cache_key[:12]}", flush=True)
+                return cached_path
+
             input_args = {
                 "prompt": prompt,
                 "width": width,
@@ -28,7 +40,9 @@ class ReplicateImageProvider(ImageGenerationProvider):
                     input_args[f"image_prompt_{i+1}"] = ref_url
                     
             print(f"Replicate Image: Requesting model {self.model_name} with prompt: {prompt}", flush=True)
-            output = replicate.run(
+            output = await run_blocking(
+                "replicate",
+                replicate.run,
                 self.model_name,
                 input=input_args
             )
@@ -45,18 +59,18 @@ class ReplicateImageProvider(ImageGenerationProvider):
                   return "assets/placeholders/no_image_generated.png"
                   
             # Save locally
-            os.makedirs("assets/generated_images", exist_ok=True)
-            output_path = f"assets/generated_images/{hash(prompt)}.webp"
+            output_path = artifact_cache.path_for("images", cache_key, "webp")
             
-            response = requests.get(image_url)
-            if response.status_code == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                return output_path
-            else:
-                 print(f"Replicate Image Error: Failed to download image from {image_url}")
-                 return "assets/placeholders/no_image_generated.png"
+            try:
+                await download_file(image_url, output_path)
+            except DownloadError as e:
+                print(f"Replicate Image Error: {e}", flush=True)
+                return "assets/placeholders/no_image_generated.png"
+            artifact_cache.store("replicate-image", cache_key, output_path)
+            return output_path
 
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Replicate Image Error: {e}", flush=True)
             return "assets/placeholders/no_image_generated.png"
@@ -0,0 +1,87 @@
+from typing import Any, AsyncIterator, Dict, Optional, Type
+from pydantic import BaseModel
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider
+from ai_film_studio.core.llm_cache import LLMCache, cache_bypassed
+
+class CachingLLMProvider(LLMProvider):
+    """Answers repeated LLM calls from the LLM cache instead of the model.
+
+    JSON calls always run at a fixed low temperature and are cached. Free-text calls are cached only
+    up to LLM_CACHE_MAX_TEMPERATURE, so creative sampling still gives a new draft every time.
+    Error results are never stored.
+    """
+    def __init__(self, inner: LLMProvider, cache: Optional[LLMCache] = None):
+        self.inner = inner
+        self.cache = cache
+        self.model_name = getattr(inner, "model_name", "default")
+        self._model_key = f"{getattr(inner, 'provider_name', type(inner).__name__)}:{self.model_name}"
+
+    def _lookup(self, key: Optional[str]) -> Optional[Any]:
+        if key is None or cache_bypassed():
+            return None
+        return self.cache.get(key)
+
+    def _text_key(self, system_prompt: str, user_prompt: str, temperature: float) -> Optional[str]:
+        if not self.cache or temperature > settings.LLM_CACHE_MAX_TEMPERATURE:
+            return None
+        return self.cache.make_key(self._model_key, "text", system_prompt, user_prompt, temperature)
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+        key = self._text_key(system_prompt, user_prompt, temperature)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        text = await self.inner.generate_text(system_prompt, user_prompt, temperature)
+        # Providers report failures in-band as "Error: ..." text
+        if key and text and not text.startswith("Error:"):
+            self.cache.put(key, self._model_key, text)
+        return text
+
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        # Shares cache entries with generate_text: a cached screenplay is replayed as a single piece
+        key = self._text_key(system_prompt, user_prompt, temperature)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        pieces = []
+        async for piece in self.inner.stream_text(system_prompt, user_prompt, temperature):
+            pieces.append(piece)
+            yield piece
+        if key and pieces:
+            self.cache.put(key, self._model_key, "".join(pieces))
+
+    async def generate_json(self, system_prompt: str, user_prompt: str, schema: Any) -> Dict:
+        # Every provider runs the JSON path at the same fixed low temperature, so it is not part of the key
+        key = self.cache.make_key(self._model_key, "json", system_prompt, user_prompt, 0.0, schema) if self.cache else None
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = await self.inner.generate_json(system_prompt, user_prompt, schema)
+        if key and isinstance(result, dict) and "errors" not in result:
+            self.cache.put(key, self._model_key, result)
+        return result
+
+    async def generate_structured(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Dict:
+        schema = response_model.model_json_schema()
+        key = self.cache.make_key(self._model_key, "structured", system_prompt, user_prompt, 0.0, schema) if self.cache else None
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = await self.inner.generate_structured(system_prompt, user_prompt, response_model)
+        if key and isinstance(result, dict) and "errors" not in result:
+            self.cache.put(key, self._model_key, result)
+        return result
+
+    async def health_check(self) -> bool:
+        check = getattr(self.inner, "health_check", None)
+        return await check() if check else True
+
+    async def aclose(self):
+        close = getattr(self.inner, "aclose", None)
+        if close:
+            await close()
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats() if self.cache else {}
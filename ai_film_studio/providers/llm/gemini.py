@@ -1,9 +1,12 @@
 import json
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Type
+from pydantic import BaseModel
 from google import genai
 from google.genai import types
 from ai_film_studio.core.interfaces import LLMProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
+from ai_film_studio.providers.usage import token_usage
 
 class GeminiProvider(LLMProvider):
     def __init__(self, model_name: str = "gemini-2.5-pro"):
@@ -15,6 +18,22 @@ class GeminiProvider(LLMProvider):
         # Initialize the client
         self.client = genai.Client()
 
+    def _record_usage(self, response: Any):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            token_usage.record("gemini", self.model_name, usage.prompt_token_count or 0, usage.candidates_token_count or 0)
+
+    async def health_check(self) -> bool:
+        # Cheap metadata call: verifies credentials and that the model exists
+        await self.client.aio.models.get(model=self.model_name)
+        return True
+
+    async def aclose(self):
+        # Older SDK versions have no explicit close; their connections are released on GC
+        close = getattr(self.client.aio, "aclose", None)
+        if close:
+            await close()
+
     async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
         try:
             # We can use system instruction with google-genai
@@ -29,11 +48,57 @@ class GeminiProvider(LLMProvider):
                 contents=user_prompt,
                 config=config
             )
+            self._record_usage(response)
             return response.text
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Gemini Error (generate_text): {e}")
             return f"Error: {e}"
 
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        config = types.GenerateContentConfig(
+            temperature=temperature,
+            system_instruction=system_prompt,
+        )
+        # Unlike generate_text, errors propagate: part of the text may already have been consumed
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=user_prompt,
+            config=config
+        )
+        last = None
+        async for chunk in stream:
+            last = chunk
+            if chunk.text:
+                yield chunk.text
+        # Only the final chunk carries the totals for the whole response
+        if last is not None:
+            self._record_usage(last)
+
+    async def generate_structured(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> Dict:
+        try:
+            # Native structured output: decoding is constrained to the model's JSON schema
+            config = types.GenerateContentConfig(
+                temperature=0.2,
+                system_instruction=system_prompt,
+                response_mime_type="application/json",
+                response_schema=response_model,
+            )
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=user_prompt,
+                config=config
+            )
+            self._record_usage(response)
+            # Validation is left to the caller so a single bad item does not discard the rest
+            return json.loads(response.text)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
+            print(f"Gemini Error (generate_structured): {e}")
+            return {"errors": [str(e)]}
+
     async def generate_json(self, system_prompt: str, user_prompt: str, schema: Any) -> Dict:
         try:
             # Tell Gemini to output JSON
@@ -48,11 +113,14 @@ class GeminiProvider(LLMProvider):
                 contents=user_prompt,
                 config=config
             )
+            self._record_usage(response)
             
             try:
                 return json.loads(response.text)
             except json.JSONDecodeError:
                 raise ValueError(f"Failed to parse JSON from model response: {response.text}")
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Gemini Error (generate_json): {e}")
             return {"errors": [str(e)]}
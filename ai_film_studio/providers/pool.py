@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ai_film_studio.config.settings import settings
+
+PoolKey = Tuple[str, str, str] # (kind, provider, model)
+
+class ProviderPool:
+    """Process-wide cache of provider instances keyed by (kind, provider, model).
+
+    SDK clients (genai.Client, ElevenLabs, Vertex models) keep their connection pools and
+    loaded model metadata between nodes and jobs instead of being rebuilt by every agent call.
+    Providers that fail a health check are dropped and rebuilt on next use. Agents may still hold
+    a dropped instance mid-call, so it is only closed PROVIDER_RETIRE_GRACE_SECONDS later (or at
+    shutdown), never under a running call.
+    """
+    def __init__(self):
+        self._providers: Dict[PoolKey, Any] = {}
+        self._created_at: Dict[PoolKey, float] = {}
+        self._retired: List[Tuple[Any, float]] = [] # (evicted instance, evicted at)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        # Async SDK clients belong to the event loop they first ran on; a new loop gets fresh instances
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is not loop:
+            if self._loop is not None:
+                self._providers.clear()
+                self._created_at.clear()
+            self._loop = loop
+
+    def get_or_create(self, kind: str, provider: str, model: Optional[str], build: Callable[[], Any]) -> Any:
+        if not settings.ENABLE_PROVIDER_POOL:
+            return build()
+        key = (kind, provider, model or "default")
+        with self._lock:
+            self._bind_loop()
+            instance = self._providers.get(key)
+            if instance is None:
+                instance = build()
+                self._providers[key] = instance
+                self._created_at[key] = time.time()
+                print(f"Provider Pool: Created {kind} provider {provider} ({key[2]})", flush=True)
+            return instance
+
+    async def check_health(self, evict: bool = True) -> Dict[str, bool]:
+        """Runs every pooled provider's health_check() (if it has one). With `evict`, failures are
+        dropped from the pool so the next caller gets a fresh instance; callers already holding
+        one finish with it (see close_retired())."""
+        with self._lock:
+            entries = list(self._providers.items())
+        results: Dict[str, bool] = {}
+        for key, instance in entries:
+            check = getattr(instance, "health_check", None)
+            try:
+                healthy = bool(await asyncio.wait_for(check(), settings.PROVIDER_HEALTH_CHECK_TIMEOUT_SECONDS)) if check else True
+            except Exception as e:
+                print(f"Provider Pool: Health check failed for {'/'.join(key)}: {e}", flush=True)
+                healthy = False
+            results["/".join(key)] = healthy
+            if not healthy and evict:
+                with self._lock:
+                    if self._providers.get(key) is instance:
+                        del self._providers[key]
+                        self._created_at.pop(key, None)
+                        self._retired.append((instance, time.monotonic()))
+        return results
+
+    async def close_retired(self, grace: Optional[float] = None):
+        """Closes evicted instances once they have been out of the pool for `grace` seconds."""
+        grace = settings.PROVIDER_RETIRE_GRACE_SECONDS if grace is None else grace
+        cutoff = time.monotonic() - grace
+        with self._lock:
+            expired = [instance for instance, retired_at in self._retired if retired_at <= cutoff]
+            self._retired = [(instance, retired_at) for instance, retired_at in self._retired if retired_at > cutoff]
+        for instance in expired:
+            await _close(instance)
+
+    async def health_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_health()
+            await self.close_retired()
+
+    def stats(self) -> Dict[str, float]:
+        """Age in seconds of every pooled provider."""
+        now = time.time()
+        with self._lock:
+            return {"/".join(key): now - created for key, created in self._created_at.items()}
+
+    async def shutdown(self):
+        with self._lock:
+            instances = list(self._providers.values())
+            self._providers.clear()
+            self._created_at.clear()
+        for instance in instances:
+            await _close(instance)
+        await self.close_retired(grace=0)
+
+async def _close(instance: Any):
+    close = getattr(instance, "aclose", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception as e:
+        print(f"Provider Pool: Error closing {type(instance).__name__}: {e}", flush=True)
+
+provider_pool = ProviderPool()
+
+async def shutdown_providers():
+    """Closes pooled providers, the shared downloader and the provider thread pools.
+    Call once when the API or a worker process stops."""
+    from ai_film_studio.providers.downloader import downloader
+    from ai_film_studio.providers.executor import shutdown_executors
+
+    await provider_pool.shutdown()
+    await downloader.aclose()
+    shutdown_executors(wait=False)
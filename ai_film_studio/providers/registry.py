@@ -0,0 +1,89 @@
+import importlib
+import threading
+from typing import Dict, List, Optional, Tuple, Type, Union
+
+# Provider classes by kind and name, as "module:Class" so nothing is imported until a provider is used.
+# A deployment that only talks to Gemini and Replicate never loads the ElevenLabs or Vertex SDKs.
+_BUILTIN_PROVIDERS: Dict[str, Dict[str, str]] = {
+    "llm": {
+        "gemini": "ai_film_studio.providers.llm.gemini:GeminiProvider",
+    },
+    "image": {
+        "replicate": "ai_film_studio.providers.image.replicate_image:ReplicateImageProvider",
+        "imagen": "ai_film_studio.providers.image.imagen:ImagenProvider",
+    },
+    "video": {
+        "replicate": "ai_film_studio.providers.video.replicate_video:ReplicateVideoProvider",
+        "veo": "ai_film_studio.providers.video.veo:VeoProvider",
+    },
+    "audio": {
+        "elevenlabs": "ai_film_studio.providers.audio.elevenlabs:ElevenLabsProvider",
+        "google-tts": "ai_film_studio.providers.audio.google_tts:GoogleTTSProvider",
+    },
+    "embedding": {
+        "vertex-embedding": "ai_film_studio.providers.embedding.vertex_embedding:VertexEmbeddingProvider",
+    },
+}
+
+# Third-party packages can add providers without touching this repo, e.g. in their pyproject.toml:
+#   [project.entry-points."ai_film_studio.providers"]
+#   "image.my-diffusion" = "my_package.providers:MyDiffusionProvider"
+ENTRY_POINT_GROUP = "ai_film_studio.providers"
+
+class ProviderRegistry:
+    """Resolves provider classes by (kind, name) and imports each one only on first use."""
+    def __init__(self):
+        self._targets: Dict[str, Dict[str, Union[str, type]]] = {kind: dict(names) for kind, names in _BUILTIN_PROVIDERS.items()}
+        self._resolved: Dict[Tuple[str, str], type] = {}
+        self._plugins_loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, name: str, target: Union[str, type]):
+        """Adds or replaces a provider. `target` is a class or a lazy "module:Class" path."""
+        with self._lock:
+            self._targets.setdefault(kind, {})[name] = target
+            self._resolved.pop((kind, name), None)
+
+    def _load_plugins(self):
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            kind, _, name = entry_point.name.partition(".")
+            if not name:
+                print(f"Registry Warning: Ignoring provider plugin '{entry_point.name}' (expected 'kind.name')", flush=True)
+                continue
+            # Built-ins win over plugins with the same name; explicit register() calls win over both
+            self._targets.setdefault(kind, {}).setdefault(name, entry_point.value)
+
+    def names(self, kind: str) -> List[str]:
+        with self._lock:
+            self._load_plugins()
+            return list(self._targets.get(kind, {}))
+
+    def resolve(self, kind: str, name: str) -> type:
+        with self._lock:
+            self._load_plugins()
+            cached = self._resolved.get((kind, name))
+            if cached is not None:
+                return cached
+            target = self._targets.get(kind, {}).get(name)
+            if target is None:
+                raise ValueError(f"Unknown {kind} provider '{name}'. Registered: {list(self._targets.get(kind, {}))}")
+            if isinstance(target, str):
+                module_name, _, attr = target.partition(":")
+                target = getattr(importlib.import_module(module_name), attr)
+            self._resolved[(kind, name)] = target
+            return target
+
+    def match(self, kind: str, setting: str) -> Optional[str]:
+        """Finds the provider named in a setting value such as "replicate-flux-pro" or
+        "google-gemini-2.5-pro". The longest registered name contained in the value wins."""
+        candidates = [name for name in self.names(kind) if name in setting]
+        return max(candidates, key=len) if candidates else None
+
+provider_registry = ProviderRegistry()
+
+def register_provider(kind: str, name: str, target: Union[str, Type]):
+    provider_registry.register(kind, name, target)
@@ -0,0 +1,312 @@
+import asyncio
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider, ImageGenerationProvider, VideoGenerationProvider, AudioProvider, EmbeddingProvider
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.core.cost_ledger import charge
+from ai_film_studio.core.metrics import registry, PROVIDER_LATENCY, PROVIDER_QUEUE_WAIT, PROVIDER_RETRIES, PROVIDER_IN_FLIGHT, PROVIDER_WAITING
+from ai_film_studio.core.tracing import span
+from ai_film_studio.providers.usage import token_usage
+
+class RateLimitError(Exception):
+    """Raised when a provider is still throttling us after all retries."""
+    pass
+
+_RATE_LIMIT_MARKERS = ("rate limit", "ratelimit", "too many requests", "resource_exhausted", "quota exceeded")
+# A bare "429" also turns up in ids, sizes and durations; only count it as a status
+# ("429 Too Many Requests", "status_code: 429", "HTTP Error 429", "Error code: 429")
+_RATE_LIMIT_STATUS = re.compile(r"(?:^|\b(?:status|code|http|error)\w*\W{1,3})429\b")
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Best-effort classification across SDKs (replicate, google-genai, elevenlabs, google-cloud)."""
+    if isinstance(error, RateLimitError):
+        return True
+    for attr in ("status_code", "status", "code"):
+        if getattr(error, attr, None) == 429:
+            return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS) or bool(_RATE_LIMIT_STATUS.search(message))
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class _ProviderLane:
+    """Rate limit, concurrency cap and counters for one (provider, model)."""
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        key = f"{provider}:{model}"
+        rate = settings.PROVIDER_RATE_LIMITS.get(key, settings.PROVIDER_RATE_LIMITS.get(provider))
+        burst = settings.PROVIDER_BURST.get(key, settings.PROVIDER_BURST.get(provider, max(1, int(rate or 1))))
+        concurrency = settings.PROVIDER_CONCURRENCY.get(key, settings.PROVIDER_CONCURRENCY.get(provider, settings.MAX_PARALLEL_JOBS))
+
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {
+            "calls": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "waiting": 0,
+            "in_flight": 0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+        }
+
+class ProviderScheduler:
+    """Shared admission layer in front of every provider built by ProviderFactory.
+
+    Each call waits for a rate-limit token and a concurrency slot on its (provider, model) lane,
+    and is retried with jittered exponential backoff when the backend answers with a rate-limit error.
+    """
+    def __init__(self):
+        self._lanes: Dict[str, _ProviderLane] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._observers: List[Callable[[str, str, str, float], None]] = []
+
+    def _lane(self, provider: str, model: str) -> _ProviderLane:
+        # asyncio primitives are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._lanes = {}
+        key = f"{provider}:{model}"
+        if key not in self._lanes:
+            self._lanes[key] = _ProviderLane(provider, model)
+        return self._lanes[key]
+
+    def add_observer(self, callback: Callable[[str, str, str, float], None]):
+        """Registers callback(provider, model, event, value) for 'queue_wait', 'latency' and 'retry' events."""
+        self._observers.append(callback)
+
+    def _notify(self, provider: str, model: str, event: str, value: float):
+        for callback in self._observers:
+            try:
+                callback(provider, model, event, value)
+            except Exception as e:
+                print(f"Scheduler Observer Error: {e}", flush=True)
+
+    async def call(self, provider: str, model: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # One span per logical call, covering admission waits and retries
+        with span(f"provider:{provider}", model=model, queue_wait_seconds=0.0, retries=0) as call_span:
+            return await self._call(provider, model, fn, call_span.attrs)
+
+    async def _call(self, provider: str, model: str, fn: Callable[[], Awaitable[Any]], trace_attrs: Dict[str, Any]) -> Any:
+        lane = self._lane(provider, model)
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            lane.stats["waiting"] += 1
+            try:
+                if lane.bucket:
+                    await lane.bucket.acquire()
+                await lane.semaphore.acquire()
+            finally:
+                lane.stats["waiting"] -= 1
+
+            wait = time.monotonic() - queued_at
+            lane.stats["calls"] += 1
+            lane.stats["queue_wait_seconds_total"] += wait
+            lane.stats["queue_wait_seconds_max"] = max(lane.stats["queue_wait_seconds_max"], wait)
+            self._notify(provider, model, "queue_wait", wait)
+            trace_attrs["queue_wait_seconds"] += wait
+
+            lane.stats["in_flight"] += 1
+            started_at = time.monotonic()
+            try:
+                result = await fn()
+                self._notify(provider, model, "latency", time.monotonic() - started_at)
+                return result
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                lane.stats["rate_limited"] += 1
+                if not settings.AUTO_RETRY_ON_RATE_LIMIT or attempt >= settings.RATE_LIMIT_MAX_RETRIES:
+                    raise RateLimitError(f"{provider}:{model} still rate limited after {attempt} retries: {e}") from e
+            finally:
+                lane.stats["in_flight"] -= 1
+                lane.semaphore.release()
+
+            # Full jitter keeps a burst of throttled scenes from retrying in lockstep
+            ceiling = min(settings.RATE_LIMIT_BACKOFF_MAX_SECONDS, settings.RATE_LIMIT_BACKOFF_BASE_SECONDS * (2 ** attempt))
+            delay = random.uniform(0, ceiling)
+            attempt += 1
+            lane.stats["retries"] += 1
+            trace_attrs["retries"] = attempt
+            self._notify(provider, model, "retry", delay)
+            print(f"Scheduler: {provider}:{model} rate limited, retry {attempt} in {delay:.1f}s", flush=True)
+            await asyncio.sleep(delay)
+
+    async def stream(self, provider: str, model: str, open_stream: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Like call(), for streaming responses: the lane slot is held until the stream is exhausted.
+        A rate-limit error is only retried before the first item, so no consumer sees output twice."""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            emitted = False
+            try:
+                async for item in open_stream():
+                    emitted = True
+                    queue.put_nowait(item)
+            except Exception as e:
+                if emitted and is_rate_limit_error(e):
+                    raise RuntimeError(f"{provider}:{model} stream interrupted after partial output") from e
+                raise
+
+        task = asyncio.create_task(self.call(provider, model, pump))
+        getter: Optional[asyncio.Future] = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                    continue
+                while not queue.empty():
+                    yield queue.get_nowait()
+                task.result() # Re-raises whatever ended the stream
+                return
+        finally:
+            # The consumer may stop early; nothing should keep streaming in the background
+            for pending in (getter, task):
+                if pending is not None and not pending.done():
+                    pending.cancel()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        return {key: dict(lane.stats) for key, lane in self._lanes.items()}
+
+scheduler = ProviderScheduler()
+
+def _record_metrics(provider: str, model: str, event: str, value: float):
+    if event == "latency":
+        PROVIDER_LATENCY.observe(value, provider=provider, model=model)
+    elif event == "queue_wait":
+        PROVIDER_QUEUE_WAIT.observe(value, provider=provider, model=model)
+    elif event == "retry":
+        PROVIDER_RETRIES.inc(provider=provider, model=model)
+
+def _collect_lanes():
+    for lane in list(scheduler._lanes.values()):
+        PROVIDER_IN_FLIGHT.set(lane.stats["in_flight"], provider=lane.provider, model=lane.model)
+        PROVIDER_WAITING.set(lane.stats["waiting"], provider=lane.provider, model=lane.model)
+
+scheduler.add_observer(_record_metrics)
+registry.add_collector(_collect_lanes)
+
+def _model_of(provider: Any) -> str:
+    return getattr(provider, "model_name", "default")
+
+class _ScheduledProvider:
+    """Common wrapper state; lifecycle hooks used by the provider pool are forwarded to the inner provider."""
+    def __init__(self, inner: Any, provider_name: str):
+        self.inner = inner
+        self.provider_name = provider_name
+        self.model_name = _model_of(inner)
+
+    async def _billed(self, fn: Callable[[], Awaitable[str]], **units: float) -> str:
+        """Schedules a media call and charges the current job for it, unless the artifact came
+        from the cache or the provider gave up and returned a placeholder."""
+        with artifact_cache.track() as lookups:
+            path = await scheduler.call(self.provider_name, self.model_name, fn)
+        if not lookups["hits"] and "placeholders" not in str(path):
+            await charge(self.provider_name, self.model_name, **units)
+        return path
+
+    async def health_check(self) -> bool:
+        check = getattr(self.inner, "health_check", None)
+        return await check() if check else True
+
+    async def aclose(self):
+        close = getattr(self.inner, "aclose", None)
+        if close:
+            await close()
+
+class ScheduledLLMProvider(_ScheduledProvider, LLMProvider):
+    async def _metered(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Priced from the token counts the provider reports for the call
+        with token_usage.track() as usage:
+            result = await scheduler.call(self.provider_name, self.model_name, fn)
+        await self._charge_tokens(usage)
+        return result
+
+    async def _charge_tokens(self, usage: Dict[str, int]):
+        await charge(self.provider_name, self.model_name,
+                     input_mtokens=usage["prompt_tokens"] / 1e6, output_mtokens=usage["output_tokens"] / 1e6)
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+        return await self._metered(lambda: self.inner.generate_text(system_prompt, user_prompt, temperature))
+
+    async def generate_json(self, system_prompt: str, user_prompt: str, schema: Any) -> dict:
+        return await self._metered(lambda: self.inner.generate_json(system_prompt, user_prompt, schema))
+
+    async def generate_structured(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> dict:
+        return await self._metered(lambda: self.inner.generate_structured(system_prompt, user_prompt, response_model))
+
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        async def metered():
+            # Iterated by the scheduler's pump task, so the scope lives in that task's own context.
+            # Held across a yield to the consumer it would also cover every call the consumer makes
+            # while the stream is open (scene extraction), charging those tokens twice.
+            with token_usage.track() as usage:
+                try:
+                    async for piece in self.inner.stream_text(system_prompt, user_prompt, temperature):
+                        yield piece
+                finally:
+                    await self._charge_tokens(usage) # Partial output is billed too
+
+        async for piece in scheduler.stream(self.provider_name, self.model_name, metered):
+            yield piece
+
+class ScheduledImageProvider(_ScheduledProvider, ImageGenerationProvider):
+    async def generate_image(self, prompt: str, negative_prompt: str = "", width: int = 1024, height: int = 1024, reference_images: Optional[List[str]] = None) -> str:
+        kwargs = {"negative_prompt": negative_prompt, "width": width, "height": height}
+        if reference_images:
+            kwargs["reference_images"] = reference_images
+        return await self._billed(lambda: self.inner.generate_image(prompt, **kwargs), image=1)
+
+class ScheduledVideoProvider(_ScheduledProvider, VideoGenerationProvider):
+    async def generate_clip(self, prompt: str, image_url: Optional[str] = None, duration_seconds: Optional[int] = None) -> str:
+        # Only forward an explicit duration so each backend keeps its own default
+        kwargs = {"image_url": image_url}
+        if duration_seconds is not None:
+            kwargs["duration_seconds"] = duration_seconds
+        return await self._billed(lambda: self.inner.generate_clip(prompt, **kwargs), video=1)
+
+class ScheduledAudioProvider(_ScheduledProvider, AudioProvider):
+    async def generate_speech(self, text: str, voice_id: str) -> str:
+        return await self._billed(lambda: self.inner.generate_speech(text, voice_id), kchars=len(text) / 1000)
+
+class ScheduledEmbeddingProvider(_ScheduledProvider, EmbeddingProvider):
+    async def get_embedding(self, text: str) -> List[float]:
+        vector = await scheduler.call(self.provider_name, self.model_name, lambda: self.inner.get_embedding(text))
+        await charge(self.provider_name, self.model_name, kchars=len(text) / 1000)
+        return vector
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        # A whole batch costs one request against the lane's rate limit
+        vectors = await scheduler.call(self.provider_name, self.model_name, lambda: self.inner.get_embeddings(texts))
+        await charge(self.provider_name, self.model_name, kchars=sum(len(text) for text in texts) / 1000)
+        return vectors
@@ -0,0 +1,39 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+_scopes: contextvars.ContextVar[Tuple[Dict[str, int], ...]] = contextvars.ContextVar("token_usage_scopes", default=())
+
+def _empty() -> Dict[str, int]:
+    return {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+
+class TokenUsage:
+    """Token counters reported by LLM providers, per "provider:model" for the process and per
+    tracked block (see track())."""
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, prompt_tokens: int, output_tokens: int):
+        with self._lock:
+            for counters in (self._totals.setdefault(f"{provider}:{model}", _empty()), *_scopes.get()):
+                counters["calls"] += 1
+                counters["prompt_tokens"] += prompt_tokens or 0
+                counters["output_tokens"] += output_tokens or 0
+
+    @contextmanager
+    def track(self) -> Iterator[Dict[str, int]]:
+        """Counts the tokens of every call made inside the block, including tasks it spawns."""
+        counters = _empty()
+        token = _scopes.set(_scopes.get() + (counters,))
+        try:
+            yield counters
+        finally:
+            _scopes.reset(token)
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: dict(counters) for key, counters in self._totals.items()}
+
+token_usage = TokenUsage()
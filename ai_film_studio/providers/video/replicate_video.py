@@ -1,9 +1,12 @@
 import os
 import replicate
-import requests
 from typing import Optional
 from ai_film_studio.core.interfaces import VideoGenerationProvider
 from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.scheduler import is_rate_limit_error
+from ai_film_studio.core.artifact_cache import artifact_cache
+from ai_film_studio.providers.downloader import download_file, DownloadError
+from ai_film_studio.providers.executor import run_blocking
 
 class ReplicateVideoProvider(VideoGenerationProvider):
     def __init__(self, model_name: str = "minimax/hailuo-02"):
@@ -13,6 +16,15 @@ class ReplicateVideoProvider(VideoGenerationProvider):
 
     async def generate_clip(self, prompt: str, image_url: Optional[str] = None, duration_seconds: int = 5) -> str:
         try:
+            cache_key = artifact_cache.make_key(
+                "replicate-video", self.model_name,
+                prompt=prompt, image=image_url, duration_seconds=duration_seconds
+            )
+            cached_path = artifact_cache.lookup("replicate-video", cache_key)
+            if cached_path:
+                print(f"Replicate Video: Cache hit for {cache_key[:12]}", flush=True)
+                return cached_path
+
             input_args = {
                 "prompt": prompt
             }
@@ -28,7 +40,9 @@ class ReplicateVideoProvider(VideoGenerationProvider):
             # but we pass what we can or rely on default model behavior
                  
             print(f"Replicate Video: Requesting model {self.model_name} with prompt: {prompt}", flush=True)
-            output = replicate.run(
+            output = await run_blocking(
+                "replicate",
+                replicate.run,
                 self.model_name,
                 input=input_args
             )
@@ -43,18 +57,18 @@ class ReplicateVideoProvider(VideoGenerationProvider):
                   return "assets/placeholders/veo_generated_clip.mp4"
             
             # Save locally
-            os.makedirs("assets/output", exist_ok=True)
-            output_path = f"assets/output/{hash(prompt)}.mp4"
+            output_path = artifact_cache.path_for("videos", cache_key, "mp4")
             
-            response = requests.get(video_url)
-            if response.status_code == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                return output_path
-            else:
-                 print(f"Replicate Video Error: Failed to download video from {video_url}")
-                 return "assets/placeholders/veo_generated_clip.mp4"
-                 
+            try:
+                await download_file(video_url, output_path)
+            except DownloadError as e:
+                print(f"Replicate Video Error: {e}", flush=True)
+                return "assets/placeholders/veo_generated_clip.mp4"
+            artifact_cache.store("replicate-video", cache_key, output_path)
+            return output_path
+
         except Exception as e:
+            if is_rate_limit_error(e):
+                raise # Let the scheduler back off and retry
             print(f"Replicate Video Error: {e}", flush=True)
             return "assets/placeholders/veo_generated_clip.mp4"
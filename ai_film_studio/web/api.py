@@ -1,12 +1,40 @@
+import asyncio
+import time
 import uuid
-from fastapi import FastAPI, BackgroundTasks, WebSocket, Request
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from fastapi import FastAPI, BackgroundTasks, WebSocket, WebSocketDisconnect, Request, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from ai_film_studio.core.workflow import app_graph
+from ai_film_studio.core.cost_ledger import get_cost_ledger
+from ai_film_studio.core.events import emit, get_event_bus
+from ai_film_studio.core.job_queue import get_job_queue
+from ai_film_studio.core.metrics import registry, collect_remote, JOBS, JOB_QUEUE_DEPTH
 from ai_film_studio.core.state import EpisodeState
+from ai_film_studio.core.workspace import job_workspace, prune_workspaces
+from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.pool import provider_pool, shutdown_providers
 
-app = FastAPI(title="AI Film Studio API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prune_workspaces()
+    health_task = None
+    if settings.PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS > 0:
+        health_task = asyncio.create_task(provider_pool.health_loop(settings.PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS))
+    yield
+    # Release warm provider clients, download connections and SDK threads explicitly
+    if health_task:
+        health_task.cancel()
+    from ai_film_studio.core.memory import memory_store
+    await memory_store.close()
+    await get_event_bus().close()
+    await get_cost_ledger().close()
+    await shutdown_providers()
+    print("API: Provider pool shut down.", flush=True)
+
+app = FastAPI(title="AI Film Studio API", lifespan=lifespan)
 
 # Mount Static & Templates
 app.mount("/static", StaticFiles(directory="ai_film_studio/web/static"), name="static")
@@ -14,6 +42,9 @@ templates = Jinja2Templates(directory="ai_film_studio/web/templates")
 
 class GenerateRequest(BaseModel):
     story_text: str
+    episode_number: int = 1
+    bypass_llm_cache: bool = False
+    budget_limit: Optional[float] = None # USD; JOB_BUDGET_LIMIT when unset
 
 @app.get("/")
 async def read_dashboard(request: Request):
@@ -28,32 +59,161 @@ async def generate_episode(request: GenerateRequest, background_tasks: Backgroun
     # Initialize State
     initial_state = EpisodeState(
         project_id=job_id,
-        episode_number=1,
-        raw_story_input=story_text
+        episode_number=request.episode_number,
+        raw_story_input=story_text,
+        bypass_llm_cache=request.bypass_llm_cache,
+        budget_limit=request.budget_limit,
     )
     
-    # In a real app, we'd kick off a Celery task or background thread
-    # For MVP verification, we might just run it (blocking) or use background_tasks
-    background_tasks.add_task(run_pipeline, initial_state)
+    # Durable path: hand the job to the worker pool through Redis
+    job_queue = get_job_queue()
+    if job_queue:
+        await job_queue.enqueue({"kind": "episode", "state": initial_state.model_dump()}, job_id=job_id)
+        return {"job_id": job_id, "status": "queued"}
+
+    # Local development without Redis: run in this process
+    local_jobs[job_id] = {"job_id": job_id, "status": "queued", "created_at": time.time()}
+    background_tasks.add_task(run_local_pipeline, initial_state)
     
     return {"job_id": job_id, "status": "queued"}
 
-async def run_pipeline(state: EpisodeState):
-    """Runs the LangGraph workflow."""
+# Status of jobs run in-process (only used when REDIS_URL is unset)
+local_jobs: Dict[str, Dict] = {}
+
+async def run_local_pipeline(state: Optional[EpisodeState] = None, resume_job_id: Optional[str] = None):
+    """Runs (or resumes) the LangGraph workflow inside the API process."""
+    from ai_film_studio.core.pipeline import run_pipeline, resume_pipeline
+    job = local_jobs[resume_job_id or state.project_id]
+    job.update(status="running", updated_at=time.time())
     try:
-        print(f"Starting Pipeline for Job {state.project_id}", flush=True)
-        async for output in app_graph.astream(state):
-            # In a real app, we'd push updates to Redis/WebSockets here
-            for key, value in output.items():
-                print(f"Node '{key}' finished.", flush=True)
-        print(f"Pipeline Finished for Job {state.project_id}", flush=True)
+        if resume_job_id:
+            result = await resume_pipeline(resume_job_id)
+        else:
+            result = await run_pipeline(state)
+        job.update(status="succeeded", result=result, updated_at=time.time())
     except Exception as e:
         print(f"PIPELINE CRITICAL ERROR: {e}", flush=True)
         import traceback
         traceback.print_exc()
+        job.update(status="failed", error=str(e), updated_at=time.time())
+        JOBS.inc(status="failed")
+        await emit("job_failed", job_id=resume_job_id or state.project_id, error=str(e), final=True)
+
+# The pipeline (LangGraph, agents, checkpointer) is imported on first use rather than at startup,
+# so the API starts quickly and a queue-backed deployment never loads it for enqueueing.
+async def get_pipeline_checkpoint(job_id: str) -> Optional[Dict]:
+    from ai_film_studio.core.pipeline import get_pipeline_checkpoint as _get_checkpoint
+    return await _get_checkpoint(job_id)
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    job_queue = get_job_queue()
+    job = await job_queue.get_job(job_id) if job_queue else local_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    # The payload carries the full story text; status callers don't need it
+    job = {k: v for k, v in job.items() if k != "payload"}
+    job["checkpoint"] = await get_pipeline_checkpoint(job_id)
+    return job
+
+@app.get("/jobs/{job_id}/video")
+async def get_job_video(job_id: str):
+    """Serves the job's final episode from its workspace."""
+    videos = job_workspace(job_id).final_videos()
+    if not videos:
+        raise HTTPException(status_code=404, detail=f"No video for job {job_id}")
+    return FileResponse(videos[0], media_type="video/mp4")
+
+@app.get("/jobs/{job_id}/costs")
+async def get_job_costs(job_id: str):
+    """Spend, outstanding reservations and remaining budget of one job, per provider:model."""
+    costs = await get_cost_ledger().job(job_id)
+    if costs is None:
+        raise HTTPException(status_code=404, detail=f"No costs recorded for job {job_id}")
+    return costs
+
+@app.get("/costs")
+async def get_costs():
+    """Today's spend against STRICT_BUDGET_LIMIT and the costs of every in-flight job."""
+    ledger = get_cost_ledger()
+    return {"day": await ledger.day(), "jobs": await ledger.active_jobs()}
+
+@app.post("/jobs/{job_id}/resume")
+async def resume_job(job_id: str, background_tasks: BackgroundTasks):
+    """Restarts a failed or interrupted job from its last completed node."""
+    checkpoint = await get_pipeline_checkpoint(job_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for job {job_id}")
+    if checkpoint["completed"]:
+        return {"job_id": job_id, "status": "succeeded", "checkpoint": checkpoint}
+
+    job_queue = get_job_queue()
+    if job_queue:
+        job = await job_queue.get_job(job_id)
+        if job and job["status"] in ("queued", "running"):
+            raise HTTPException(status_code=409, detail=f"Job {job_id} is already {job['status']}")
+        await job_queue.enqueue({"kind": "resume", "job_id": job_id}, job_id=job_id)
+    else:
+        job = local_jobs.setdefault(job_id, {"job_id": job_id, "created_at": time.time()})
+        if job.get("status") in ("queued", "running"):
+            raise HTTPException(status_code=409, detail=f"Job {job_id} is already {job['status']}")
+        job.update(status="queued", updated_at=time.time())
+        background_tasks.add_task(run_local_pipeline, resume_job_id=job_id)
+    return {"job_id": job_id, "status": "queued", "resume_from": checkpoint["next_nodes"]}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape target: this process plus every worker that pushed recently."""
+    job_queue = get_job_queue()
+    remote = {}
+    if job_queue:
+        for state, count in (await job_queue.depth()).items():
+            JOB_QUEUE_DEPTH.set(count, state=state)
+        remote = await collect_remote(job_queue.redis)
+    else:
+        for state, status in (("pending", "queued"), ("processing", "running")):
+            JOB_QUEUE_DEPTH.set(sum(1 for job in local_jobs.values() if job.get("status") == status), state=state)
+    return PlainTextResponse(registry.render(remote), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/providers")
+async def provider_health():
+    """Health-checks every warm provider client. Reports only: eviction is left to the background
+    health loop, so polling this endpoint never disturbs calls in flight."""
+    return {"providers": await provider_pool.check_health(evict=False), "age_seconds": provider_pool.stats()}
 
-# Simple WebSocket for real-time (Placeholder)
 @app.websocket("/ws/status/{job_id}")
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
+    """Streams the job's progress events as JSON until it finishes.
+
+    Reconnecting clients pass ?last_event_id=<id of the last event they saw> and get everything
+    after it replayed first. All clients of a job share one subscription to the event bus.
+    """
     await websocket.accept()
-    await websocket.send_text(f"Connected to status stream for {job_id}")
+    after = websocket.query_params.get("last_event_id")
+
+    async def forward():
+        async for event in get_event_bus().subscribe(job_id, after):
+            await websocket.send_json(event)
+
+    async def wait_for_disconnect():
+        # Notices a closed client while the job is quiet, so its subscription is released
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    sender = asyncio.create_task(forward())
+    receiver = asyncio.create_task(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Cancelling the sender ends its subscription; the bus drops the job's reader with the last one
+        sender.cancel()
+        receiver.cancel()
+    if sender in done and receiver not in done:
+        # Job finished (or the bus failed): close our side; the client reconnects if it needs more
+        error = sender.exception()
+        if error and not isinstance(error, WebSocketDisconnect):
+            print(f"API: Event stream for job {job_id} failed: {error}", flush=True)
+        try:
+            await websocket.close(code=1011 if error else 1000)
+        except RuntimeError:
+            pass # Already closed by the client
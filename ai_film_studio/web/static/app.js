@@ -47,6 +47,90 @@ function updateStepStatus(stepName, status) {
     }
 }
 
+function finishProduction(event) {
+    btnText.innerText = "Generate Episode";
+    btnSpinner.classList.add('hidden');
+    generateBtn.disabled = false;
+    if (event.type === 'job_finished' && event.final_video_path) {
+        statusMsg.innerText = "Production Complete!";
+        statusMsg.className = "text-center text-sm font-mono mt-2 text-green-400 font-bold";
+        // Show Result, served from the job's workspace
+        finalOutput.classList.remove('hidden');
+        downloadLink.href = `/jobs/${event.job_id}/video`;
+    } else {
+        statusMsg.innerText = event.error ? `Production failed: ${event.error}` : "Production finished without a video.";
+        statusMsg.className = "text-center text-sm font-mono mt-2 text-red-500";
+    }
+}
+
+function handleEvent(event) {
+    switch (event.type) {
+        case 'job_started':
+            statusMsg.innerText = event.resumed_at ? `Resuming at ${event.resumed_at.join(', ')}...` : "Production started...";
+            break;
+        case 'node_finished':
+            updateStepStatus(event.node, 'done');
+            break;
+        case 'storyboard_done':
+            updateStepStatus('director', 'running');
+            statusMsg.innerText = `Scene ${event.scene_id}: storyboard ready`;
+            break;
+        case 'clip_ready':
+            updateStepStatus('animator', 'running');
+            statusMsg.innerText = `Scene ${event.scene_id}: clip ready (${event.source.replace('_', ' ')})`;
+            break;
+        case 'audio_done':
+            updateStepStatus('audio_engineer', 'running');
+            statusMsg.innerText = `Scene ${event.scene_id}: dialogue recorded`;
+            break;
+        case 'mux_done':
+            updateStepStatus('editor', 'running');
+            statusMsg.innerText = `Scene ${event.scene_id}: audio and video combined`;
+            break;
+        case 'budget_throttled':
+            statusMsg.innerText = event.requested
+                ? `Budget covers ${event.admitted}/${event.requested} scenes (${event.stage})`
+                : `Scene ${event.scene_id}: over budget (${event.stage})`;
+            break;
+        case 'job_failed':
+            if (!event.final) statusMsg.innerText = `Attempt ${event.attempt} failed, retrying...`;
+            break;
+    }
+}
+
+// Follows a job's progress events; after a dropped connection it reconnects and
+// asks the server to replay everything after the last event we saw.
+function watchJob(jobId) {
+    let lastEventId = null;
+    let finished = false;
+    let retryDelay = 1000;
+
+    const connect = () => {
+        const proto = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const query = lastEventId ? `?last_event_id=${encodeURIComponent(lastEventId)}` : '';
+        const ws = new WebSocket(`${proto}://${window.location.host}/ws/status/${jobId}${query}`);
+
+        ws.onopen = () => { retryDelay = 1000; };
+
+        ws.onmessage = (message) => {
+            const event = JSON.parse(message.data);
+            lastEventId = event.id;
+            handleEvent(event);
+            if (event.type === 'job_finished' || (event.type === 'job_failed' && event.final)) {
+                finished = true;
+                finishProduction(event);
+            }
+        };
+
+        ws.onclose = () => {
+            if (finished) return;
+            setTimeout(connect, retryDelay);
+            retryDelay = Math.min(retryDelay * 2, 15000);
+        };
+    };
+    connect();
+}
+
 form.addEventListener('submit', async (e) => {
     e.preventDefault();
     const story = document.getElementById('storyInput').value;
@@ -76,35 +160,7 @@ form.addEventListener('submit', async (e) => {
         statusMsg.innerText = `Job ID: ${jobId}. Connecting to stream...`;
         statusMsg.classList.add('text-blue-400');
 
-        // Connect WebSocket
-        const proto = window.location.protocol === 'https:' ? 'wss' : 'ws';
-        const ws = new WebSocket(`${proto}://${window.location.host}/ws/status/${jobId}`);
-
-        ws.onmessage = (event) => {
-            const msg = event.data;
-            if (msg.includes("finished")) {
-                const nodeName = msg.split("'")[1];
-                updateStepStatus(nodeName, 'done');
-            } else if (msg.includes("Starting")) {
-                 statusMsg.innerText = msg;
-            } else if (msg.includes("Pipeline Finished")) {
-                // Done
-                btnText.innerText = "Generate Episode";
-                btnSpinner.classList.add('hidden');
-                generateBtn.disabled = false;
-                statusMsg.innerText = "Production Complete!";
-                statusMsg.className = "text-center text-sm font-mono mt-2 text-green-400 font-bold";
-                
-                // Show Result (Dummy path for MVP if real file not served)
-                finalOutput.classList.remove('hidden');
-                // Download link would need real path
-                downloadLink.href = "/assets/output/episode_1_final.mp4"; 
-            }
-        };
-
-        ws.onclose = () => {
-            console.log("WS Closed");
-        };
+        watchJob(jobId);
 
     } catch (err) {
         console.error(err);
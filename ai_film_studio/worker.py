@@ -0,0 +1,170 @@
+"""
+Queue worker: consumes episode jobs from Redis and runs the pipeline.
+
+Usage: python -m ai_film_studio.worker [--processes N] [--concurrency M]
+
+Each process runs its own event loop with up to M jobs in flight. Workers can run on any host
+that can reach REDIS_URL; leases that are not renewed (crashed worker) are requeued by the others,
+until the job has used JOB_MAX_ATTEMPTS. A worker that loses a job's lease stops running it.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import traceback
+from typing import Any, Dict
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.events import emit, get_event_bus
+from ai_film_studio.core.cost_ledger import get_cost_ledger
+from ai_film_studio.core.job_queue import JobQueue, get_job_queue
+from ai_film_studio.core.metrics import JOBS, push_loop
+from ai_film_studio.core.workspace import prune_workspaces
+from ai_film_studio.providers.pool import provider_pool, shutdown_providers
+
+async def handle_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Imported here so the supervisor process never loads the agents and provider SDKs
+    from ai_film_studio.core.pipeline import run_pipeline, resume_pipeline
+    from ai_film_studio.core.state import EpisodeState
+
+    payload = job["payload"]
+    if payload.get("kind") == "episode":
+        state = EpisodeState(**payload["state"])
+        if job["attempts"] > 1 and settings.ENABLE_CHECKPOINTING:
+            # A retry picks up after the last completed node instead of paying for every stage again
+            try:
+                return await resume_pipeline(state.project_id)
+            except LookupError:
+                pass
+        return await run_pipeline(state)
+    if payload.get("kind") == "resume":
+        return await resume_pipeline(payload["job_id"])
+    raise ValueError(f"Unknown job kind: {payload.get('kind')}")
+
+async def _keep_lease(queue: JobQueue, job_id: str, job_task: asyncio.Task):
+    while True:
+        await asyncio.sleep(queue.visibility_timeout / 3)
+        if not await queue.extend_lease(job_id):
+            # Another worker may already have reclaimed the job; two runs would share its workspace
+            print(f"Worker: Lost lease on job {job_id}, cancelling it", flush=True)
+            job_task.cancel()
+            return
+
+async def _process(queue: JobQueue, job: Dict[str, Any], worker_id: str):
+    job_id = job["job_id"]
+    heartbeat = asyncio.create_task(_keep_lease(queue, job_id, asyncio.current_task()))
+    try:
+        result = await handle_job(job)
+        if await queue.ack(job_id, worker_id, result):
+            print(f"Worker: Job {job_id} succeeded", flush=True)
+        else:
+            print(f"Worker: Job {job_id} finished after its lease was lost; result discarded", flush=True)
+    except Exception as e:
+        traceback.print_exc()
+        status = await queue.fail(job_id, worker_id, str(e))
+        if status is None:
+            print(f"Worker: Job {job_id} failed after its lease was lost (attempt {job['attempts']}): {e}", flush=True)
+            return
+        print(f"Worker: Job {job_id} failed (attempt {job['attempts']}): {e}", flush=True)
+        JOBS.inc(status="failed")
+        await emit("job_failed", job_id=job_id, error=str(e), attempt=job["attempts"], final=status == "dead")
+    finally:
+        heartbeat.cancel()
+
+async def worker_loop(queue: JobQueue, concurrency: int, stop: asyncio.Event, poll_interval: float = 1.0):
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    slots = asyncio.Semaphore(concurrency)
+    in_flight = set()
+    print(f"Worker {worker_id}: Started with concurrency {concurrency}", flush=True)
+
+    while not stop.is_set():
+        await slots.acquire()
+        try:
+            released = await queue.requeue_expired()
+            for dead_id in released["dead"]:
+                print(f"Worker {worker_id}: Job {dead_id} lost its lease on its last attempt; marked dead", flush=True)
+                JOBS.inc(status="failed")
+                await emit("job_failed", job_id=dead_id, error="Lease expired (worker crashed or hung)", final=True)
+            job = await queue.claim(worker_id)
+        except Exception as e:
+            slots.release()
+            print(f"Worker {worker_id}: Queue error: {e}", flush=True)
+            await asyncio.sleep(poll_interval)
+            continue
+
+        if job is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(_process(queue, job, worker_id))
+        in_flight.add(task)
+
+        def _release(t: asyncio.Task):
+            in_flight.discard(t)
+            slots.release()
+
+        task.add_done_callback(_release)
+
+    # Drain: finish what we started; unfinished leases would be requeued anyway
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    print(f"Worker {worker_id}: Stopped", flush=True)
+
+async def _run(concurrency: int):
+    queue = get_job_queue()
+    if queue is None:
+        raise SystemExit("Worker: REDIS_URL is not configured.")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    prune_workspaces()
+    metrics_task = asyncio.create_task(push_loop(queue.redis, f"{socket.gethostname()}:{os.getpid()}"))
+    health_task = None
+    if settings.PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS > 0:
+        health_task = asyncio.create_task(provider_pool.health_loop(settings.PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS))
+    try:
+        await worker_loop(queue, concurrency, stop)
+    finally:
+        if health_task:
+            health_task.cancel()
+        metrics_task.cancel()
+        await get_event_bus().close()
+        await get_cost_ledger().close()
+        await shutdown_providers()
+
+def _process_main(concurrency: int):
+    asyncio.run(_run(concurrency))
+
+def main():
+    parser = argparse.ArgumentParser(description="AI Film Studio queue worker")
+    parser.add_argument("--processes", type=int, default=settings.WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _process_main(args.concurrency)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    children = [ctx.Process(target=_process_main, args=(args.concurrency,), daemon=False) for _ in range(args.processes)]
+    for child in children:
+        child.start()
+
+    def _forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for child in children:
+        child.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: editor scene muxing, sequential vs. parallel (EDITOR_MUX_CONCURRENCY).
+
+Generates synthetic clips and dialogue tracks with ffmpeg (testsrc + sine), then runs editor_node
+once with a concurrency of 1 (the old for-loop behaviour) and once with one mux per CPU.
+Requires ffmpeg on PATH. Runs inside a temporary directory.
+
+Usage: python benchmarks/bench_editor_mux.py [--scenes 12] [--duration 4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.agents.editor import editor_node
+
+async def ffmpeg(*args: str):
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y", "-loglevel", "error", *args,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode())
+
+async def make_synthetic_scene(scene_id: int, duration: float) -> Scene:
+    video = f"synthetic/clip_{scene_id}.mp4"
+    audio = f"synthetic/voice_{scene_id}.mp3"
+    await ffmpeg("-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=25:duration={duration}",
+                 "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", video)
+    await ffmpeg("-f", "lavfi", "-i", f"sine=frequency={200 + scene_id * 20}:duration={duration}", audio)
+    return Scene(
+        id=scene_id, sequence_order=scene_id, script_content="...", visual_description="synthetic",
+        characters_present=[], dialogue=[{"speaker": "Narrator", "text": "..."}], estimated_duration=duration,
+        video_clip_path=video, audio_track_path=audio,
+    )
+
+async def timed_editor(state: EpisodeState, concurrency: int):
+    settings.EDITOR_MUX_CONCURRENCY = concurrency
+    start = time.perf_counter()
+    result = await editor_node(state)
+    return time.perf_counter() - start, result
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, default=12)
+    parser.add_argument("--duration", type=float, default=4.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_editor_")
+    os.chdir(workdir)
+    os.makedirs("synthetic", exist_ok=True)
+    print(f"--- Editor Mux Benchmark ({args.scenes} scenes x {args.duration:.0f}s, {os.cpu_count()} CPUs) in {workdir} ---")
+
+    scenes = await asyncio.gather(*[make_synthetic_scene(i, args.duration) for i in range(1, args.scenes + 1)])
+    state = EpisodeState(project_id="bench", episode_number=1, raw_story_input="synthetic", scenes=list(scenes))
+
+    sequential, _ = await timed_editor(state, 1)
+    parallel, result = await timed_editor(state, 0)
+
+    mux_times = sorted(v for k, v in result["quality_metrics"].items() if k.startswith("mux_seconds_scene_"))
+    print(f"\nSequential mux (1 at a time):  {sequential:.2f}s")
+    print(f"Parallel mux ({os.cpu_count()} at a time):    {parallel:.2f}s")
+    print(f"Speedup:                       {sequential / parallel:.2f}x")
+    if mux_times:
+        print(f"Per-scene mux time: min {mux_times[0]:.2f}s / median {mux_times[len(mux_times) // 2]:.2f}s / max {mux_times[-1]:.2f}s")
+    print(f"Final video: {result.get('final_video_path')}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Benchmark: cold import time of the API and worker entry points (`python -X importtime`).
+
+Each module is imported in a fresh interpreter several times. The report shows the median total
+import time, the slowest top-level imports, and which heavy provider SDKs got loaded at import
+(ideally none: providers are resolved through the registry on first use).
+
+Usage: python benchmarks/bench_import_time.py [--modules ai_film_studio.web.api ai_film_studio.worker] [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+HEAVY_PACKAGES = ["google.genai", "vertexai", "google.cloud.texttospeech", "replicate", "elevenlabs",
+                  "chromadb", "asyncpg", "langgraph", "langchain_core", "numpy"]
+
+def import_profile(module: str) -> List[Tuple[str, int, int, int]]:
+    """Runs `python -X importtime -c "import module"` and returns (name, depth, self_us, cumulative_us) rows."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+def summarize(module: str, runs: int, top: int):
+    profiles = [import_profile(module) for _ in range(runs)]
+    totals = [sum(r[2] for r in profile) / 1000 for profile in profiles]
+    last = profiles[-1]
+    loaded = {row[0] for row in last}
+
+    print(f"\n{module}: median {statistics.median(totals):.0f}ms over {runs} runs "
+          f"(min {min(totals):.0f}ms, {len(last)} modules)")
+    # Direct imports of the module under test, slowest first
+    direct: Dict[str, int] = {}
+    for name, depth, _, cumulative in last:
+        if depth == 1:
+            direct[name] = max(direct.get(name, 0), cumulative)
+    for name, cumulative in sorted(direct.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+    heavy = [pkg for pkg in HEAVY_PACKAGES if pkg in loaded]
+    print(f"  Heavy packages loaded at import: {', '.join(heavy) if heavy else 'none'}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", nargs="+", default=["ai_film_studio.web.api", "ai_film_studio.worker", "ai_film_studio.core.workflow"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"--- Import Time Benchmark ({sys.executable}) ---")
+    for module in args.modules:
+        summarize(module, args.runs, args.top)
+
+if __name__ == "__main__":
+    main()
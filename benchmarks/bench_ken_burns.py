@@ -0,0 +1,74 @@
+"""
+Benchmark: Ken Burns fallback renderers (legacy zoompan vs. scale/crop chain vs. NumPy frames).
+
+Generates a synthetic storyboard still with ffmpeg (testsrc2, default 1024x1024 like the storyboard
+generator), renders the same clip with each renderer and reports wall time and frames per second.
+Requires ffmpeg on PATH (and numpy for the numpy renderer). Runs inside a temporary directory.
+
+Usage: python benchmarks/bench_ken_burns.py [--image-size 1024x1024] [--duration 4] [--clips 1]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.media.ken_burns import render_ken_burns
+
+RENDERERS = ["zoompan", "ffmpeg", "numpy"]
+
+async def make_still(path: str, size: str):
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", f"testsrc2=size={size}:rate=1",
+        "-frames:v", "1", path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode())
+
+async def timed_render(renderer: str, still: str, duration: float, clips: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        render_ken_burns(still, f"out/{renderer}_{i}.mp4", duration=duration, renderer=renderer)
+        for i in range(clips)
+    ])
+    elapsed = time.perf_counter() - start
+    if not all(results):
+        raise RuntimeError(f"{renderer} renderer failed")
+    return elapsed
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image-size", default="1024x1024")
+    parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--clips", type=int, default=1, help="Clips rendered concurrently per renderer")
+    parser.add_argument("--renderers", nargs="+", default=RENDERERS, choices=RENDERERS)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_ken_burns_")
+    os.chdir(workdir)
+    os.makedirs("out", exist_ok=True)
+    await make_still("still.png", args.image_size)
+
+    frames = int(round(args.duration * settings.KEN_BURNS_FPS)) * args.clips
+    print(f"--- Ken Burns Benchmark ({args.clips} x {args.duration:.0f}s clip(s) at {settings.KEN_BURNS_RESOLUTION}"
+          f"@{settings.KEN_BURNS_FPS}fps from a {args.image_size} still) in {workdir} ---")
+
+    timings = {}
+    for renderer in args.renderers:
+        timings[renderer] = await timed_render(renderer, "still.png", args.duration, args.clips)
+        print(f"{renderer:>8}: {timings[renderer]:6.2f}s  {frames / timings[renderer]:7.1f} fps")
+
+    if "zoompan" in timings:
+        for renderer, elapsed in timings.items():
+            if renderer != "zoompan":
+                print(f"{renderer} speedup over zoompan: {timings['zoompan'] / elapsed:.2f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
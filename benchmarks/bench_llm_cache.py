@@ -0,0 +1,79 @@
+"""
+Benchmark: LLM response cache on repeated runs of the same story.
+
+A stand-in model answers after --latency seconds, which is roughly what a long Gemini 2.5 Pro
+analysis call costs. The story analyst and scene-parsing JSON calls are repeated --runs times
+(retries / re-renders of one story) with the cache disabled, then enabled, and the disk tier is
+measured separately by re-opening the cache file in a fresh LLMCache.
+
+Usage: python benchmarks/bench_llm_cache.py [--runs 5] [--latency 2.0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.core.interfaces import LLMProvider
+from ai_film_studio.core.llm_cache import LLMCache
+from ai_film_studio.providers.llm.caching import CachingLLMProvider
+
+STORY = "A lighthouse keeper finds a message in a bottle written in her own handwriting. " * 40
+
+class SlowLLM(LLMProvider):
+    provider_name = "bench"
+    model_name = "slow-model"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return "INT. LIGHTHOUSE - NIGHT\n..."
+
+    async def generate_json(self, system_prompt: str, user_prompt: str, schema) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"plot_summary": "...", "characters": [{"name": "Keeper"}], "scenes": [{"id": 1}]}
+
+async def one_run(llm: LLMProvider):
+    await llm.generate_json("You are an expert Story Analyst.", f"Analyze this story:\n{STORY}", schema="JSON with keys: plot_summary, characters, scenes")
+    await llm.generate_json("You are a Data Extraction Specialist.", f"Extract scenes:\n{STORY}", schema="List of scenes")
+
+async def measure(label: str, llm: LLMProvider, inner: SlowLLM, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await one_run(llm)
+        timings.append(time.perf_counter() - start)
+    print(f"{label:<22} first {timings[0]:7.3f}s  repeat avg {sum(timings[1:]) / max(1, runs - 1):9.5f}s  model calls {inner.calls}")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "llm.sqlite")
+    print(f"--- LLM Cache Benchmark ({args.runs} runs, {args.latency}s model latency) ---")
+
+    inner = SlowLLM(args.latency)
+    await measure("no cache", inner, inner, args.runs)
+
+    inner = SlowLLM(args.latency)
+    cache = LLMCache(path, enabled=True)
+    await measure("cache (memory tier)", CachingLLMProvider(inner, cache), inner, args.runs)
+
+    # A fresh process only has the SQLite tier
+    inner = SlowLLM(args.latency)
+    await measure("cache (disk tier)", CachingLLMProvider(inner, LLMCache(path, enabled=True)), inner, 1)
+    print(f"Cache stats: {cache.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark: MemoryStore query latency, embedded Chroma vs. pgvector.
+
+Loads N random 768-d assets into each backend with bulk upserts, then measures the latency of
+single-query searches (character lookups) and of one bulk search of --bulk queries.
+Embeddings are synthetic, so no embedding API is called.
+
+Chroma runs in a temporary directory. pgvector needs asyncpg and a reachable database
+(POSTGRES_* / POSTGRES_DSN settings, e.g. `docker-compose up db`); benchmark rows use the
+asset type "bench" and are deleted afterwards. Backends that cannot start are skipped.
+
+Usage: python benchmarks/bench_memory_backends.py [--sizes 10000 100000] [--queries 200] [--backends chroma pgvector]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.core.memory import ChromaMemoryBackend
+
+DIM = 768
+BATCH = 1000
+ASSET_TYPE = "bench"
+
+def random_vector(rng: random.Random):
+    v = [rng.gauss(0, 1) for _ in range(DIM)]
+    norm = sum(x * x for x in v) ** 0.5
+    return [x / norm for x in v]
+
+def make_backend(name: str, size: int):
+    if name == "chroma":
+        return ChromaMemoryBackend(path=tempfile.mkdtemp(prefix=f"bench_chroma_{size}_"))
+    from ai_film_studio.core.pgvector_memory import PgVectorMemoryBackend
+    return PgVectorMemoryBackend()
+
+async def cleanup(name: str, backend):
+    if name == "pgvector":
+        pool = await backend._get_pool()
+        await pool.execute("DELETE FROM assets WHERE type = $1", ASSET_TYPE)
+    await backend.close()
+
+async def load(backend, size: int, rng: random.Random) -> float:
+    start = time.perf_counter()
+    for offset in range(0, size, BATCH):
+        n = min(BATCH, size - offset)
+        await backend.upsert(
+            ids=[f"bench-{offset + i}" for i in range(n)],
+            embeddings=[random_vector(rng) for _ in range(n)],
+            documents=[f"asset {offset + i}" for i in range(n)],
+            metadatas=[{"name": f"Asset {offset + i}", "asset_type": ASSET_TYPE, "shard": (offset + i) % 10} for i in range(n)],
+        )
+    return time.perf_counter() - start
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+async def bench(name: str, size: int, queries: int, bulk: int):
+    rng = random.Random(size)
+    try:
+        backend = make_backend(name, size)
+        load_seconds = await load(backend, size, rng)
+    except Exception as e:
+        print(f"{name:>8} @ {size:>7}: skipped ({e})")
+        return
+
+    query_vectors = [random_vector(rng) for _ in range(queries)]
+    latencies = []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        await backend.query([vector], ASSET_TYPE, 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await backend.query(query_vectors[:bulk], ASSET_TYPE, 1)
+    bulk_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    await backend.query(query_vectors[:1], ASSET_TYPE, 5, filters={"shard": 3})
+    filtered_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{name:>8} @ {size:>7}: load {size / load_seconds:8.0f} assets/s | "
+          f"query p50 {statistics.median(latencies):6.2f}ms p95 {percentile(latencies, 0.95):6.2f}ms | "
+          f"bulk x{bulk} {bulk_ms:7.2f}ms | filtered {filtered_ms:6.2f}ms")
+    await cleanup(name, backend)
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--bulk", type=int, default=20, help="Queries in the bulk search")
+    parser.add_argument("--backends", nargs="+", default=["chroma", "pgvector"], choices=["chroma", "pgvector"])
+    args = parser.parse_args()
+
+    print(f"--- Memory Backend Benchmark ({DIM}-d, {args.queries} queries per size) ---")
+    for size in args.sizes:
+        for name in args.backends:
+            await bench(name, size, args.queries, args.bulk)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,291 @@
+"""
+Benchmark: end-to-end episode throughput and latency, offline.
+
+Every provider is replaced by the synthetic ones in benchmarks/fake_providers.py (sampled latencies,
+failure rates, real media rendered once with ffmpeg); everything else is the production code path:
+workflow, scheduler, provider chains, cost ledger, editor muxing. Each (driver, scenes, concurrency)
+level runs --rounds x concurrency jobs with `concurrency` in flight and reports throughput, p50/p99
+job latency and, from each job's trace.jsonl, p50/p99 per workflow node.
+
+Drivers:
+  graph  run_pipeline() on app_graph, as the queue worker does
+  api    POST /generate/episode on an in-process uvicorn server, polling GET /jobs/{id} until done
+
+Jobs run in a scratch directory, so nothing is written to the repo's assets/. Provider latencies are
+multiplied by --time-scale; the default keeps a full grid to a few minutes.
+
+Usage: python benchmarks/bench_pipeline_throughput.py [--scenes 3 10] [--concurrency 1 4] [--rounds 2]
+       [--drivers graph api] [--time-scale 0.01] [--latency video=lognormal:45:180] [--failure-rate image=0.05]
+       [--output baseline.json] [--compare baseline.json --tolerance 0.2]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from benchmarks import fake_providers
+from benchmarks.fake_providers import FakeProfile, Latency, install_fake_providers, prepare_media
+
+STORY = "A small robot discovers a flower in a wasteland and must protect it through a dust storm."
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, as the provider chain's hedging uses."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(values, 0.50),
+        "p99": percentile(values, 0.99),
+        "mean": sum(values) / len(values) if values else None,
+        "max": max(values) if values else None,
+    }
+
+def per_kind(values: List[str], convert: Callable[[str], Any]) -> Dict[str, Any]:
+    """Parses repeated "kind=value" arguments."""
+    parsed = {}
+    for value in values:
+        kind, _, setting = value.partition("=")
+        if kind not in fake_providers.KINDS:
+            raise SystemExit(f"Unknown provider kind {kind!r}; expected one of {', '.join(fake_providers.KINDS)}")
+        parsed[kind] = convert(setting)
+    return parsed
+
+def node_durations(job_ids: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Per-node latency across jobs, from the node:* spans of each job's trace."""
+    from ai_film_studio.core.tracing import load_trace, trace_path
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for job_id in job_ids:
+        if not os.path.exists(trace_path(job_id)):
+            continue
+        for record in load_trace(trace_path(job_id)):
+            if record["name"].startswith("node:"):
+                durations[record["name"][len("node:"):]].append(record["duration"])
+    return {node: summarize(values) for node, values in sorted(durations.items())}
+
+async def graph_job() -> Dict[str, Any]:
+    from ai_film_studio.core.pipeline import run_pipeline
+    from ai_film_studio.core.state import EpisodeState
+    state = EpisodeState(project_id=f"bench-{uuid.uuid4().hex[:12]}", episode_number=1, raw_story_input=STORY)
+    started_at = time.monotonic()
+    try:
+        result = await run_pipeline(state)
+        outcome = {"succeeded": bool(result["final_video_path"]), "errors": len(result["errors"])}
+    except Exception as e:
+        outcome = {"succeeded": False, "errors": 1, "exception": str(e)}
+    return {"job_id": state.project_id, "seconds": time.monotonic() - started_at, **outcome}
+
+def api_job(client, poll_interval: float) -> Callable[[], Awaitable[Dict[str, Any]]]:
+    async def run() -> Dict[str, Any]:
+        started_at = time.monotonic()
+        response = await client.post("/generate/episode", json={"story_text": STORY})
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        while True:
+            await asyncio.sleep(poll_interval)
+            job = (await client.get(f"/jobs/{job_id}")).json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+        result = job.get("result") or {}
+        outcome = {"succeeded": job["status"] == "succeeded" and bool(result.get("final_video_path")),
+                   "errors": len(result.get("errors", [])) + (job["status"] == "failed")}
+        if job.get("error"):
+            outcome["exception"] = job["error"]
+        return {"job_id": job_id, "seconds": time.monotonic() - started_at, **outcome}
+    return run
+
+async def run_level(job: Callable[[], Awaitable[Dict[str, Any]]], concurrency: int, jobs: int, verbose: bool):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with limit:
+            return await job()
+
+    # The pipeline logs every node and provider call; keep the report readable
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started_at = time.monotonic()
+    with quiet:
+        results = await asyncio.gather(*(bounded() for _ in range(jobs)))
+    return results, time.monotonic() - started_at
+
+def level_report(driver: str, scenes: int, concurrency: int, results: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    latencies = [r["seconds"] for r in results]
+    return {
+        "driver": driver,
+        "scenes": scenes,
+        "concurrency": concurrency,
+        "jobs": len(results),
+        "failed_jobs": sum(1 for r in results if not r["succeeded"]),
+        "job_errors": sum(r["errors"] for r in results),
+        "exceptions": sorted({r["exception"] for r in results if r.get("exception")}),
+        "wall_seconds": wall,
+        "jobs_per_minute": len(results) / wall * 60,
+        "scenes_per_minute": len(results) * scenes / wall * 60,
+        "latency_seconds": summarize(latencies),
+        "nodes": node_durations([r["job_id"] for r in results]),
+    }
+
+def print_level(level: Dict[str, Any]):
+    latency = level["latency_seconds"]
+    print(f"{level['driver']:<6} scenes {level['scenes']:>3}  concurrency {level['concurrency']:>3}  "
+          f"{level['jobs_per_minute']:8.1f} jobs/min  {level['scenes_per_minute']:8.1f} scenes/min  "
+          f"p50 {latency['p50']:7.2f}s  p99 {latency['p99']:7.2f}s  failed {level['failed_jobs']}/{level['jobs']}", flush=True)
+    for node, stats in level["nodes"].items():
+        print(f"         {node:<22} p50 {stats['p50']:7.3f}s  p99 {stats['p99']:7.3f}s", flush=True)
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextlib.asynccontextmanager
+async def api_server(app):
+    """Serves the FastAPI app (lifespan included) on a local port for the duration of the block."""
+    import httpx
+    import uvicorn
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result() # Startup failed; raise its error
+        await asyncio.sleep(0.01)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await serving
+
+def compare(levels: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    """Prints the change against a saved report; returns False if any level regressed beyond `tolerance`."""
+    with open(baseline_path) as f:
+        baseline = {(b["driver"], b["scenes"], b["concurrency"]): b for b in json.load(f)["levels"]}
+    ok = True
+    print(f"\n--- Compared to {baseline_path} (tolerance {tolerance:.0%}) ---")
+    for level in levels:
+        base = baseline.get((level["driver"], level["scenes"], level["concurrency"]))
+        if base is None:
+            continue
+        throughput = level["jobs_per_minute"] / base["jobs_per_minute"] - 1
+        p99 = level["latency_seconds"]["p99"] / base["latency_seconds"]["p99"] - 1
+        regressed = throughput < -tolerance or p99 > tolerance
+        ok = ok and not regressed
+        print(f"{level['driver']:<6} scenes {level['scenes']:>3}  concurrency {level['concurrency']:>3}  "
+              f"throughput {throughput:+7.1%}  p99 {p99:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, nargs="+", default=[3, 10])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--rounds", type=int, default=2, help="Jobs per level = rounds x concurrency")
+    parser.add_argument("--drivers", nargs="+", choices=["graph", "api"], default=["graph", "api"])
+    parser.add_argument("--pipeline-mode", choices=["staged", "streaming"], default=settings.PIPELINE_MODE)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Multiplier on every synthetic latency")
+    parser.add_argument("--latency", action="append", default=[], metavar="KIND=SPEC", help="e.g. video=lognormal:45:180")
+    parser.add_argument("--failure-rate", action="append", default=[], metavar="KIND=RATE", help="In-band failures, e.g. image=0.05")
+    parser.add_argument("--rate-limit-rate", action="append", default=[], metavar="KIND=RATE", help="429s, e.g. llm=0.02")
+    parser.add_argument("--no-fallbacks", action="store_true", help="Single image/video provider instead of a chain")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between GET /jobs polls (api driver)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--compare", help="Report to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch directory with every job's workspace")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args = parser.parse_args()
+
+    profile = FakeProfile(time_scale=args.time_scale, seed=args.seed,
+                          failure_rate=per_kind(args.failure_rate, float),
+                          rate_limit_rate=per_kind(args.rate_limit_rate, float))
+    profile.latency.update(per_kind(args.latency, Latency))
+    fake_providers.profile = profile
+    install_fake_providers(fallbacks=not args.no_fallbacks)
+
+    # Before the workflow is imported: app_graph is compiled for PIPELINE_MODE at import time.
+    # Caches would turn every job after the first into a replay, so they are off.
+    settings.PIPELINE_MODE = args.pipeline_mode
+    settings.ENABLE_CHECKPOINTING = False
+    settings.ENABLE_LLM_CACHE = False
+    settings.ENABLE_EMBEDDING_CACHE = False
+    settings.ENABLE_ARTIFACT_CACHE = False
+    settings.ENABLE_TRACING = True
+    settings.PROVIDER_HEALTH_CHECK_INTERVAL_SECONDS = 0
+    settings.REDIS_URL = None # The api driver runs jobs inside the server process
+    settings.STRICT_BUDGET_LIMIT = 0
+    settings.JOB_BUDGET_LIMIT = 0
+    import ai_film_studio.core.pipeline # noqa: F401
+    from ai_film_studio.web.api import app # Mounts static files relative to the repo root
+
+    repo_root = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="filmstudio-bench-")
+    os.chdir(scratch)
+    prepare_media()
+    print(f"--- Pipeline Throughput Benchmark ({args.pipeline_mode} pipeline, time scale {args.time_scale:g}, "
+          f"scratch dir {scratch}) ---", flush=True)
+
+    levels: List[Dict[str, Any]] = []
+    try:
+        # graph first: the api driver's lifespan shuts the provider pool down on exit
+        for driver in [d for d in ("graph", "api") if d in args.drivers]:
+            server = api_server(app) if driver == "api" else contextlib.nullcontext()
+            async with server as client:
+                job = api_job(client, args.poll_interval) if driver == "api" else graph_job
+                # Unmeasured: the first job pays for opening the memory store and lazy imports
+                profile.scenes = min(args.scenes)
+                await run_level(job, 1, 1, args.verbose)
+                for scenes in args.scenes:
+                    profile.scenes = scenes
+                    for concurrency in args.concurrency:
+                        results, wall = await run_level(job, concurrency, concurrency * args.rounds, args.verbose)
+                        levels.append(level_report(driver, scenes, concurrency, results, wall))
+                        print_level(levels[-1])
+    finally:
+        os.chdir(repo_root)
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "benchmark": "pipeline_throughput",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "pipeline_mode": args.pipeline_mode,
+            "time_scale": args.time_scale,
+            "rounds": args.rounds,
+            "seed": args.seed,
+            "fallbacks": not args.no_fallbacks,
+            "latency": {kind: latency.spec for kind, latency in profile.latency.items()},
+            "failure_rate": profile.failure_rate,
+            "rate_limit_rate": profile.rate_limit_rate,
+        },
+        "levels": levels,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    if args.compare and not compare(levels, args.compare, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
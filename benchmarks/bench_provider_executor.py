@@ -0,0 +1,51 @@
+"""
+Benchmark: scene fan-out with blocking SDK calls, inline vs. on the provider executor.
+
+Simulates a slow synchronous SDK (e.g. replicate.run) with time.sleep and fans out one call per
+scene with asyncio.gather, the same way director_node/animator_node do.
+
+Usage: python benchmarks/bench_provider_executor.py [--scenes 16] [--latency 0.5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.providers.executor import run_blocking, shutdown_executors
+
+def slow_sdk_call(prompt: str, latency: float) -> str:
+    time.sleep(latency)
+    return f"https://example.invalid/{abs(hash(prompt))}.webp"
+
+async def inline_call(prompt: str, latency: float) -> str:
+    # What the providers did before: a blocking call inside `async def`
+    return slow_sdk_call(prompt, latency)
+
+async def executor_call(prompt: str, latency: float) -> str:
+    return await run_blocking("replicate", slow_sdk_call, prompt, latency)
+
+async def fan_out(call, scenes: int, latency: float) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[call(f"scene {i}", latency) for i in range(scenes)])
+    return time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated SDK latency in seconds")
+    args = parser.parse_args()
+
+    print(f"--- Provider Executor Benchmark ({args.scenes} scenes, {args.latency:.2f}s per call) ---")
+    inline = await fan_out(inline_call, args.scenes, args.latency)
+    print(f"Inline blocking calls:   {inline:.2f}s")
+    pooled = await fan_out(executor_call, args.scenes, args.latency)
+    print(f"Provider executor:       {pooled:.2f}s")
+    print(f"Speedup:                 {inline / pooled:.1f}x")
+    shutdown_executors()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+Benchmark: per-node provider setup overhead, fresh construction vs. the provider pool.
+
+Every agent node asks ProviderFactory for its providers. Without the pool that builds a new SDK
+client (genai.Client, ElevenLabs, Replicate wrappers, ...) on every call; with the pool the first
+call builds it and later calls return the warm instance. Only construction is timed, no API calls
+are made, so placeholder keys are enough (they are set below if missing).
+
+Usage: python benchmarks/bench_provider_setup.py [--jobs 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+for key in ("GOOGLE_API_KEY", "REPLICATE_API_TOKEN", "ELEVENLABS_API_KEY"):
+    os.environ.setdefault(key, "bench-placeholder")
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.providers.factory import ProviderFactory
+from ai_film_studio.providers.pool import provider_pool
+
+# Provider lookups made by the agent nodes of one staged episode
+NODE_CALLS = {
+    "story_analyst": [ProviderFactory.get_llm],
+    "scriptwriter": [ProviderFactory.get_llm],
+    "character_designer": [ProviderFactory.get_image_gen],
+    "director": [ProviderFactory.get_image_gen],
+    "animator": [ProviderFactory.get_video_gen],
+    "audio_engineer": [ProviderFactory.get_audio],
+    "memory": [ProviderFactory.get_embedding],
+}
+
+def run_job():
+    timings = {}
+    for node, calls in NODE_CALLS.items():
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        timings[node] = (time.perf_counter() - start) * 1000
+    return timings
+
+async def measure(pooled: bool, jobs: int):
+    settings.ENABLE_PROVIDER_POOL = pooled
+    await provider_pool.shutdown()
+    per_node = {node: [] for node in NODE_CALLS}
+    for _ in range(jobs):
+        for node, ms in run_job().items():
+            per_node[node].append(ms)
+    return per_node
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=20)
+    args = parser.parse_args()
+
+    # Warm up imports so neither side pays for loading the SDK modules
+    run_job()
+
+    print(f"--- Provider Setup Benchmark ({args.jobs} jobs, {len(NODE_CALLS)} nodes each) ---")
+    fresh = await measure(False, args.jobs)
+    pooled = await measure(True, args.jobs)
+
+    print(f"{'node':<20}{'fresh median':>14}{'pooled median':>15}{'pooled first':>14}")
+    total_fresh = total_pooled = 0.0
+    for node in NODE_CALLS:
+        total_fresh += sum(fresh[node])
+        total_pooled += sum(pooled[node])
+        print(f"{node:<20}{statistics.median(fresh[node]):>12.3f}ms{statistics.median(pooled[node]):>13.3f}ms{pooled[node][0]:>12.3f}ms")
+    print(f"\nSetup per job: fresh {total_fresh / args.jobs:.2f}ms, pooled {total_pooled / args.jobs:.2f}ms "
+          f"({total_fresh / max(total_pooled, 1e-9):.1f}x less)")
+    await provider_pool.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
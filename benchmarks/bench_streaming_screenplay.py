@@ -0,0 +1,102 @@
+"""
+Benchmark: time to first scene for the scriptwriter, blocking vs. streaming screenplay generation.
+
+A stand-in model "writes" a screenplay of --scenes scenes at --tokens-per-second. The blocking path
+waits for the whole text and then makes one large scene-parsing call; the streaming path cuts scenes
+at sluglines as the text arrives and extracts each one with a small concurrent call. JSON call
+latency is a fixed overhead plus a per-token cost, like a real model.
+
+Usage: python benchmarks/bench_streaming_screenplay.py [--scenes 12] [--tokens-per-second 80] [--parser llm]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider
+from ai_film_studio.agents import scriptwriter
+from ai_film_studio.agents.chunked_analysis import estimate_tokens
+
+def make_screenplay(scenes: int) -> str:
+    parts = ["FADE IN:\n"]
+    for i in range(1, scenes + 1):
+        parts.append(
+            f"INT. LIGHTHOUSE ROOM {i} - NIGHT\n\n"
+            "Rain lashes the glass. The keeper climbs the spiral stair, lantern swinging, "
+            "shadows stretching across the curved stone walls.\n\n"
+            "MARA\nWho's there? I heard the bell ring twice.\n\n"
+            "OLD TOM (V.O.)\nJust the wind, girl. Just the wind and the tide.\n"
+        )
+    return "\n".join(parts)
+
+class WritingLLM(LLMProvider):
+    model_name = "bench"
+
+    def __init__(self, screenplay: str, tokens_per_second: float, json_overhead: float, json_ms_per_1k_tokens: float):
+        self.screenplay = screenplay
+        self.tokens_per_second = tokens_per_second
+        self.json_overhead = json_overhead
+        self.json_ms_per_1k_tokens = json_ms_per_1k_tokens
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+        await asyncio.sleep(estimate_tokens(self.screenplay) / self.tokens_per_second)
+        return self.screenplay
+
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7):
+        piece = 64 # characters, ~16 tokens per streamed chunk
+        for i in range(0, len(self.screenplay), piece):
+            await asyncio.sleep(estimate_tokens(self.screenplay[i:i + piece]) / self.tokens_per_second)
+            yield self.screenplay[i:i + piece]
+
+    async def generate_json(self, system_prompt: str, user_prompt: str, schema) -> dict:
+        await asyncio.sleep(self.json_overhead + estimate_tokens(user_prompt) / 1000 * self.json_ms_per_1k_tokens / 1000)
+        if "'scenes'" in str(schema):
+            count = user_prompt.count("INT. ")
+            return {"scenes": [{"visual_description": f"Scene {i}", "characters_present": ["Mara"],
+                                "dialogue": [{"speaker": "Mara", "text": "..."}], "estimated_duration": 8.0}
+                               for i in range(1, count + 1)]}
+        return {"visual_description": "Scene", "characters_present": ["Mara"],
+                "dialogue": [{"speaker": "Mara", "text": "..."}], "estimated_duration": 8.0}
+
+async def blocking(llm: LLMProvider):
+    start = time.perf_counter()
+    text = await llm.generate_text("writer", "prompt")
+    scenes = await scriptwriter._parse_scenes(llm, text)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(scenes)
+
+async def streaming(llm: LLMProvider):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in scriptwriter.ScreenplayStream(llm, {}).scenes():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return first, time.perf_counter() - start, count
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, default=12)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--json-overhead", type=float, default=1.0, help="Fixed seconds per JSON call")
+    parser.add_argument("--json-ms-per-1k-tokens", type=float, default=1500.0)
+    parser.add_argument("--parser", choices=["llm", "heuristic"], default="llm")
+    args = parser.parse_args()
+    settings.SCRIPT_SCENE_PARSER = args.parser
+
+    screenplay = make_screenplay(args.scenes)
+    llm = WritingLLM(screenplay, args.tokens_per_second, args.json_overhead, args.json_ms_per_1k_tokens)
+    print(f"--- Streaming Screenplay Benchmark ({args.scenes} scenes, ~{estimate_tokens(screenplay)} tokens "
+          f"at {args.tokens_per_second:.0f} tok/s, scene parser: {args.parser}) ---")
+    for label, run in (("blocking", blocking), ("streaming", streaming)):
+        first, total, count = await run(llm)
+        print(f"{label:<10} time to first scene {first:6.2f}s   all {count} scenes {total:6.2f}s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
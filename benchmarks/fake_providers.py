@@ -0,0 +1,274 @@
+"""
+Synthetic providers for offline benchmarks and dry runs: no credentials, no network.
+
+Each fake implements its core interface, sleeps for a latency drawn from a configurable distribution,
+fails at a configurable rate the way the real providers do (an in-band error or placeholder path, or a
+429 the scheduler backs off on), and returns real media rendered once with ffmpeg, so the editor's mux
+and concat do real work.
+
+install_fake_providers() registers them through the provider registry under the name "fake" and points
+the *_PROVIDER settings at them. Everything between the agents and the fakes (factory, pool, scheduler,
+provider chains, caches, cost ledger) is the production code path.
+
+Latency specs (seconds, multiplied by FakeProfile.time_scale):
+  fixed:0.5             always 0.5
+  uniform:0.2:1.0       uniform between 0.2 and 1.0
+  lognormal:2.0:8.0     median 2.0, p99 8.0 (typical of model APIs: mostly fast, long tail)
+"""
+import asyncio
+import hashlib
+import math
+import os
+import random
+import shutil
+import subprocess
+import typing
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+from pydantic import BaseModel
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import LLMProvider, ImageGenerationProvider, VideoGenerationProvider, AudioProvider, EmbeddingProvider
+from ai_film_studio.providers.registry import register_provider
+from ai_film_studio.providers.scheduler import RateLimitError
+from ai_film_studio.providers.usage import token_usage
+
+PROVIDER_NAME = "fake"
+KINDS = ("llm", "image", "video", "audio", "embedding")
+CHARACTER_NAMES = ["Ava", "Bram", "Cleo", "Dax", "Elin", "Finn", "Gia", "Hugo"]
+
+# Rough shape of real provider latencies, before FakeProfile.time_scale
+DEFAULT_LATENCY = {
+    "llm": "lognormal:2.0:8.0",
+    "image": "lognormal:6.0:20.0",
+    "video": "lognormal:45.0:180.0",
+    "audio": "lognormal:1.5:5.0",
+    "embedding": "lognormal:0.15:0.6",
+}
+
+class Latency:
+    """A latency distribution parsed from a spec such as "lognormal:2.0:8.0" (see module docstring)."""
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *args = spec.split(":")
+        values = [float(a) for a in args]
+        if kind == "fixed" and len(values) == 1:
+            self._sample = lambda rng: values[0]
+        elif kind == "uniform" and len(values) == 2:
+            self._sample = lambda rng: rng.uniform(values[0], values[1])
+        elif kind == "lognormal" and len(values) == 2:
+            median, p99 = values
+            sigma = math.log(max(p99, median) / median) / 2.326 # z-score of the 99th percentile
+            self._sample = lambda rng: rng.lognormvariate(math.log(median), sigma)
+        else:
+            raise ValueError(f"Bad latency spec {spec!r}; expected fixed:S, uniform:LO:HI or lognormal:MEDIAN:P99")
+
+    def sample(self, rng: random.Random) -> float:
+        return self._sample(rng)
+
+@dataclass
+class FakeProfile:
+    """Behaviour of every fake provider. Rates are probabilities per call."""
+    scenes: int = 6 # Scenes the fake scriptwriter writes
+    characters: int = 2
+    time_scale: float = 1.0
+    latency: Dict[str, Latency] = field(default_factory=lambda: {kind: Latency(spec) for kind, spec in DEFAULT_LATENCY.items()})
+    failure_rate: Dict[str, float] = field(default_factory=dict) # In-band failure: error result or placeholder path
+    rate_limit_rate: Dict[str, float] = field(default_factory=dict) # Raise a 429 for the scheduler to retry
+    media_dir: str = "assets/synthetic"
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+
+profile = FakeProfile()
+
+def _media(name: str) -> str:
+    return os.path.join(profile.media_dir, name)
+
+def prepare_media(media_dir: Optional[str] = None):
+    """Renders the synthetic storyboard, clip and speech track once (requires ffmpeg)."""
+    if media_dir:
+        profile.media_dir = media_dir
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("ffmpeg is required to render the synthetic media")
+    os.makedirs(profile.media_dir, exist_ok=True)
+    outputs = {
+        "storyboard.png": ["-f", "lavfi", "-i", "testsrc=size=320x180", "-frames:v", "1"],
+        "clip.mp4": ["-f", "lavfi", "-i", "testsrc=size=320x180:rate=25", "-t", "2", "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"],
+        "speech.wav": ["-f", "lavfi", "-i", "sine=frequency=440:duration=2"],
+    }
+    for name, args in outputs.items():
+        if not os.path.exists(_media(name)):
+            subprocess.run(["ffmpeg", "-y", "-loglevel", "error", *args, _media(name)], check=True)
+
+class _FakeProvider:
+    kind = ""
+
+    def __init__(self, model_name: str = "default"):
+        self.model_name = model_name
+
+    async def _work(self) -> bool:
+        """Sleeps for one sampled latency. Returns False if this call should fail in-band."""
+        rng = profile.rng
+        await asyncio.sleep(profile.latency[self.kind].sample(rng) * profile.time_scale)
+        if rng.random() < profile.rate_limit_rate.get(self.kind, 0.0):
+            raise RateLimitError(f"429 Too Many Requests (synthetic {self.kind} rate limit)")
+        return rng.random() >= profile.failure_rate.get(self.kind, 0.0)
+
+    async def health_check(self) -> bool:
+        return True
+
+def _scene(i: int) -> Dict[str, Any]:
+    names = CHARACTER_NAMES[:max(1, profile.characters)]
+    speakers = [names[i % len(names)], names[(i + 1) % len(names)]]
+    return {
+        "heading": f"INT. LOCATION {i} - DAY",
+        "beats": [
+            {"speaker": "", "text": f"{speakers[0]} crosses the room in scene {i}."},
+            {"speaker": speakers[0], "text": f"This is line one of scene {i}."},
+            {"speaker": speakers[1], "text": f"And this is the reply in scene {i}."},
+        ],
+        "visual_description": f"Wide shot of location {i}, {speakers[0]} and {speakers[1]} talking",
+        "characters_present": list(dict.fromkeys(speakers)),
+        "estimated_duration": 4.0,
+    }
+
+def _screenplay_text(i: int) -> str:
+    scene = _scene(i)
+    lines = [scene["heading"], ""]
+    for beat in scene["beats"]:
+        lines += [beat["speaker"].upper(), beat["text"], ""] if beat["speaker"] else [beat["text"], ""]
+    return "\n".join(lines) + "\n"
+
+def _scene_fields(i: int) -> Dict[str, Any]:
+    scene = _scene(i)
+    return {"visual_description": scene["visual_description"], "characters_present": scene["characters_present"],
+            "dialogue": [b for b in scene["beats"] if b["speaker"]], "estimated_duration": scene["estimated_duration"]}
+
+def _example(annotation: Any) -> Any:
+    """A minimal valid value for a type, for structured calls with an unknown response model."""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin in (list, List):
+        return [_example(args[0])] if args else []
+    if origin is typing.Union:
+        return _example(next(a for a in args if a is not type(None)))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: _example(f.annotation) for name, f in annotation.model_fields.items()}
+    return {str: "synthetic", int: 1, float: 1.0, bool: False}.get(annotation, {})
+
+class FakeLLMProvider(_FakeProvider, LLMProvider):
+    kind = "llm"
+
+    def _record(self, prompt: str, output: Any):
+        token_usage.record(PROVIDER_NAME, self.model_name, len(prompt) // 4, len(str(output)) // 4)
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+        if not await self._work():
+            return "Error: synthetic LLM failure"
+        if "Merge" in system_prompt:
+            text = "Synthetic merged plot summary."
+        else:
+            text = "".join(_screenplay_text(i) for i in range(1, profile.scenes + 1))
+        self._record(user_prompt, text)
+        return text
+
+    async def stream_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        # The whole call takes one sampled latency, spread over the scenes as they are "written"
+        total = profile.latency[self.kind].sample(profile.rng) * profile.time_scale
+        if profile.rng.random() < profile.rate_limit_rate.get(self.kind, 0.0):
+            raise RateLimitError("429 Too Many Requests (synthetic llm rate limit)")
+        text = ""
+        for i in range(1, profile.scenes + 1):
+            await asyncio.sleep(total / profile.scenes)
+            piece = _screenplay_text(i)
+            text += piece
+            yield piece
+        self._record(user_prompt, text)
+
+    async def generate_json(self, system_prompt: str, user_prompt: str, schema: Any) -> dict:
+        if not await self._work():
+            return {"errors": ["synthetic LLM failure"]}
+        schema = str(schema)
+        names = CHARACTER_NAMES[:max(1, profile.characters)]
+        characters = [{"name": n, "visual_description": f"{n}, synthetic character"} for n in names]
+        if "summary (string)" in schema: # Chunk of a long story
+            result = {"summary": "Synthetic chapter summary.", "characters": characters,
+                      "scenes": [{"description": f"Scene {i}", "characters_present": names} for i in range(1, profile.scenes + 1)]}
+        elif "'scenes'" in schema: # All scenes of a finished screenplay
+            result = {"scenes": [{"sequence_order": i, **_scene_fields(i)} for i in range(1, profile.scenes + 1)]}
+        elif "visual_description" in schema: # One scene
+            match = [int(w) for w in user_prompt.replace("-", " ").split() if w.isdigit()]
+            result = _scene_fields(match[0] if match else 1)
+        else: # Story analysis
+            result = {"plot_summary": "A synthetic story for benchmarking.", "characters": characters,
+                      "scenes": [{"description": f"Scene {i}"} for i in range(1, profile.scenes + 1)]}
+        self._record(user_prompt, result)
+        return result
+
+    async def generate_structured(self, system_prompt: str, user_prompt: str, response_model: Type[BaseModel]) -> dict:
+        if not await self._work():
+            return {"errors": ["synthetic LLM failure"]}
+        if "scenes" in response_model.model_fields:
+            result = {"title": "Synthetic Episode", "scenes": [_scene(i) for i in range(1, profile.scenes + 1)]}
+        else:
+            result = _example(response_model)
+        self._record(user_prompt, result)
+        return result
+
+class FakeImageProvider(_FakeProvider, ImageGenerationProvider):
+    kind = "image"
+
+    async def generate_image(self, prompt: str, negative_prompt: str = "", width: int = 1024, height: int = 1024, reference_images: Optional[List[str]] = None) -> str:
+        return _media("storyboard.png") if await self._work() else "assets/placeholders/no_image_generated.png"
+
+class FakeVideoProvider(_FakeProvider, VideoGenerationProvider):
+    kind = "video"
+
+    async def generate_clip(self, prompt: str, image_url: Optional[str] = None, duration_seconds: int = 4) -> str:
+        return _media("clip.mp4") if await self._work() else "assets/placeholders/veo_generated_clip.mp4"
+
+class FakeAudioProvider(_FakeProvider, AudioProvider):
+    kind = "audio"
+
+    async def generate_speech(self, text: str, voice_id: str) -> str:
+        return _media("speech.wav") if await self._work() else "assets/placeholders/silence.mp3"
+
+class FakeEmbeddingProvider(_FakeProvider, EmbeddingProvider):
+    kind = "embedding"
+    dimensions = 64
+
+    @classmethod
+    def _vector(cls, text: str) -> List[float]:
+        # Deterministic per text, so repeated names land close together in memory search
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [(digest[i % len(digest)] - 127.5) / 127.5 for i in range(cls.dimensions)]
+
+    async def get_embedding(self, text: str) -> List[float]:
+        await self._work()
+        return self._vector(text)
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        await self._work()
+        return [self._vector(text) for text in texts]
+
+FAKE_PROVIDERS = {
+    "llm": FakeLLMProvider,
+    "image": FakeImageProvider,
+    "video": FakeVideoProvider,
+    "audio": FakeAudioProvider,
+    "embedding": FakeEmbeddingProvider,
+}
+
+def install_fake_providers(fallbacks: bool = True):
+    """Registers the fakes and selects them in settings. With `fallbacks`, image and video get a
+    second fake model ("fake-fallback") so provider chains, hedging included, are exercised too."""
+    for kind, provider_class in FAKE_PROVIDERS.items():
+        register_provider(kind, PROVIDER_NAME, provider_class)
+    settings.LLM_PROVIDER = PROVIDER_NAME
+    settings.IMAGE_PROVIDER = PROVIDER_NAME
+    settings.VIDEO_PROVIDER = PROVIDER_NAME
+    settings.AUDIO_PROVIDER = PROVIDER_NAME
+    settings.EMBEDDING_PROVIDER = PROVIDER_NAME
+    settings.FALLBACK_IMAGE_PROVIDER = f"{PROVIDER_NAME}-fallback" if fallbacks else PROVIDER_NAME
+    settings.FALLBACK_VIDEO_PROVIDER = f"{PROVIDER_NAME}-fallback" if fallbacks else PROVIDER_NAME
+    settings.SPEED_MODE = False
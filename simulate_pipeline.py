@@ -1,30 +1,58 @@
-print("DEBUG: Script started", flush=True)
-import os
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "/Users/nishitnalinsrivastava/dev/AI Agent/AI-Powered Novel-to-Video Generator/secrets/vertex-service-key.json"
+"""
+Runs one episode through app_graph and prints each node as it finishes.
+
+Credentials come from .env / the environment like the rest of the app. With --offline every provider
+is replaced by the synthetic ones in benchmarks/fake_providers.py, so the whole graph runs without
+credentials or network (media is rendered with ffmpeg into assets/synthetic).
 
-print("DEBUG: Importing asyncio", flush=True)
+Usage: python simulate_pipeline.py [--story "..."] [--offline] [--scenes 4] [--time-scale 0.05]
+"""
+import argparse
 import asyncio
-print("DEBUG: Importing uuid", flush=True)
+import os
+import sys
 import uuid
-print("DEBUG: Importing EpisodeState", flush=True)
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
 from ai_film_studio.core.state import EpisodeState
-print("DEBUG: Importing app_graph", flush=True)
-from ai_film_studio.core.workflow import app_graph
-print("DEBUG: All imports done", flush=True)
 
 async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--story", default="A small robot discovers a flower in a wasteland.")
+    parser.add_argument("--offline", action="store_true", help="Synthetic providers, no credentials needed")
+    parser.add_argument("--scenes", type=int, default=4, help="Scenes the synthetic scriptwriter writes (--offline)")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Multiplier on synthetic latencies (--offline)")
+    args = parser.parse_args()
+
+    if args.offline:
+        from benchmarks import fake_providers
+        fake_providers.profile = fake_providers.FakeProfile(scenes=args.scenes, time_scale=args.time_scale)
+        fake_providers.install_fake_providers()
+        fake_providers.prepare_media()
+        # Synthetic answers must not end up in the real caches
+        settings.ENABLE_LLM_CACHE = False
+        settings.ENABLE_EMBEDDING_CACHE = False
+        settings.ENABLE_ARTIFACT_CACHE = False
+
+    from ai_film_studio.core.workflow import app_graph
+
     job_id = str(uuid.uuid4())
     state = EpisodeState(
         project_id=job_id,
         episode_number=1,
-        raw_story_input="A small robot discovers a flower in a wasteland."
+        raw_story_input=args.story
     )
-    
-    print(f"--- Simulating Pipeline for {job_id} ---", flush=True)
+
+    print(f"--- Simulating Pipeline for {job_id}{' (offline)' if args.offline else ''} ---", flush=True)
     try:
         async for output in app_graph.astream(state):
             for key, value in output.items():
                 print(f"Node '{key}' finished.", flush=True)
+                if isinstance(value, dict) and value.get("final_video_path"):
+                    print(f"Final video: {value['final_video_path']}", flush=True)
     except Exception as e:
         print(f"PIPELINE CRITICAL ERROR: {e}", flush=True)
 
@@ -0,0 +1,110 @@
+"""
+Concurrency test: several episodes rendered at once must not overwrite each other's files.
+
+Every job uses episode_number=1 and the same scene ids (as the API used to). Each job gets a storyboard
+of its own colour and its own clip duration; the animator's Ken Burns fallback and the editor then run
+for all jobs concurrently. Each final video must sit in its own workspace and last exactly
+scenes x that job's duration. Requires ffmpeg on PATH. Runs inside a temporary directory.
+
+Usage: python test_concurrent_jobs.py [--jobs 4] [--scenes 3]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.interfaces import VideoGenerationProvider
+from ai_film_studio.core.state import EpisodeState, Scene
+from ai_film_studio.core.workspace import job_workspace, finish_workspace
+from ai_film_studio.agents.animator import animate_scene
+from ai_film_studio.agents.editor import editor_node
+
+COLOURS = ["red", "green", "blue", "yellow", "cyan", "magenta", "white", "orange"]
+
+class PlaceholderVideo(VideoGenerationProvider):
+    """Always "fails" so every scene takes the Ken Burns fallback into the job's workspace."""
+    async def generate_clip(self, prompt: str, image_url=None, duration_seconds: int = 4) -> str:
+        await asyncio.sleep(0)
+        return "assets/placeholders/veo_generated_clip.mp4"
+
+async def ffmpeg(*args: str) -> str:
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y", *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    return stderr.decode()
+
+async def duration_of(path: str) -> float:
+    match = re.search(r"Duration: (\d+):(\d+):([\d.]+)", await ffmpeg("-i", path))
+    if not match:
+        return 0.0
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+async def run_job(job: int, scenes: int) -> dict:
+    project_id = f"job-{job}"
+    seconds = job + 1.0
+    storyboard = f"storyboards/{project_id}.png"
+    await ffmpeg("-loglevel", "error", "-f", "lavfi", "-i", f"color=c={COLOURS[job % len(COLOURS)]}:size=640x360",
+                 "-frames:v", "1", storyboard)
+
+    state = EpisodeState(project_id=project_id, episode_number=1, raw_story_input="synthetic", scenes=[
+        Scene(id=i, sequence_order=i, script_content="...", visual_description=f"Shot [Ref: {storyboard}]",
+              characters_present=[], dialogue=[], estimated_duration=seconds)
+        for i in range(1, scenes + 1)
+    ])
+    errors = []
+    workspace = job_workspace(project_id)
+    updates = await asyncio.gather(*[animate_scene(PlaceholderVideo(), s, errors, workspace) for s in state.scenes])
+    state = state.model_copy(update={"scenes": [s.model_copy(update=u) for s, u in zip(state.scenes, updates)]})
+    result = await editor_node(state)
+    finish_workspace(workspace, succeeded=bool(result.get("final_video_path")))
+    return {"project_id": project_id, "expected": seconds * scenes, "errors": errors + result.get("errors", []),
+            "clips": [s.video_clip_path for s in state.scenes], "final": result.get("final_video_path")}
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--scenes", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="concurrent_jobs_")
+    os.chdir(workdir)
+    os.makedirs("storyboards", exist_ok=True)
+    settings.WORKSPACE_ROOT = os.path.join(workdir, "jobs")
+    settings.KEN_BURNS_RESOLUTION = "320x180"
+    print(f"--- Concurrent Jobs Test ({args.jobs} jobs x {args.scenes} scenes) in {workdir} ---", flush=True)
+
+    results = await asyncio.gather(*[run_job(job, args.scenes) for job in range(args.jobs)])
+
+    failures = 0
+    finals = set()
+    for result in results:
+        final = result["final"]
+        actual = await duration_of(final) if final else 0.0
+        problems = list(result["errors"])
+        if not final or final in finals:
+            problems.append(f"final video {final} missing or shared")
+        if abs(actual - result["expected"]) > 0.5:
+            problems.append(f"duration {actual:.2f}s, expected {result['expected']:.2f}s")
+        if any(not clip or not clip.startswith(job_workspace(result["project_id"]).root) for clip in result["clips"]):
+            problems.append(f"clips outside the workspace: {result['clips']}")
+        if os.path.exists(os.path.join(job_workspace(result["project_id"]).root, "temp")):
+            problems.append("temp files left behind")
+        finals.add(final)
+        failures += bool(problems)
+        print(f"{'❌' if problems else '✅'} {result['project_id']}: {final} ({actual:.2f}s) {'; '.join(problems)}")
+
+    if failures:
+        print(f"\n{failures}/{len(results)} jobs interfered with each other.")
+        sys.exit(1)
+    print(f"\nAll {len(results)} jobs rendered independently.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Cost test: LLM tokens charged to the cost ledger must match the tokens the providers reported.
+
+Runs the scriptwriter on the synthetic LLM from benchmarks/fake_providers.py, priced at $1 per prompt
+token and $2 per output token, in each scriptwriter mode. In streaming mode the per-scene extraction
+calls run while the screenplay stream is still open, so a token scope leaking out of the stream
+would charge them twice. The job's spend must equal what token_usage.totals() reports.
+
+Usage: python test_token_charging.py [--scenes 4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.config.settings import settings
+from ai_film_studio.core.cost_ledger import get_cost_ledger
+from ai_film_studio.core.events import job_events
+from ai_film_studio.core.state import EpisodeState
+from ai_film_studio.providers.usage import token_usage
+from benchmarks import fake_providers
+
+PROMPT_PRICE = 1.0 # USD per token
+OUTPUT_PRICE = 2.0
+
+async def run_mode(mode: str, scenes: int) -> str:
+    from ai_film_studio.agents.scriptwriter import scriptwriter_node
+    settings.SCRIPTWRITER_MODE = mode
+    job_id = f"charging-{mode}"
+    state = EpisodeState(project_id=job_id, episode_number=1, raw_story_input="A robot finds a flower.",
+                         story_analysis={"plot_summary": "A robot finds a flower.", "characters": []})
+    before = token_usage.totals().get("fake:default", {"prompt_tokens": 0, "output_tokens": 0})
+    ledger = get_cost_ledger()
+    await ledger.open_job(job_id)
+    with job_events(job_id):
+        updates = await scriptwriter_node(state)
+    await ledger.close_job(job_id)
+    after = token_usage.totals()["fake:default"]
+
+    prompt = after["prompt_tokens"] - before["prompt_tokens"]
+    output = after["output_tokens"] - before["output_tokens"]
+    expected = prompt * PROMPT_PRICE + output * OUTPUT_PRICE
+    charged = (await ledger.job(job_id))["spent"]
+    problems = []
+    if len(updates.get("scenes", [])) != scenes:
+        problems.append(f"{len(updates.get('scenes', []))} scenes, expected {scenes}")
+    if abs(charged - expected) > 1e-6:
+        problems.append(f"reported tokens cost ${expected:.0f}")
+    print(f"{'❌' if problems else '✅'} {mode:<10} {prompt} prompt + {output} output tokens, charged ${charged:.0f} "
+          f"{'; '.join(problems)}", flush=True)
+    return "; ".join(problems)
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, default=4)
+    args = parser.parse_args()
+
+    fake_providers.profile = fake_providers.FakeProfile(scenes=args.scenes, time_scale=0.001, seed=1)
+    fake_providers.install_fake_providers()
+    settings.ENABLE_LLM_CACHE = False
+    settings.SCRIPT_SCENE_PARSER = "llm"
+    settings.JOB_BUDGET_LIMIT = 0
+    settings.STRICT_BUDGET_LIMIT = 0
+    settings.PROVIDER_PRICES = {"fake": {"input_mtokens": PROMPT_PRICE * 1e6, "output_mtokens": OUTPUT_PRICE * 1e6}}
+    print(f"--- Token Charging Test ({args.scenes} scenes) ---", flush=True)
+
+    failures = [mode for mode in ("streaming", "structured", "two_call") if await run_mode(mode, args.scenes)]
+    if failures:
+        print(f"\nCharged tokens differ from reported tokens in: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nCharged tokens match reported tokens in every mode.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
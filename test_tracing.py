@@ -0,0 +1,86 @@
+"""
+Tracing test: the critical path of synthetic traces, including zero-length and very short spans
+(no-op nodes, cache hits), which must neither hang the walk nor drop real predecessors.
+
+Each case runs with a timeout, so a walk that loops forever fails instead of hanging.
+
+Usage: python test_tracing.py [--timeout 5]
+"""
+import argparse
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from ai_film_studio.core.tracing import critical_path
+
+def make_span(span_id, parent_id, start, duration, name=None):
+    return {"trace_id": "t", "span_id": span_id, "parent_id": parent_id, "name": name or span_id,
+            "start": start, "duration": duration, "attrs": {}}
+
+CASES = {
+    "zero-length child": (
+        [make_span("job", None, 0.0, 1.0), make_span("node:critic", "job", 0.5, 0.0)],
+        ["job", "node:critic"],
+    ),
+    "5 ms child": (
+        [make_span("job", None, 0.0, 1.0), make_span("node:critic", "job", 0.5, 0.005)],
+        ["job", "node:critic"],
+    ),
+    "sequential nodes ending in a no-op": (
+        [make_span("job", None, 0.0, 3.0),
+         make_span("node:writer", "job", 0.0, 1.0),
+         make_span("node:editor", "job", 1.0, 1.5),
+         make_span("node:critic", "job", 2.5, 0.0)],
+        ["job", "node:writer", "node:editor", "node:critic"],
+    ),
+    "concurrent branches": (
+        [make_span("job", None, 0.0, 3.0),
+         make_span("node:designer", "job", 0.0, 1.0),
+         make_span("node:audio", "job", 1.0, 0.2),
+         make_span("node:director", "job", 1.0, 1.8),
+         make_span("node:editor", "job", 2.8, 0.001)],
+        ["job", "node:designer", "node:director", "node:editor"],
+    ),
+    "identical zero-length siblings": (
+        [make_span("job", None, 0.0, 1.0), make_span("a", "job", 0.5, 0.0), make_span("b", "job", 0.5, 0.0)],
+        None, # Either sibling may be chosen; the walk just has to finish with one of them
+    ),
+}
+
+def run_case(spans, timeout: float):
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(path=critical_path(spans)), daemon=True)
+    worker.start()
+    worker.join(timeout)
+    return None if worker.is_alive() else [s["name"] for _, s in result["path"]]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds before a case counts as hung")
+    args = parser.parse_args()
+    print("--- Critical Path Test ---", flush=True)
+
+    failures = 0
+    for label, (spans, expected) in CASES.items():
+        names = run_case(spans, args.timeout)
+        if names is None:
+            problem = f"did not finish within {args.timeout:g}s"
+        elif expected is not None and names != expected:
+            problem = f"got {names}, expected {expected}"
+        elif expected is None and len(names) != 2:
+            problem = f"got {names}"
+        else:
+            problem = ""
+        failures += bool(problem)
+        print(f"{'❌' if problem else '✅'} {label}: {problem or ' -> '.join(names)}", flush=True)
+
+    if failures:
+        print(f"\n{failures}/{len(CASES)} cases failed.")
+        sys.exit(1)
+    print(f"\nAll {len(CASES)} cases passed.")
+
+if __name__ == "__main__":
+    main()